@@ -5,9 +5,15 @@ import pytest
 pytest_plugins = [
     # Plugins
     'pytest_plugins.auto_vault',
+    'pytest_plugins.collection_pipeline',
+    'pytest_plugins.collection_profiler',
     'pytest_plugins.disable_rp_params',
+    'pytest_plugins.duration_scheduling',
     'pytest_plugins.external_logging',
     'pytest_plugins.fixture_markers',
+    'pytest_plugins.hammer_metrics',
+    'pytest_plugins.host_facts',
+    'pytest_plugins.host_pool',
     'pytest_plugins.infra_dependent_markers',
     'pytest_plugins.issue_handlers',
     'pytest_plugins.logging_hooks',
@@ -15,8 +21,12 @@ pytest_plugins = [
     'pytest_plugins.marker_deselection',
     'pytest_plugins.markers',
     'pytest_plugins.metadata_markers',
+    'pytest_plugins.query_cache',
     'pytest_plugins.settings_skip',
     'pytest_plugins.rerun_rp.rerun_rp',
+    'pytest_plugins.satellite_load',
+    'pytest_plugins.task_watcher',
+    'pytest_plugins.topology',
     'pytest_plugins.fspath_plugins',
     'pytest_plugins.factory_collection',
     'pytest_plugins.requirements.update_requirements',
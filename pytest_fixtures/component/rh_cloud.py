@@ -3,6 +3,7 @@ import pytest
 
 from robottelo.config import settings
 from robottelo.constants import CAPSULE_REGISTRATION_OPTS
+from robottelo.hosts import ContentHost
 
 
 def enable_insights(host, satellite, org, activation_key):
@@ -93,13 +94,16 @@ def rhcloud_registered_hosts(
     rhcloud_activation_key, rhcloud_manifest_org, mod_content_hosts, module_target_sat_insights
 ):
     """Fixture that registers content hosts to Satellite and Insights."""
-    for vm in mod_content_hosts:
-        vm.configure_insights_client(
+    ContentHost.parallel(mod_content_hosts).map(
+        lambda vm: vm.configure_insights_client(
             satellite=module_target_sat_insights,
             activation_key=rhcloud_activation_key,
             org=rhcloud_manifest_org,
             rhel_distro=f"rhel{vm.os_version.major}",
-        )
+        ),
+        name='configure_insights_client',
+    )
+    for vm in mod_content_hosts:
         assert vm.subscribed
     return mod_content_hosts
 
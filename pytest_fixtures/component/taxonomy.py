@@ -8,14 +8,14 @@ from robottelo.constants import DEFAULT_LOC, DEFAULT_ORG
 
 @pytest.fixture(scope='session')
 def default_org(session_target_sat):
-    return session_target_sat.api.Organization().search(query={'search': f'name="{DEFAULT_ORG}"'})[
-        0
-    ]
+    return session_target_sat.cached_search(
+        'Organization', f'name="{DEFAULT_ORG}"', 'organization'
+    )[0]
 
 
 @pytest.fixture(scope='session')
 def default_location(session_target_sat):
-    return session_target_sat.api.Location().search(query={'search': f'name="{DEFAULT_LOC}"'})[0]
+    return session_target_sat.cached_search('Location', f'name="{DEFAULT_LOC}"', 'location')[0]
 
 
 @pytest.fixture
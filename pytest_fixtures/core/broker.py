@@ -7,12 +7,17 @@ import pytest
 from robottelo.config import settings
 from robottelo.exceptions import ContentHostError
 from robottelo.hosts import Satellite, lru_sat_ready_rhel
+from robottelo.utils import satellite_load
 
 
 @pytest.fixture(scope='session')
 def _default_sat(align_to_satellite):
     """Returns a Satellite object for settings.server.hostname"""
-    hostname = getattr(settings.server, 'hostname', None)
+    if (tracker := satellite_load.get_tracker()) is not None:
+        # with least-loaded, the current hostname is the one of the module requesting it first
+        hostname = tracker.session_hostname
+    else:
+        hostname = getattr(settings.server, 'hostname', None)
     if hostname:
         try:
             return Satellite.get_host_by_hostname(hostname)
@@ -21,6 +26,22 @@ def _default_sat(align_to_satellite):
     return None
 
 
+_worker_sats = {}
+
+
+def _worker_sat(default_sat):
+    """Returns the Satellite of the worker, it changes between modules with ``least-loaded``"""
+    hostname = getattr(settings.server, 'hostname', None)
+    if default_sat is None or not hostname or default_sat.hostname == hostname:
+        return default_sat
+    if hostname not in _worker_sats:
+        try:
+            _worker_sats[hostname] = Satellite.get_host_by_hostname(hostname)
+        except ContentHostError:
+            _worker_sats[hostname] = Satellite()
+    return _worker_sats[hostname]
+
+
 @contextmanager
 def _target_sat_imp(request, _default_sat, satellite_factory):
     """This is the actual working part of the following target_sat fixtures"""
@@ -35,9 +56,10 @@ def _target_sat_imp(request, _default_sat, satellite_factory):
         settings.set('server.hostname', installer_sat.hostname)
         yield installer_sat
     else:
-        if _default_sat:
-            _default_sat.enable_satellite_ipv6_http_proxy()
-        yield _default_sat
+        default_sat = _worker_sat(_default_sat)
+        if default_sat:
+            default_sat.enable_satellite_ipv6_http_proxy()
+        yield default_sat
 
 
 @pytest.fixture
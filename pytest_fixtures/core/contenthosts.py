@@ -5,6 +5,8 @@ The functions in this module are read in the pytest_plugins/fixture_markers.py m
 All functions in this module will be treated as fixtures that apply the contenthost mark
 """
 
+from contextlib import contextmanager
+
 from broker import Broker
 import pytest
 
@@ -12,26 +14,29 @@ from robottelo import constants
 from robottelo.config import settings
 from robottelo.enums import NetworkType
 from robottelo.hosts import ContentHost, Satellite
-
-
-def host_conf(request):
-    """A function that returns arguments for Broker host deployment"""
-    conf = params = {}
-    if hasattr(request, 'param'):
-        params = request.param
+from robottelo.utils import host_pool
+
+#: function fixtures taking their hosts from the host pool, with their number of hosts and the
+#: parameters they force
+POOLED_FIXTURES = {
+    'rhel_contenthost': (1, {}),
+    'rhel9_contenthost': (1, {}),
+    'rhel_contenthost_with_repos': (1, {}),
+    'content_hosts': (2, {}),
+    'rex_contenthost': (1, {'no_containers': True}),
+    'rex_contenthosts': (2, {'no_containers': True}),
+}
+
+
+def deploy_conf(params, no_containers=False):
+    """A function that returns arguments for Broker host deployment of the given parameters"""
+    conf = {}
     distro = params.get('distro', 'rhel')
     network = params.get('network')
     _rhelver = f"{distro}{params.get('rhel_version', settings.content_host.default_rhel_version)}"
 
-    # check to see if no-containers is passed as an argument to pytest
     deploy_kwargs = {}
-    if not any(
-        [
-            request.config.getoption('no_containers'),
-            params.get('no_containers'),
-            request.node.get_closest_marker('no_containers'),
-        ]
-    ):
+    if not no_containers:
         deploy_kwargs = settings.content_host.get(_rhelver).to_dict().get('container', {})
         if deploy_kwargs and network:
             deploy_kwargs.update({'Container': str(network)})
@@ -47,12 +52,84 @@ def host_conf(request):
     return conf
 
 
+def host_conf(request):
+    """A function that returns arguments for Broker host deployment"""
+    params = getattr(request, 'param', {})
+    # check to see if no-containers is passed as an argument to pytest
+    no_containers = any(
+        [
+            request.config.getoption('no_containers'),
+            params.get('no_containers'),
+            request.node.get_closest_marker('no_containers'),
+        ]
+    )
+    return deploy_conf(params, no_containers=no_containers)
+
+
+def host_label(params):
+    """A function that returns the name of the host pool of the given parameters"""
+    distro = params.get('distro', 'rhel')
+    label = f"{distro}{params.get('rhel_version', settings.content_host.default_rhel_version)}"
+    return f"{label}-{params['network']}" if params.get('network') else label
+
+
+def pooled_host_demand(item):
+    """A function that returns the ``(deploy_kwargs, label)`` of the pooled hosts of a test"""
+    demand = []
+    callspec = getattr(item, 'callspec', None)
+    for name in POOLED_FIXTURES.keys() & set(item.fixturenames):
+        count, forced_params = POOLED_FIXTURES[name]
+        params = callspec.params.get(name) if callspec else None
+        params = {**(params if isinstance(params, dict) else {}), **forced_params}
+        no_containers = any(
+            [
+                item.config.getoption('no_containers'),
+                params.get('no_containers'),
+                item.get_closest_marker('no_containers'),
+            ]
+        )
+        demand.extend([(deploy_conf(params, no_containers), host_label(params))] * count)
+    return demand
+
+
+@contextmanager
+def _checkout_contenthosts(request, count=None):
+    """Checks out content hosts from the host pool when it is enabled, from Broker otherwise
+
+    :param count: number of hosts, a list of hosts is returned when it is set
+    """
+    pool = host_pool.get_pool()
+    if pool is None or request.scope != 'function':
+        count_kwargs = {'_count': count} if count else {}
+        with Broker(**host_conf(request), host_class=ContentHost, **count_kwargs) as hosts:
+            yield hosts
+        return
+    deploy_kwargs = host_conf(request)
+    label = host_label(getattr(request, 'param', {}))
+    hosts = []
+    try:
+        for _ in range(count or 1):
+            hosts.append(pool.acquire(deploy_kwargs, label))
+        yield hosts if count else hosts[0]
+    finally:
+        # like Broker's context manager, tear down every host before raising
+        last_exception = None
+        for host in hosts:
+            try:
+                host.teardown()
+            except Exception as err:
+                last_exception = err
+            pool.release(host)
+        if last_exception:
+            raise last_exception
+
+
 @pytest.fixture
 def rhel_contenthost(request):
     """A function-level fixture that provides a content host object parametrized"""
     # Request should be parametrized through pytest_fixtures.fixture_markers
     # unpack params dict
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _checkout_contenthosts(request) as host:
         yield host
 
 
@@ -111,14 +188,14 @@ def rhel8_contenthost_module(request):
 @pytest.fixture(params=[{'rhel_version': '9'}])
 def rhel9_contenthost(request):
     """A fixture that provides a rhel9 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _checkout_contenthosts(request) as host:
         yield host
 
 
 @pytest.fixture
 def content_hosts(request):
     """A function-level fixture that provides two rhel content hosts object"""
-    with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
+    with _checkout_contenthosts(request, count=2) as hosts:
         hosts[0].set_infrastructure_type('physical')
         yield hosts
 
@@ -164,7 +241,7 @@ def cockpit_host(class_target_sat, class_org, rhel_contenthost):
 @pytest.fixture
 def rex_contenthost(request, module_org, target_sat, module_ak_with_cv):
     request.param['no_containers'] = True
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _checkout_contenthosts(request) as host:
         repo = settings.repos['SATCLIENT_REPO'][f'RHEL{host.os_version.major}']
         host.register(
             module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
@@ -175,12 +252,15 @@ def rex_contenthost(request, module_org, target_sat, module_ak_with_cv):
 @pytest.fixture
 def rex_contenthosts(request, module_org, target_sat, module_ak_with_cv):
     request.param['no_containers'] = True
-    with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
-        for host in hosts:
-            repo = settings.repos['SATCLIENT_REPO'][f'RHEL{host.os_version.major}']
-            host.register(
-                module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
-            )
+
+    def register(host):
+        repo = settings.repos['SATCLIENT_REPO'][f'RHEL{host.os_version.major}']
+        host.register(
+            module_org, None, module_ak_with_cv.name, target_sat, repo_data=f'repo={repo}'
+        )
+
+    with _checkout_contenthosts(request, count=2) as hosts:
+        ContentHost.parallel(hosts).map(register)
         yield hosts
 
 
@@ -220,7 +300,7 @@ def katello_host_tools_tracer_host(rex_contenthost, target_sat):
 def rhel_contenthost_with_repos(request, target_sat):
     """Install katello-host-tools-tracer, create custom
     repositories on the host"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _checkout_contenthosts(request) as host:
         # add IPv6 proxy for IPv6 communication
         if not host.network_type.has_ipv4:
             host.enable_ipv6_dnf_and_rhsm_proxy()
@@ -6,16 +6,20 @@ from packaging.version import Version
 import pytest
 from wait_for import wait_for
 
+from pytest_fixtures.core.contenthosts import deploy_conf, host_label
 from robottelo.config import configure_airgun, configure_nailgun, settings
 from robottelo.hosts import (
     Capsule,
+    ContentHost,
     IPAHost,
     Satellite,
     get_sat_rhel_version,
     lru_sat_ready_rhel,
 )
 from robottelo.logging import logger
+from robottelo.utils.host_group import HostGroup
 from robottelo.utils.installer import InstallerCommand
+from robottelo.utils.topology import Member, Topology
 
 
 def resolve_deploy_args(args_dict):
@@ -27,6 +31,21 @@ def resolve_deploy_args(args_dict):
     return args_dict
 
 
+def satellite_broker_args(workflow=None, **broker_args):
+    """Broker arguments of a Satellite checkout, with settings.server.deploy_arguments"""
+    if settings.server.deploy_arguments:
+        broker_args.update(settings.server.deploy_arguments)
+        logger.debug(f'Updated broker args for sat: {broker_args}')
+    return {'workflow': workflow or settings.server.deploy_workflows.product, **broker_args}
+
+
+def capsule_broker_args(workflow=None, **broker_args):
+    """Broker arguments of a Capsule checkout, with settings.capsule.deploy_arguments"""
+    if settings.capsule.deploy_arguments:
+        broker_args.update(settings.capsule.deploy_arguments)
+    return {'workflow': workflow or settings.capsule.deploy_workflows.product, **broker_args}
+
+
 @contextmanager
 def _target_satellite_host(request, satellite_factory):
     if 'sanity' not in request.config.option.markexpr:
@@ -78,15 +97,7 @@ def satellite_factory():
         logger.debug(f'Resolved deploy arguments for sat: {settings.server.deploy_arguments}')
 
     def factory(retry_limit=3, delay=300, workflow=None, **broker_args):
-        if settings.server.deploy_arguments:
-            broker_args.update(settings.server.deploy_arguments)
-            logger.debug(f'Updated broker args for sat: {broker_args}')
-
-        vmb = Broker(
-            host_class=Satellite,
-            workflow=workflow or settings.server.deploy_workflows.product,
-            **broker_args,
-        )
+        vmb = Broker(host_class=Satellite, **satellite_broker_args(workflow, **broker_args))
         timeout = (1200 + delay) * retry_limit
         sat = wait_for(
             vmb.checkout, timeout=timeout, delay=delay, handle_exception=True, raise_original=True
@@ -115,13 +126,7 @@ def capsule_factory():
         logger.debug(f'Resolved deploy arguments for cap: {settings.capsule.deploy_arguments}')
 
     def factory(retry_limit=3, delay=300, workflow=None, **broker_args):
-        if settings.capsule.deploy_arguments:
-            broker_args.update(settings.capsule.deploy_arguments)
-        vmb = Broker(
-            host_class=Capsule,
-            workflow=workflow or settings.capsule.deploy_workflows.product,
-            **broker_args,
-        )
+        vmb = Broker(host_class=Capsule, **capsule_broker_args(workflow, **broker_args))
         timeout = (1200 + delay) * retry_limit
         cap = wait_for(
             vmb.checkout, timeout=timeout, delay=delay, handle_exception=True, raise_original=True
@@ -131,6 +136,70 @@ def capsule_factory():
     return factory
 
 
+def _wire_capsules(hosts):
+    """Configure the capsules of a topology with its first satellite"""
+    if hosts.get('satellite') and hosts.get('capsule'):
+        capsules = HostGroup(hosts['capsule'])
+        capsules.capsule_prepare(sat_host=hosts['satellite'][0])
+        # the certs are generated and copied on the ssh session of the satellite, one at a time
+        installers = {capsule: capsule.capsule_certs_copy() for capsule in capsules}
+        capsules.map(lambda capsule: capsule.capsule_install(installers[capsule]))
+
+
+@pytest.fixture(scope='session')
+def topology_factory(satellite_factory, capsule_factory):
+    """Returns a factory of :class:`~robottelo.utils.topology.Topology`, whose hosts are
+    checked out at the same time
+
+    e.g. ``topology_factory('sat_with_capsule', satellites=1, capsules=1,
+    content_hosts=[{'rhel_version': '9'}, {'rhel_version': '8'}])``, deployed with
+    ``with topology.deploy() as hosts``. The hosts are yielded by member name: ``satellite``,
+    ``capsule`` and the label of the content hosts, e.g. ``rhel9``. The capsules are configured
+    with the first satellite unless ``wire`` is given.
+    """
+
+    def factory(
+        name, satellites=0, capsules=0, content_hosts=(), wire=_wire_capsules, **topology_args
+    ):
+        members = []
+        if satellites:
+            members.append(
+                Member(
+                    'satellite',
+                    Satellite,
+                    satellite_broker_args(),
+                    count=satellites,
+                    setup=lambda sat: sat.enable_satellite_ipv6_http_proxy(),
+                )
+            )
+        if capsules:
+            members.append(
+                Member(
+                    'capsule',
+                    Capsule,
+                    capsule_broker_args(),
+                    count=capsules,
+                    setup=lambda cap: cap.enable_ipv6_dnf_and_rhsm_proxy(),
+                )
+            )
+        content_members = {}
+        for params in content_hosts:
+            label = host_label(params)
+            if label in content_members:
+                content_members[label].count += 1
+            else:
+                content_members[label] = Member(
+                    label,
+                    ContentHost,
+                    deploy_conf(params, no_containers=params.get('no_containers', False)),
+                    setup=lambda host: host.setup(),
+                )
+        members.extend(content_members.values())
+        return Topology(name, members, wire=wire, **topology_args)
+
+    return factory
+
+
 @pytest.fixture
 def satellite_host(request, satellite_factory):
     """A fixture that provides a Satellite based on config settings"""
@@ -261,30 +330,13 @@ def module_capsule_configured_mqtt(request, module_capsule_configured_ansible):
 
 
 @pytest.fixture(scope='module')
-def module_lb_capsules(retry_limit=3, delay=300, **broker_args):
+def module_lb_capsules(topology_factory):
     """A fixture that spins 2 capsule for loadbalancer
     :return: List of capsules
     """
-    if settings.capsule.get('deploy_arguments'):
-        resolved = resolve_deploy_args(settings.capsule.deploy_arguments)
-        settings.set('capsule.deploy_arguments', resolved)
-        broker_args.update(settings.capsule.deploy_arguments)
-        timeout = (1200 + delay) * retry_limit
-        hosts = Broker(
-            host_class=Capsule,
-            workflow=settings.capsule.deploy_workflows.product,
-            _count=2,
-            **broker_args,
-        )
-        cap_hosts = wait_for(
-            hosts.checkout, timeout=timeout, delay=delay, handle_exception=True, raise_original=True
-        )
-
-    [cap.enable_ipv6_dnf_and_rhsm_proxy() for cap in cap_hosts.out]
-    yield cap_hosts.out
-
-    [cap.teardown() for cap in cap_hosts.out]
-    Broker(hosts=cap_hosts.out).checkin()
+    # the two capsules are checked out at the same time, each with its own retries
+    with topology_factory('lb_capsules', capsules=2).deploy() as hosts:
+        yield hosts['capsule']
 
 
 @pytest.fixture(scope='module')
@@ -8,6 +8,7 @@ import pytest
 from robottelo.config import configure_airgun, configure_nailgun, settings
 from robottelo.hosts import ContentHost, Satellite
 from robottelo.logging import logger
+from robottelo.utils import satellite_load
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -46,6 +47,11 @@ def align_to_satellite(request, worker_id, satellite_factory):
         # attempt to align a worker to a satellite
         if settings.server.xdist_behavior == 'run-on-one' and settings.server.hostnames:
             settings.set("server.hostname", settings.server.hostnames[0])
+        elif settings.server.xdist_behavior == 'least-loaded' and settings.server.hostnames:
+            tracker = satellite_load.start(settings.server.hostnames, worker_id)
+            settings.set("server.hostname", tracker.pick())
+            # the session fixtures are bound to this Satellite, whatever the modules pick later
+            tracker.session_hostname = settings.server.hostname
         elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
             settings.set("server.hostname", settings.server.hostnames[worker_pos])
         elif settings.server.xdist_behavior == 'balance' and settings.server.hostnames:
@@ -67,7 +73,26 @@ def align_to_satellite(request, worker_id, satellite_factory):
             configure_airgun()
             configure_nailgun()
         yield
+        satellite_load.stop()
         if on_demand_sat and settings.server.auto_checkin:
             logger.info(f'{worker_id=}: Checking in on-demand Satellite {on_demand_sat.hostname}')
             on_demand_sat.teardown()
             Broker(hosts=[on_demand_sat]).checkin()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def align_module_to_satellite(request, align_to_satellite):
+    """Move the worker to the least loaded Satellite before a module, with ``least-loaded``
+
+    Modules using session fixtures bound to the first Satellite of the worker go back to it.
+    """
+    if (tracker := satellite_load.get_tracker()) is None:
+        return
+    if request.node.nodeid in request.config._satellite_pinned_modules:
+        hostname = tracker.stay(tracker.session_hostname)
+    else:
+        hostname = tracker.pick()
+    if hostname != settings.server.hostname:
+        settings.set("server.hostname", hostname)
+        configure_airgun()
+        configure_nailgun()
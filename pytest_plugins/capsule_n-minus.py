@@ -4,6 +4,7 @@
 # Calculate capsule hostname from inventory just as we do in xDist.py
 from robottelo.config import settings
 from robottelo.hosts import Capsule
+from robottelo.utils.collection_pipeline import get_pipeline
 
 
 def pytest_addoption(parser):
@@ -18,29 +19,20 @@ def pytest_addoption(parser):
     parser.addoption("--n-minus", action='store_true', default=False, help=help_text)
 
 
-def pytest_collection_modifyitems(items, config):
-    if not config.getoption('n_minus', False):
-        return
-
-    selected = []
-    deselected = []
-
-    for item in items:
-        # Select only non-destructive tests with capsule_factory fixture or sat_maintain fxture with capsule parameter
-        if not (
-            item.get_closest_marker('destructive')
-            or 'session_puppet_enabled_sat' in item.fixturenames
-        ) and (
-            'capsule_factory' in item.fixturenames
-            or 'sat_maintain' in item.fixturenames
-            and 'capsule' in item.callspec.params.values()
-        ):
-            selected.append(item)
-            continue
-        deselected.append(item)
-
-    config.hook.pytest_deselected(items=deselected)
-    items[:] = selected
+def pytest_configure(config):
+    if config.getoption('n_minus', False):
+        get_pipeline(config).register('n_minus', select_n_minus, kind='filter')
+
+
+def select_n_minus(item, index):
+    # Select only non-destructive tests with capsule_factory fixture or sat_maintain fxture with capsule parameter
+    return not (
+        index.has_marker('destructive') or 'session_puppet_enabled_sat' in index.fixturenames
+    ) and (
+        'capsule_factory' in index.fixturenames
+        or 'sat_maintain' in index.fixturenames
+        and 'capsule' in item.callspec.params.values()
+    )
 
 
 def pytest_sessionfinish(session, exitstatus):
@@ -0,0 +1,14 @@
+"""Run the collection stages registered by the robottelo plugins
+
+Plugins register annotate and filter stages in their ``pytest_configure``, they are all run in a
+single walk over the collected items, see :mod:`robottelo.utils.collection_pipeline`.
+"""
+
+import pytest
+
+from robottelo.utils.collection_pipeline import get_pipeline
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items, config):
+    get_pipeline(config).run(items, config)
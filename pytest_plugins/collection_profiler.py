@@ -0,0 +1,95 @@
+"""Profile the collection hooks of the robottelo plugins
+
+Enabled with ``--collection-profile``. :class:`robottelo.utils.collection_profile.CollectionProfiler`
+times every collection hook implementation of the robottelo plugins and conftests, including the
+conftests loaded during collection, and every stage of the collection pipeline. It counts the
+items they receive and keep and the network calls they make. Each xdist worker sends its profile
+to the controller, which merges them, writes them to ``logs/collection_profile.json`` and lists
+the slowest implementations.
+"""
+
+import time
+
+import pytest
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.utils.collection_profile import CollectionProfiler
+
+_profiler = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--collection-profile',
+        action='store_true',
+        default=False,
+        help='Time the collection hooks of the robottelo plugins, report in '
+        'logs/collection_profile.json',
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    global _profiler
+    if config.getoption('collection_profile'):
+        _profiler = CollectionProfiler()
+        _profiler.instrument(config.pluginmanager)
+        _profiler.start()
+        config.pluginmanager.register(
+            WorkerReport(
+                'collection_profile',
+                _payload,
+                merge=_merge,
+                summary=_summary,
+                title='collection hooks by total time',
+            )
+        )
+
+
+def pytest_plugin_registered(plugin, manager):
+    """Profile the conftests registered during collection too"""
+    if _profiler is not None:
+        _profiler.instrument(manager, plugin)
+
+
+@pytest.hookimpl(wrapper=True, tryfirst=True)
+def pytest_collection(session):
+    started = time.perf_counter()
+    try:
+        return (yield)
+    finally:
+        if _profiler is not None:
+            _profiler.collection_seconds = time.perf_counter() - started
+            _profiler.items = len(getattr(session, 'items', []))
+            if (pipeline := getattr(session.config, '_collection_pipeline', None)) is not None:
+                _profiler.add_pipeline(pipeline)
+            _profiler.stop()
+
+
+def _payload():
+    """Return the profile of this process, once, None when it is not profiled"""
+    global _profiler
+    if _profiler is None:
+        return None
+    profile, _profiler = _profiler.to_dict(), None
+    return profile
+
+
+def _merge(profile, worker_profiles):
+    # the xdist controller does not collect, its own profile is empty
+    return CollectionProfiler.merge(*(worker_profiles or [profile]))
+
+
+def _summary(profile):
+    yield (
+        f'{profile["items"]} items collected in {profile["collection_seconds"]:.2f}s '
+        f'by {profile["workers"]} process(es)'
+    )
+    for key, stats in CollectionProfiler.top(profile):
+        items = (
+            f'{stats["items_in"]:7d} -> {stats["items_out"]:7d} items' if stats['items_in'] else ''
+        )
+        yield (
+            f'{stats["seconds"]:9.3f}s {stats["calls"]:7d} calls '
+            f'{stats["connections"]:4d} conn {stats["http_requests"]:4d} http  {key}  {items}'
+        )
@@ -0,0 +1,268 @@
+"""Distribute the tests across the xdist workers by their duration
+
+Enabled with ``--duration-scheduling``. The tests are grouped in work units by module (see
+``performance.scheduling.scope``), which keeps the module fixtures and the entities they create
+on the Satellite of one worker. Tests marked ``destructive`` or ``factory_instance`` use a
+Satellite of their own and are units of their own.
+
+The units are handed out longest first to the worker that runs out of work, the longest
+processing time first heuristic. Their durations are predicted from the previous sessions,
+kept in the pytest cache, and from the junit reports given with ``--durations-from``. The
+predicted and actual makespan are written to ``logs/duration_schedule.json``.
+"""
+
+from collections import OrderedDict, defaultdict
+import json
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+import pytest
+from xdist.scheduler import LoadScopeScheduling
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.collection_pipeline import item_index
+from robottelo.utils.duration_scheduling import (
+    FACTORY_MARKERS,
+    DurationHistory,
+    DurationPredictor,
+    junit_durations,
+    predict_makespan,
+    split_scope,
+)
+
+_session_durations = None
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """Scheduling of work units by predicted duration, longest first
+
+    :param markers_dir: directory the workers write their factory tests into
+    :param durations: known durations by node id
+    :param junit_files: junit reports with durations taking precedence over ``durations``
+    """
+
+    def __init__(
+        self,
+        config,
+        log=None,
+        markers_dir=None,
+        durations=None,
+        junit_files=(),
+        scope='module',
+        default_duration=None,
+        factory_duration=1800,
+    ):
+        super().__init__(config, log)
+        self.markers_dir = markers_dir
+        self.durations = durations or {}
+        self.junit_files = junit_files
+        self.scope = scope
+        self.default_duration = default_duration
+        self.factory_duration = factory_duration
+        self.factory_tests = frozenset()
+        self.predictor = None
+        self.predicted = None
+        self.started = None
+        self.finished = None
+        self.busy = defaultdict(float)
+        self._ordered = False
+
+    def _split_scope(self, nodeid):
+        if nodeid in self.factory_tests:
+            return nodeid
+        return split_scope(nodeid, self.scope)
+
+    def _read_factory_tests(self):
+        if self.markers_dir is None:
+            return frozenset()
+        # every worker collected the same tests, any of their files will do
+        for path in sorted(Path(self.markers_dir).glob('*.json')):
+            return frozenset(json.loads(path.read_text()))
+        return frozenset()
+
+    def unit_duration(self, work_unit):
+        return sum(self.predictor(nodeid) for nodeid in work_unit)
+
+    def schedule(self):
+        if self.collection is None:
+            self.factory_tests = self._read_factory_tests()
+            collection = next(iter(self.registered_collections.values()), [])
+            for junit_file in self.junit_files:
+                self.durations.update(junit_durations(junit_file, collection))
+            self.predictor = DurationPredictor(
+                self.durations,
+                factory_tests=self.factory_tests,
+                default=self.default_duration,
+                factory_default=self.factory_duration,
+            )
+        super().schedule()
+
+    def _assign_work_unit(self, node):
+        if not self._ordered:
+            units = sorted(
+                ((self.unit_duration(unit), scope, unit) for scope, unit in self.workqueue.items()),
+                key=lambda entry: -entry[0],
+            )
+            self.workqueue = OrderedDict((scope, unit) for _, scope, unit in units)
+            self._ordered = True
+            if self.predicted is None:
+                makespan, loads = predict_makespan([entry[0] for entry in units], len(self.nodes))
+                self.predicted = {'makespan': makespan, 'loads': loads, 'units': len(units)}
+                self.started = time.monotonic()
+                logger.info(
+                    f'Duration scheduling of {len(units)} units on {len(self.nodes)} workers, '
+                    f'predicted makespan {makespan:.0f}s, '
+                    f'{len(self.predictor.unknown)} tests without a known duration'
+                )
+        super()._assign_work_unit(node)
+
+    def _reschedule(self, node):
+        # a worker needs to know the test after the one it runs, it only gets more work when it
+        # is left with a single pending test so the next longest unit goes to the first free one
+        if (
+            not node.shutting_down
+            and self.workqueue
+            and self._pending_of(self.assigned_work[node]) >= 2
+        ):
+            return
+        super()._reschedule(node)
+
+    def remove_node(self, node):
+        # the pending units of a crashed node go back to the work queue
+        self._ordered = False
+        return super().remove_node(node)
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        self.busy[node.gateway.id] += duration
+        self.finished = time.monotonic()
+        super().mark_test_complete(node, item_index, duration)
+
+    def report(self):
+        """Return the predicted and actual makespan and worker loads"""
+        if self.predicted is None:
+            return None
+        return {
+            'predicted_makespan': round(self.predicted['makespan'], 3),
+            'actual_makespan': round((self.finished or self.started) - self.started, 3),
+            'predicted_loads': [round(load, 3) for load in self.predicted['loads']],
+            'actual_loads': {worker: round(busy, 3) for worker, busy in sorted(self.busy.items())},
+            'units': self.predicted['units'],
+            'tests': len(self.collection or ()),
+            'factory_tests': len(self.factory_tests),
+            'unknown_durations': len(self.predictor.unknown),
+            'scope': self.scope,
+        }
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--duration-scheduling',
+        action='store_true',
+        default=False,
+        help='Distribute the tests across the xdist workers longest first, by their duration '
+        'in the previous sessions.',
+    )
+    parser.addoption(
+        '--durations-from',
+        action='append',
+        default=[],
+        metavar='JUNIT_XML',
+        help='Junit report to read test durations from for --duration-scheduling, '
+        'they take precedence over the durations of the previous sessions.',
+    )
+
+
+def _summary(report):
+    yield (
+        f'{report["tests"]} tests in {report["units"]} units, '
+        f'{report["unknown_durations"]} without a known duration: '
+        f'predicted makespan {report["predicted_makespan"]:.1f}s, '
+        f'actual {report["actual_makespan"]:.1f}s'
+    )
+    for worker, busy in report['actual_loads'].items():
+        yield f'{worker}: {busy:.1f}s of tests'
+
+
+def pytest_configure(config):
+    global _session_durations
+    config._duration_scheduler = None
+    config._duration_markers_dir = None
+    # the workers report their tests to the controller, which records the durations
+    _session_durations = None if hasattr(config, 'workerinput') else defaultdict(float)
+    if config.getoption('duration_scheduling') and not hasattr(config, 'workerinput'):
+        config._duration_markers_dir = tempfile.mkdtemp(prefix='duration_scheduling_')
+        # the schedule is only known to the controller, the workers have nothing to send
+        config.pluginmanager.register(
+            WorkerReport(
+                'duration_schedule',
+                lambda: config._duration_scheduler and config._duration_scheduler.report(),
+                merge=lambda report, _: report,
+                summary=_summary,
+                title='duration scheduling',
+            )
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Ask a starting xdist worker for its factory tests"""
+    if markers_dir := node.config._duration_markers_dir:
+        node.workerinput['duration_markers_dir'] = markers_dir
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session):
+    """Write the factory tests for the controller, before xdist sends the collection"""
+    workerinput = getattr(session.config, 'workerinput', {})
+    if not (markers_dir := workerinput.get('duration_markers_dir')):
+        return
+    factory_tests = [
+        item.nodeid
+        for item in session.items
+        if not item_index(item).marker_names.isdisjoint(FACTORY_MARKERS)
+    ]
+    path = Path(markers_dir, f'{workerinput["workerid"]}.json')
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(factory_tests))
+    tmp_path.replace(path)
+
+
+@pytest.hookimpl(tryfirst=True, optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption('duration_scheduling') or config.getvalue('dist') == 'each':
+        return None
+    scheduling = settings.performance.scheduling
+    config._duration_scheduler = DurationScheduling(
+        config,
+        log,
+        markers_dir=config._duration_markers_dir,
+        durations=DurationHistory.load(getattr(config, 'cache', None)).durations,
+        junit_files=config.getoption('durations_from'),
+        scope=scheduling.scope,
+        default_duration=scheduling.default_duration or None,
+        factory_duration=scheduling.factory_duration,
+    )
+    return config._duration_scheduler
+
+
+def pytest_runtest_logreport(report):
+    """Sum the setup, call and teardown durations of every test, on the controller"""
+    if _session_durations is not None:
+        _session_durations[report.nodeid] += report.duration
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if hasattr(config, 'workerinput'):
+        return
+    cache = getattr(config, 'cache', None)
+    if _session_durations and cache is not None:
+        history = DurationHistory.load(cache, weight=settings.performance.scheduling.history_weight)
+        history.update(_session_durations)
+        history.save(cache)
+    if config._duration_markers_dir:
+        shutil.rmtree(config._duration_markers_dir, ignore_errors=True)
@@ -1,20 +1,25 @@
+import functools
 from inspect import getmembers, isfunction
 
+from robottelo.utils.collection_pipeline import get_pipeline
+
 
 def pytest_configure(config):
     """Register markers related to testimony tokens"""
     marker = 'factory_instance: Test uses a fresh satellite or Capsule instance deployed by broker'
     config.addinivalue_line("markers", marker)
+    get_pipeline(config).register('factory_instance', mark_factory_instance)
 
 
-def pytest_collection_modifyitems(session, items, config):
+@functools.cache
+def factory_fixture_names():
+    """Return the fixtures of sat_cap_factory deploying an instance, i.e. not the factories"""
     from pytest_fixtures.core import sat_cap_factory
 
-    factory_fixture_names = [m[0] for m in getmembers(sat_cap_factory, isfunction)]
-    for item in items:
-        itemfixtures = [
-            itm for itm in item.fixturenames if itm not in ('satellite_factory', 'capsule_factory')
-        ]
-        has_factoryfixture = set(itemfixtures).intersection(set(factory_fixture_names))
-        if has_factoryfixture:
-            item.add_marker('factory_instance')
+    fixture_names = frozenset(m[0] for m in getmembers(sat_cap_factory, isfunction))
+    return fixture_names - {'satellite_factory', 'capsule_factory'}
+
+
+def mark_factory_instance(item, index):
+    if index.uses_any(factory_fixture_names()):
+        item.add_marker('factory_instance')
@@ -1,3 +1,4 @@
+import functools
 from inspect import getmembers, isfunction
 import re
 
@@ -5,6 +6,7 @@ import pytest
 
 from robottelo.config import settings
 from robottelo.enums import NetworkType
+from robottelo.utils.collection_pipeline import get_pipeline
 
 TARGET_FIXTURES = {
     'rhel_contenthost',
@@ -154,47 +156,53 @@ def pytest_configure(config):
     """Register markers related to testimony tokens"""
     for marker in ['content_host: Test uses a content host deployed by broker']:
         config.addinivalue_line("markers", marker)
+    get_pipeline(config).register('content_host', mark_content_host)
 
 
-def pytest_collection_modifyitems(session, items, config):
+@functools.cache
+def content_host_fixture_names():
+    """Return the fixture names of the contenthosts fixtures module"""
     from pytest_fixtures.core import contenthosts
 
-    def chost_rhelver(params):
-        """Helper to retrieve the rhel_version of a client from test params"""
-        for param in params:
-            if 'contenthost' in param:
-                return params[param].get('rhel_version')
-        return None
-
-    content_host_fixture_names = [m[0] for m in getmembers(contenthosts, isfunction)]
-    for item in items:
-        if set(item.fixturenames).intersection(set(content_host_fixture_names)):
-            # TODO check param for indirect version parametrization
-            if hasattr(item, 'callspec'):
-                client_property = ('ClientOS', str(chost_rhelver(item.callspec.params)))
-            else:
-                client_property = ('ClientOS', str(settings.content_host.default_rhel_version))
-            item.user_properties.append(client_property)
-            item.add_marker('content_host')
-
-        if network_marker := item.get_closest_marker("network"):
-            marker_network_types = network_marker.args[0] if network_marker.args else []
-            # Skip the test if network_type setting is not set to ipv4 and network marker is set to ipv6
-            if 'ipv6' in marker_network_types and settings.content_host.network_type not in [
-                'ipv6',
-                'dualstack',
-            ]:
-                item.add_marker(
-                    pytest.mark.skip(reason=f"Skipping {item.name} due to network type mismatch")
-                )
-            # Skip the test if network_type setting is not set to ipv6 and network marker is set to ipv4
-            if 'ipv4' in marker_network_types and settings.content_host.network_type not in [
-                'ipv4',
-                'dualstack',
-            ]:
-                item.add_marker(
-                    pytest.mark.skip(reason=f"Skipping {item.name} due to network type mismatch")
-                )
+    return frozenset(m[0] for m in getmembers(contenthosts, isfunction))
+
+
+def chost_rhelver(params):
+    """Helper to retrieve the rhel_version of a client from test params"""
+    for param in params:
+        if 'contenthost' in param:
+            return params[param].get('rhel_version')
+    return None
+
+
+def mark_content_host(item, index):
+    if index.uses_any(content_host_fixture_names()):
+        # TODO check param for indirect version parametrization
+        if hasattr(item, 'callspec'):
+            client_property = ('ClientOS', str(chost_rhelver(item.callspec.params)))
+        else:
+            client_property = ('ClientOS', str(settings.content_host.default_rhel_version))
+        item.user_properties.append(client_property)
+        item.add_marker('content_host')
+
+    if network_marker := index.closest('network'):
+        marker_network_types = network_marker.args[0] if network_marker.args else []
+        # Skip the test if network_type setting is not set to ipv4 and network marker is set to ipv6
+        if 'ipv6' in marker_network_types and settings.content_host.network_type not in [
+            'ipv6',
+            'dualstack',
+        ]:
+            item.add_marker(
+                pytest.mark.skip(reason=f"Skipping {item.name} due to network type mismatch")
+            )
+        # Skip the test if network_type setting is not set to ipv6 and network marker is set to ipv4
+        if 'ipv4' in marker_network_types and settings.content_host.network_type not in [
+            'ipv4',
+            'dualstack',
+        ]:
+            item.add_marker(
+                pytest.mark.skip(reason=f"Skipping {item.name} due to network type mismatch")
+            )
 
 
 def pytest_addoption(parser):
@@ -1,16 +1,22 @@
 # File System related Collection Modification/Addition to test cases
 import re
 
+from robottelo.utils.collection_pipeline import get_pipeline
 
-def pytest_collection_modifyitems(session, items, config):
-    endpoint_regex = re.compile(
-        # To match the endpoint in the fspath
-        r'^.*/(?P<endpoint>\S*)/test_.*.py$',
-        re.IGNORECASE,
-    )
-    for item in items:
-        if item.nodeid.startswith('tests/robottelo/') or item.nodeid.startswith('tests/upgrades/'):
-            continue
+endpoint_regex = re.compile(
+    # To match the endpoint in the fspath
+    r'^.*/(?P<endpoint>\S*)/test_.*.py$',
+    re.IGNORECASE,
+)
 
-        if endpoints := endpoint_regex.findall(item.location[0]):
-            item.user_properties.append(('endpoint', endpoints[0]))
+
+def pytest_configure(config):
+    get_pipeline(config).register('endpoint', add_endpoint_property)
+
+
+def add_endpoint_property(item, index):
+    if item.nodeid.startswith('tests/robottelo/') or item.nodeid.startswith('tests/upgrades/'):
+        return
+
+    if endpoints := endpoint_regex.findall(item.location[0]):
+        item.user_properties.append(('endpoint', endpoints[0]))
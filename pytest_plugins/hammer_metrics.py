@@ -0,0 +1,32 @@
+"""Report hammer command timings at the end of the test session
+
+Enabled with ``performance.hammer_metrics``. :meth:`robottelo.cli.base.Base.execute` records the
+connect, remote exec, parse and total time together with the output size of every hammer
+command, keyed by ``<command_base> <command_sub>``. Each xdist worker sends its histograms to the
+controller, which merges them, writes them to ``logs/hammer_metrics.json`` and lists the
+subcommands the session spent the most time in.
+"""
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.config import settings
+from robottelo.utils.metrics import MetricsRegistry, hammer_metrics
+
+
+def pytest_configure(config):
+    if settings.performance.hammer_metrics is True:
+        config.pluginmanager.register(
+            WorkerReport(
+                'hammer_metrics',
+                hammer_metrics.to_dict,
+                merge=lambda metrics, worker_metrics: MetricsRegistry.merge(
+                    metrics, *worker_metrics
+                ).to_dict(),
+                summary=_summary,
+                title='hammer subcommands by total time',
+            )
+        )
+
+
+def _summary(metrics):
+    for key, total, count in MetricsRegistry.merge(metrics).top('total'):
+        yield f'{total:10.2f}s {count:7d} calls  hammer {key}'
@@ -0,0 +1,41 @@
+"""Take the Satellite host facts snapshot once per test session
+
+The xdist controller takes the snapshot of :mod:`robottelo.utils.host_facts` on first use,
+reusing the one stored in the pytest cache while it is fresh, and sends it to every worker, so
+the workers never connect to the Satellite during collection. Once the tests are collected, the
+facts are read from the Satellite again.
+"""
+
+import pytest
+
+from robottelo.utils import host_facts
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--offline-host-facts',
+        action='store_true',
+        default=False,
+        help='Take the Satellite and RHEL versions of the Satellite host from settings instead '
+        'of connecting to it.',
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    host_facts.configure(
+        cache=getattr(config, 'cache', None), offline=config.getoption('offline_host_facts')
+    )
+    if facts := getattr(config, 'workerinput', {}).get('host_facts'):
+        host_facts.set_snapshot(facts)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Send the controller snapshot to a starting xdist worker"""
+    node.workerinput['host_facts'] = host_facts.snapshot()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_finish(session):
+    host_facts.collection_finished()
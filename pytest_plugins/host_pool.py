@@ -0,0 +1,101 @@
+"""Check out the content hosts of the next tests ahead of them
+
+Enabled with ``performance.host_pool.enabled``. Before every test, the content hosts needed by
+it and by the following ``performance.host_pool.lookahead`` tests of the process are requested
+from the :mod:`robottelo.utils.host_pool` of the process, which checks them out in the
+background. Without xdist the following tests are the next ones of the collection. An xdist
+worker only looks at the tests the controller already sent to it, the other tests of the
+collection may run on other workers.
+
+Each xdist worker sends the hit rates and wait times of its pool to the controller, which merges
+them and writes them to ``logs/host_pool.json``.
+"""
+
+import pytest
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.config import settings
+from robottelo.utils import host_pool
+
+
+def pytest_configure(config):
+    config._host_pool_positions = {}
+    config._host_pool_worker = None
+    # closing the pool checks in the pooled hosts, its stats are the payload of the worker
+    config.pluginmanager.register(
+        WorkerReport(
+            'host_pool',
+            host_pool.close,
+            merge=lambda stats, worker_stats: host_pool.HostPool.merge(stats, *worker_stats),
+            summary=_summary,
+            title='content host pool',
+        )
+    )
+
+
+def pytest_collection_finish(session):
+    """Start the host pool of the processes running tests"""
+    if settings.performance.host_pool.enabled is not True or not session.items:
+        return
+    from robottelo.hosts import ContentHost
+
+    host_pool.configure(
+        ContentHost,
+        workers=settings.performance.host_pool.workers,
+        max_idle=settings.performance.host_pool.max_idle,
+    )
+    session.config._host_pool_positions = {
+        item.nodeid: position for position, item in enumerate(session.items)
+    }
+    session.config._host_pool_worker = _worker_interactor(session.config)
+
+
+def _worker_interactor(config):
+    """Return the xdist ``WorkerInteractor`` of this process, None without xdist"""
+    if not hasattr(config, 'workerinput'):
+        return None
+    for plugin in config.pluginmanager.get_plugins():
+        if type(plugin).__name__ == 'WorkerInteractor':
+            return plugin
+    return None
+
+
+def _upcoming(item, nextitem):
+    """Return the test about to run and the next tests of this process, up to the lookahead"""
+    lookahead = settings.performance.host_pool.lookahead
+    if not hasattr(item.config, 'workerinput'):
+        position = item.config._host_pool_positions.get(item.nodeid, 0)
+        return item.session.items[position : position + lookahead]
+    upcoming = [item] if nextitem is None else [item, nextitem]
+    # indexes of the tests sent to the worker, a queue.Queue replaced when the controller
+    # reschedules them, its pending indexes are read without taking them
+    queue = getattr(item.config._host_pool_worker, 'torun', None)
+    if not hasattr(queue, 'mutex'):
+        return upcoming[:lookahead]
+    with queue.mutex:
+        queued = [index for index in queue.queue if isinstance(index, int)]
+    items = item.session.items
+    return [*upcoming, *(items[index] for index in queued)][:lookahead]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    if (pool := host_pool.get_pool()) is None:
+        return
+    from pytest_fixtures.core.contenthosts import pooled_host_demand
+
+    upcoming = _upcoming(item, nextitem)
+    pool.prefetch([host for test in upcoming for host in pooled_host_demand(test)])
+
+
+def _summary(stats):
+    for label, counters in sorted(stats.items()):
+        requests = counters['requests']
+        hit_rate = counters['hits'] / requests if requests else 0
+        mean_wait = counters['wait_seconds'] / requests if requests else 0
+        yield (
+            f'{label}: {requests} hosts, {counters["hits"]} ready ({hit_rate:.1%}), '
+            f'{counters["waits"]} waited for, {counters["misses"]} checked out by the test, '
+            f'wait {mean_wait:.1f}s mean {counters["max_wait"]:.1f}s max, '
+            f'{counters["idle_checked_in"]} idle checked in'
+        )
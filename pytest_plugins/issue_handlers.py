@@ -1,14 +1,16 @@
 from collections import defaultdict
-import inspect
 import re
 
 import pytest
 
+from robottelo.logging import collection_logger as logger
 from robottelo.utils import slugify_component
 from robottelo.utils.issue_handlers import (
     add_workaround,
     should_deselect,
 )
+from robottelo.utils.issue_handlers.jira import jira_cache
+from robottelo.utils.issue_handlers.usage import IssueUsageIndex
 
 
 def pytest_configure(config):
@@ -25,21 +27,16 @@ def pytest_collection_modifyitems(session, items, config):
     pytest.issue_data = generate_issue_collection(items, config)
 
 
-IS_OPEN = re.compile(
-    # To match `if is_open('SAT:123456'):`
-    r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-NOT_IS_OPEN = re.compile(
-    # To match `if not is_open('SAT:123456'):`
-    r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
+def pytest_sessionfinish(session):
+    """Log the usage of the Jira status cache, if this process used it"""
+    if jira_cache.opened:
+        metrics = jira_cache.metrics()
+        logger.info(
+            f'Jira cache: {metrics["hits"]} hits, {metrics["misses"]} misses, '
+            f'{metrics["writes"]} writes, hit rate {metrics["hit_rate"]}, '
+            f'mean entry age {metrics["age_mean"]}s, max entry age {metrics["age_max"]}s'
+        )
 
-COMPONENT = re.compile(
-    # To match :CaseComponent: FooBar
-    r"\s*:CaseComponent:\s*(?P<component>\S*)",
-    re.IGNORECASE,
-)
 
 IMPORTANCE = re.compile(
     # To match :CaseImportance: Critical
@@ -97,6 +94,11 @@ def generate_issue_collection(items, config):  # pragma: no cover
             }
     """
     valid_markers = ["skip", "deselect"]
+    directory = None
+    if getattr(config, 'cache', None):
+        directory = config.cache.mkdir('issue_usage')
+    # `is_open` usages are read once per test module instead of once per item
+    index = IssueUsageIndex(directory)
     collected_data = defaultdict(lambda: {"used_in": []})
 
     deselect_data = {}  # a local cache for deselected tests
@@ -145,8 +147,7 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 deselect_data[item.location] = issue_key
 
         # Then take the workarounds using `is_open` helper.
-        source = inspect.getsource(item.function)
-        if 'is_open(' in source:
+        if usages := index.function_usages(item.function):
             kwargs = {
                 'filepath': filepath,
                 'lineno': lineno,
@@ -155,41 +156,30 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 'importance': importance_mark,
                 'component_mark': component_slug,
             }
-            add_workaround(collected_data, IS_OPEN.findall(source), 'is_open', **kwargs)
-            add_workaround(collected_data, NOT_IS_OPEN.findall(source), 'not is_open', **kwargs)
+            for usage, issue, _ in usages:
+                add_workaround(collected_data, [issue], usage, **kwargs)
 
     # Take uses of `is_open` from outside of test cases e.g: SetUp methods
-    for test_module in test_modules:
-        module_source = inspect.getsource(test_module)
-        component_matches = COMPONENT.findall(module_source)
-        module_component = None
-        if component_matches:
-            module_component = component_matches[0]
-        if 'is_open(' in module_source:
-            kwargs = {
-                'filepath': test_module.__file__,
-                'lineno': 1,
-                'testcase': test_module.__name__,
-                'component': module_component,
-            }
+    def validation(data, issue, usage, **kwargs):
+        return issue not in data
 
-            def validation(data, issue, usage, **kwargs):
-                return issue not in data
-
-            add_workaround(
-                collected_data,
-                IS_OPEN.findall(module_source),
-                'is_open',
-                validation=validation,
-                **kwargs,
-            )
-            add_workaround(
-                collected_data,
-                NOT_IS_OPEN.findall(module_source),
-                'not is_open',
-                validation=validation,
-                **kwargs,
-            )
+    for test_module in test_modules:
+        module_usages = index.module_usages(test_module.__file__)
+        kwargs = {
+            'filepath': test_module.__file__,
+            'lineno': 1,
+            'testcase': test_module.__name__,
+            'component': module_usages['component'],
+        }
+        for usage, issue, _ in module_usages['module']:
+            add_workaround(collected_data, [issue], usage, validation=validation, **kwargs)
+
+    index.save()
+    logger.info(
+        f'Issue usages of {len(test_modules)} test modules read in '
+        f'{index.stats["seconds"]:.2f}s, {index.stats["files_parsed"]} parsed, '
+        f'{index.stats["files_reused"]} reused from the cache'
+    )
 
     # --- add deselect markers dynamically ---
     for item in items:
@@ -5,6 +5,8 @@ import logzero
 import pytest
 from xdist import is_xdist_worker
 
+from robottelo import ssh
+from robottelo.cli import hammer_shell
 from robottelo.logging import (
     DEFAULT_DATE_FORMAT,
     logger,
@@ -72,3 +74,11 @@ def pytest_runtest_logreport(report):
         logger.error('Test phase \'%s\' failed for test: %s', report.when, report.nodeid)
         logger.error('Exception thrown:\n%s', report.longrepr)
     logger.info('Finished %s for test: %s, result: %s', report.when, report.nodeid, report.outcome)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Log the ssh connection pool reuse counters of this worker and close remote sessions"""
+    if stats := ssh.pool_stats():
+        logger.info(f'SSH connection pool stats: {stats}')
+        ssh.get_pool().clear()
+    hammer_shell.close_all()
@@ -1,47 +1,40 @@
 import pytest
 
 from robottelo.logging import collection_logger as logger
+from robottelo.utils.collection_pipeline import get_pipeline
 
 
 def pytest_configure(config):
     """Register custom marker for stubbed test cases."""
     config.addinivalue_line('markers', 'stubbed: Tests that are not automated yet or manual only.')
+    get_pipeline(config).register('stubbed', select_stubbed, kind='filter')
 
 
-def pytest_collection_modifyitems(session, config, items):
+def select_stubbed(item, index):
     """Remove/Include stubbed tests from collection based on CLI option"""
-    opt_passed = config.getvalue('mark_manuals_passed')
-    opt_skipped = config.getvalue('mark_manuals_skipped')
+    # Its a non-stubbed item, this stage doesn't apply
+    if not index.has_marker('stubbed'):
+        return True
+
+    config = item.config
+    # The test case is stubbed, but --include-stubbed was NOT passed, deselect the item
+    if not config.getvalue('include_stubbed'):
+        logger.debug(
+            f'Deselecting stubbed test {item.nodeid}, '
+            'use --include-stubbed to include in collection'
+        )
+        return False
+
+    # The test case is stubbed, and --include-stubbed was passed, include in collection
     # TODO turn this into a flag or a choice option, this logic is just silly.
-    mark_skipped = opt_skipped and not opt_passed
-    include_stubbed = config.getvalue('include_stubbed')
-    selected = []
-    deselected = []
-    for item in items:
-        stub_marked = item.get_closest_marker(name='stubbed')
-        # The test case is stubbed, and --include-stubbed was passed, include in collection
-        if stub_marked and include_stubbed:
-            selected.append(item)
-            # enforce skip/pass behavior by marking skip
-            if mark_skipped:
-                logger.debug(f'Marking collected stubbed test "{item.nodeid}" to skip')
-                item.add_marker(marker=pytest.mark.skip(reason='This is a Manual test!'))
-            continue
-
-        # The test case is stubbed, but --include-stubbed was NOT passed, deselect the item
-        if stub_marked and not include_stubbed:
-            logger.debug(
-                f'Deselecting stubbed test {item.nodeid}, '
-                'use --include-stubbed to include in collection'
-            )
-            deselected.append(item)
-            continue
-
-        # Its a non-stubbed item, this hook doesn't apply
-        selected.append(item)
-
-    config.hook.pytest_deselected(items=deselected)
-    items[:] = selected
+    mark_skipped = config.getvalue('mark_manuals_skipped') and not config.getvalue(
+        'mark_manuals_passed'
+    )
+    # enforce skip/pass behavior by marking skip
+    if mark_skipped:
+        logger.debug(f'Marking collected stubbed test "{item.nodeid}" to skip')
+        item.add_marker(pytest.mark.skip(reason='This is a Manual test!'))
+    return True
 
 
 def pytest_addoption(parser):
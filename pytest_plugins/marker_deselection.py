@@ -1,6 +1,4 @@
-import pytest
-
-from robottelo.logging import collection_logger as logger
+from robottelo.utils.collection_pipeline import get_pipeline
 
 
 def pytest_addoption(parser):
@@ -20,32 +18,20 @@ def pytest_addoption(parser):
         parser.addoption(opt, action='store_true', default=False, help=help_text)
 
 
-@pytest.hookimpl(tryfirst=True)
-def pytest_collection_modifyitems(items, config):
+def pytest_configure(config):
+    get_pipeline(config).register('infra_markers', deselect_infra_dependent, kind='filter')
+
+
+def deselect_infra_dependent(item, index):
     """
-    Collects and modifies tests collection based on pytest option to deselect tests for new infra
+    Deselect tests for new infra based on their markers and pytest options
     """
-    include_onprem_provision = config.getoption('include_onprem_provisioning', False)
-    include_ipv6_provisioning = config.getoption('include_ipv6_provisioning', False)
-
-    selected = []
-    deselected = []
-    # Cloud Provisioning Test can be run on new pipeline
-    for item in items:
-        item_marks = [m.name for m in item.iter_markers()]
-        # Include / Exclude On Premises Provisioning Tests
-        if 'on_premises_provisioning' in item_marks:
-            selected.append(item) if include_onprem_provision else deselected.append(item)
-            continue
-        # Include / Exclude IPv6 Provisioning Tests
-        if 'ipv6_provisioning' in item_marks:
-            selected.append(item) if include_ipv6_provisioning else deselected.append(item)
-            continue
-        # This Plugin does not applies to this test
-        selected.append(item)
-    logger.debug(
-        f'Selected {len(selected)} and deselected {len(deselected)} '
-        'tests based on auto un-collectable markers and pytest options.'
-    )
-    items[:] = selected or items
-    config.hook.pytest_deselected(items=deselected)
+    config = item.config
+    # Include / Exclude On Premises Provisioning Tests
+    if index.has_marker('on_premises_provisioning'):
+        return config.getoption('include_onprem_provisioning', False)
+    # Include / Exclude IPv6 Provisioning Tests
+    if index.has_marker('ipv6_provisioning'):
+        return config.getoption('include_ipv6_provisioning', False)
+    # This Plugin does not applies to this test
+    return True
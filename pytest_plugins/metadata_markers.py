@@ -1,6 +1,4 @@
 import datetime
-import inspect
-import re
 
 import pytest
 
@@ -8,7 +6,9 @@ from robottelo.config import settings
 from robottelo.hosts import get_sat_rhel_version
 from robottelo.logging import collection_logger as logger
 from robottelo.utils import parse_comma_separated_list
+from robottelo.utils.collection_pipeline import item_index
 from robottelo.utils.issue_handlers.jira import are_any_jira_open
+from robottelo.utils.metadata_index import MetadataIndex
 
 FMT_XUNIT_TIME = '%Y-%m-%dT%H:%M:%S'
 IMPORTANCE_LEVELS = []
@@ -49,6 +49,13 @@ def pytest_addoption(parser):
         help='Comma separated list of Jiras to collect tests matching Verifies testimony marker. '
         'If no issue is provided all the tests with Verifies testimony marker will be selected.',
     )
+    parser.addoption(
+        '--no-metadata-index',
+        action='store_true',
+        default=False,
+        help='Parse testimony tokens from every test docstring instead of reusing the tokens '
+        'indexed by previous runs for unchanged test files.',
+    )
 
 
 def pytest_configure(config):
@@ -61,37 +68,10 @@ def pytest_configure(config):
         'verifies_issues: Verifies testimony token, use --verifies_issues to filter',
     ]:
         config.addinivalue_line("markers", marker)
-
-
-component_regex = re.compile(
-    # To match :CaseComponent: FooBar
-    r'\s*:CaseComponent:\s*(?P<component>\S*)',
-    re.IGNORECASE,
-)
-
-importance_regex = re.compile(
-    # To match :CaseImportance: Critical
-    r'\s*:CaseImportance:\s*(?P<importance>\S*)',
-    re.IGNORECASE,
-)
-
-team_regex = re.compile(
-    # To match :Team: Rocket
-    r'\s*:Team:\s*(?P<team>\S*)',
-    re.IGNORECASE,
-)
-
-blocked_by_regex = re.compile(
-    # To match :BlockedBy: SAT-32932
-    r'\s*:BlockedBy:\s*(?P<blocked_by>.*\S*)',
-    re.IGNORECASE,
-)
-
-verifies_regex = re.compile(
-    # To match :Verifies: SAT-32932
-    r'\s*:Verifies:\s*(?P<verifies>.*\S*)',
-    re.IGNORECASE,
-)
+    directory = None
+    if not config.getoption('no_metadata_index') and getattr(config, 'cache', None):
+        directory = config.cache.mkdir('metadata_index')
+    config._metadata_index = MetadataIndex(directory)
 
 
 def handle_verification_issues(item, verifies_marker, verifies_issues):
@@ -160,6 +140,7 @@ def pytest_collection_modifyitems(items, config):
     verifies_issues = config.getoption('verifies_issues')
     blocked_by = config.getoption('blocked_by')
     logger.info('Processing test items to add testimony token markers')
+    metadata_index = config._metadata_index
     for item in items:
         item.user_properties.append(
             ("start_time", datetime.datetime.now(datetime.UTC).strftime(FMT_XUNIT_TIME))
@@ -170,39 +151,30 @@ def pytest_collection_modifyitems(items, config):
 
         # apply the marks for importance, component, and team
         # Find matches from docstrings starting at smallest scope
-        item_docstrings = [
-            d
-            for d in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
-            if d is not None
-        ]
+        # tokens are parsed once per test function and reused while the test file is unchanged
         blocked_by_marks_to_add = []
         verifies_marks_to_add = []
-        for docstring in item_docstrings:
-            item_mark_names = [m.name for m in item.iter_markers()]
+        for tokens in metadata_index.tokens(item):
+            # the marker index is only rebuilt after a marker was added
+            index = item_index(item)
             # Add marker starting at smallest docstring scope
             # only add the mark if it hasn't already been applied at a lower scope
-            doc_component = component_regex.findall(docstring)
-            if doc_component and 'component' not in item_mark_names:
-                item.add_marker(pytest.mark.component(doc_component[0].lower()))
-            doc_importance = importance_regex.findall(docstring)
-            if doc_importance and 'importance' not in item_mark_names:
-                item.add_marker(pytest.mark.importance(doc_importance[0].lower()))
-            doc_team = team_regex.findall(docstring)
-            if doc_team and 'team' not in item_mark_names:
-                item.add_marker(pytest.mark.team(doc_team[0].lower()))
-            doc_verifies = verifies_regex.findall(docstring)
-            if doc_verifies and 'verifies_issues' not in item_mark_names:
-                verifies_marks_to_add.extend(str(b.strip()) for b in doc_verifies[-1].split(','))
-            doc_blocked_by = blocked_by_regex.findall(docstring)
-            if doc_blocked_by and 'blocked_by' not in item_mark_names:
-                blocked_by_marks_to_add.extend(
-                    str(b.strip()) for b in doc_blocked_by[-1].split(',')
-                )
+            if 'component' in tokens and not index.has_marker('component'):
+                item.add_marker(pytest.mark.component(tokens['component']))
+            if 'importance' in tokens and not index.has_marker('importance'):
+                item.add_marker(pytest.mark.importance(tokens['importance']))
+            if 'team' in tokens and not index.has_marker('team'):
+                item.add_marker(pytest.mark.team(tokens['team']))
+            if 'verifies' in tokens and not index.has_marker('verifies_issues'):
+                verifies_marks_to_add.extend(tokens['verifies'])
+            if 'blocked_by' in tokens and not index.has_marker('blocked_by'):
+                blocked_by_marks_to_add.extend(tokens['blocked_by'])
         if blocked_by_marks_to_add:
             item.add_marker(pytest.mark.blocked_by(blocked_by_marks_to_add))
         if verifies_marks_to_add:
             item.add_marker(pytest.mark.verifies_issues(verifies_marks_to_add))
 
+        index = item_index(item)
         # add markers as user_properties so they are recorded in XML properties of the report
         # pytest-ibutsu will include user_properties dict in testresult metadata
         markers_prop_data = []
@@ -241,7 +213,7 @@ def pytest_collection_modifyitems(items, config):
 
             # https://github.com/pytest-dev/pytest/issues/1373  Will make this way easier
             # testimony requires both importance and component, this will blow up if its forgotten
-            importance_marker = item.get_closest_marker('importance').args[0]
+            importance_marker = index.closest('importance').args[0]
             if importance and importance_marker not in importance:
                 logger.debug(
                     f'Deselected test {item.nodeid} due to "--importance {importance}",'
@@ -249,7 +221,7 @@ def pytest_collection_modifyitems(items, config):
                 )
                 deselected.append(item)
                 continue
-            component_marker = item.get_closest_marker('component').args[0]
+            component_marker = index.closest('component').args[0]
             if component and component_marker not in component:
                 logger.debug(
                     f'Deselected test {item.nodeid} due to "--component {component}",'
@@ -257,7 +229,7 @@ def pytest_collection_modifyitems(items, config):
                 )
                 deselected.append(item)
                 continue
-            team_marker = item.get_closest_marker('team').args[0]
+            team_marker = index.closest('team').args[0]
             if team and team_marker not in team:
                 logger.debug(
                     f'Deselected test {item.nodeid} due to "--team {team}",'
@@ -269,14 +241,24 @@ def pytest_collection_modifyitems(items, config):
         if verifies_issues or blocked_by:
             # Filter tests based on --verifies-issues and --blocked-by pytest options
             # and Verifies and BlockedBy testimony tokens.
-            verifies_marker = item.get_closest_marker('verifies_issues', False)
-            blocked_by_marker = item.get_closest_marker('blocked_by', False)
+            verifies_marker = index.closest('verifies_issues', False)
+            blocked_by_marker = index.closest('blocked_by', False)
             if not handle_verification_issues(item, verifies_marker, verifies_issues):
                 continue
             if not handle_blocked_by(item, blocked_by_marker, blocked_by):
                 continue
         selected.append(item)
 
+    metadata_index.save()
+    stats = metadata_index.stats
+    # a cold run parses every test file, a warm one reuses the tokens of unchanged files
+    logger.info(
+        f'Testimony tokens of {stats["items"] + stats["items_not_indexed"]} items extracted in '
+        f'{stats["seconds"]:.3f}s ({"warm" if stats["files_reused"] else "cold"} index: '
+        f'{stats["files_reused"]} files reused, {stats["files_parsed"]} files parsed, '
+        f'{stats["items_not_indexed"]} items not indexable)'
+    )
+
     # selected will be empty if no filter option was passed, defaulting to full items list
     items[:] = selected if deselected else items
     config.hook.pytest_deselected(items=deselected)
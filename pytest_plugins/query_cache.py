@@ -0,0 +1,41 @@
+"""Report the Satellite query cache hit/miss counters at the end of the test session
+
+Each xdist worker sends the counters of its :mod:`robottelo.utils.query_cache` caches to the
+controller, which sums them, writes them to ``logs/query_cache_stats.json`` and reports them in
+the terminal summary.
+"""
+
+from collections import Counter
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.utils import query_cache
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(
+        WorkerReport(
+            'query_cache_stats',
+            query_cache.stats,
+            merge=_merge,
+            summary=_summary,
+            title='satellite query cache',
+        )
+    )
+
+
+def _merge(stats, worker_stats):
+    total = Counter(stats)
+    for stats_of_worker in worker_stats:
+        total.update(stats_of_worker)
+    return dict(total)
+
+
+def _summary(stats):
+    stats = Counter(stats)
+    lookups = stats['hits'] + stats['shared_hits'] + stats['misses']
+    hit_rate = (stats['hits'] + stats['shared_hits']) / lookups if lookups else 0
+    yield (
+        f'{lookups} lookups: {stats["hits"]} hits, {stats["shared_hits"]} shared hits, '
+        f'{stats["misses"]} misses ({hit_rate:.1%} hit rate), '
+        f'{stats["invalidations"]} invalidations'
+    )
@@ -139,13 +139,11 @@ def pytest_collection_modifyitems(items, config):
         _validate_launch(ref_launch)
         tests.extend(rp.get_tests(launch=ref_launch, **test_args))
     # remove inapplicable tests from the current test collection
-    deselected = [
-        i
-        for i in items
-        if f'{i.location[0]}.{i.location[2]}'.replace('::', '.')
-        not in [t['name'].replace('::', '.') for t in tests]
-    ]
-    selected = list(set(items) - set(deselected))
+    rp_tests = {t['name'].replace('::', '.') for t in tests}
+    selected, deselected = [], []
+    for item in items:
+        name = f'{item.location[0]}.{item.location[2]}'.replace('::', '.')
+        (selected if name in rp_tests else deselected).append(item)
     logger.debug(
         f'Selected {len(selected)} and deselected {len(deselected)} tests based on latest/given-/ '
         'launch test results.'
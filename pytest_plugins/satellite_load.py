@@ -0,0 +1,66 @@
+"""Track the tests run on every Satellite with the ``least-loaded`` xdist behavior
+
+The workers publish the tests they run to the shared store of
+:mod:`robottelo.utils.satellite_load` and send their timeline to the xdist controller, which
+merges them and writes the utilization timeline of every Satellite to
+``logs/satellite_utilization.json``.
+"""
+
+import pytest
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.config import settings
+from robottelo.utils import satellite_load
+
+
+def pytest_configure(config):
+    config._satellite_pinned_modules = set()
+    config.pluginmanager.register(
+        WorkerReport(
+            'satellite_utilization',
+            _payload,
+            merge=_merge,
+            summary=_summary,
+            title='satellite utilization',
+        )
+    )
+
+
+def pytest_collection_finish(session):
+    if settings.server.xdist_behavior == 'least-loaded':
+        session.config._satellite_pinned_modules = satellite_load.pinned_modules(session.items)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    if (tracker := satellite_load.get_tracker()) is None:
+        return (yield)
+    tracker.test_started()
+    try:
+        return (yield)
+    finally:
+        tracker.test_finished()
+
+
+def _payload():
+    tracker = satellite_load.get_tracker()
+    return tracker.events if tracker is not None else []
+
+
+def _merge(events, worker_events):
+    events = [*events, *(event for worker in worker_events for event in worker)]
+    timeline = satellite_load.utilization_timeline(events)
+    return {
+        'summary': satellite_load.utilization_summary(timeline),
+        'picks': [event for event in sorted(events) if event[1] == 'pick'],
+        'timeline': timeline,
+    }
+
+
+def _summary(report):
+    for hostname, stats in sorted(report['summary'].items()):
+        latency = f'{stats["latency"]:.2f}s' if stats['latency'] is not None else 'unknown'
+        yield (
+            f'{hostname}: {stats["test_seconds"]:.0f}s of tests, '
+            f'up to {stats["peak_active"]} at once, latency {latency}'
+        )
@@ -0,0 +1,38 @@
+"""Report the time the tests spent waiting for Foreman tasks
+
+Every xdist worker sends the wait times of :mod:`robottelo.utils.task_watcher` to the controller,
+which writes them to ``logs/task_waits.json`` and lists the tests which waited the longest in the
+terminal summary.
+"""
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.utils import task_watcher
+
+# tests listed in the terminal summary
+TOP_TESTS = 10
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(
+        WorkerReport(
+            'task_waits', _payload, merge=_merge, summary=_summary, title='foreman task waits'
+        )
+    )
+
+
+def _payload():
+    # json keys are strings, the waits outside of tests are kept under ''
+    return {test or '': seconds for test, seconds in task_watcher.wait_times().items()}
+
+
+def _merge(waits, worker_waits):
+    for waits_of_worker in worker_waits:
+        for test, seconds in waits_of_worker.items():
+            waits[test] = waits.get(test, 0) + seconds
+    return dict(sorted(waits.items(), key=lambda item: item[1], reverse=True))
+
+
+def _summary(waits):
+    yield f'{sum(waits.values()):.0f}s waiting for tasks in {len(waits)} tests, the longest:'
+    for test, seconds in list(waits.items())[:TOP_TESTS]:
+        yield f'{seconds:8.1f}s {test or "outside of tests"}'
@@ -0,0 +1,38 @@
+"""Report the ready time of the topologies deployed during the session
+
+Every xdist worker sends the reports of :mod:`robottelo.utils.topology` to the controller, which
+writes them to ``logs/topology.json`` and lists the ready time of every topology in the terminal
+summary.
+"""
+
+from pytest_plugins.worker_report import WorkerReport
+from robottelo.utils import topology
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(
+        WorkerReport(
+            'topology',
+            topology.reports,
+            merge=lambda reports, worker_reports: reports + sum(worker_reports, []),
+            summary=_summary,
+            title='topology ready time',
+        )
+    )
+
+
+def _summary(reports):
+    for report in reports:
+        hosts = len(report['hosts'])
+        if 'error' in report:
+            yield (
+                f'{report["name"]}: failed after {report["checkout_seconds"]:.0f}s '
+                f'with {hosts} hosts: {report["error"]}'
+            )
+            continue
+        yield (
+            f'{report["name"]}: {hosts} hosts ready in {report["ready_seconds"]:.0f}s, '
+            f'checkout {report["checkout_seconds"]:.0f}s '
+            f'(slowest host {report["slowest_host_seconds"]:.0f}s), '
+            f'wiring {report["wire_seconds"]:.0f}s'
+        )
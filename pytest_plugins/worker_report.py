@@ -0,0 +1,73 @@
+"""Gather a report of every xdist worker on the controller at the end of the session
+
+Plugins reporting on the work of the session register a :class:`WorkerReport` when they are
+configured. At the end of the session every worker sends its payload to the controller, which
+merges them with its own, writes the result to ``logs/<name>.json`` and summarizes it in the
+terminal summary.
+
+Usage::
+
+    def pytest_configure(config):
+        config.pluginmanager.register(
+            WorkerReport('host_pool', host_pool.close, title='content host pool', ...)
+        )
+"""
+
+import json
+
+import pytest
+
+from robottelo.logging import logger, robottelo_log_dir
+
+
+class WorkerReport:
+    """A pytest plugin merging the payloads of the xdist workers into one report file
+
+    :param name: key of the payload in the xdist ``workeroutput``, and name of the report file
+    :param payload: returns the json serializable payload of the process, falsy when it has
+        nothing to report
+    :param merge: builds the report from the payload of the controller and the list of payloads
+        of the workers, the payloads of all the processes in a list by default
+    :param summary: returns the lines of the terminal summary of the report
+    :param title: title of the terminal summary section
+    """
+
+    def __init__(self, name, payload, merge=None, summary=None, title=None):
+        self.name = name
+        self.payload = payload
+        self.merge = merge or (lambda own, workers: [own, *workers] if own else workers)
+        self.summary = summary
+        self.title = title or name
+        self.file = robottelo_log_dir.joinpath(f'{name}.json')
+        self.report = None
+        self._worker_payloads = []
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """Collect the payload sent by a finished xdist worker"""
+        if payload := getattr(node, 'workeroutput', {}).get(self.name):
+            self._worker_payloads.append(payload)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        """Send the payload to the controller, or merge and dump the payloads on the controller"""
+        payload = self.payload()
+        if hasattr(session.config, 'workerinput'):
+            if payload:
+                session.config.workeroutput[self.name] = payload
+            return
+        if not payload and not self._worker_payloads:
+            return
+        if not (report := self.merge(payload, self._worker_payloads)):
+            return
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+        self.file.write_text(json.dumps(report, indent=2))
+        logger.info(f'Report of the {self.title} written to {self.file}')
+        self.report = report
+
+    def pytest_terminal_summary(self, terminalreporter, exitstatus, config):
+        if not self.report or self.summary is None:
+            return
+        terminalreporter.write_sep('-', self.title)
+        for line in self.summary(self.report):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f'Full report: {self.file}')
@@ -1,14 +1,18 @@
 """Generic base class for cli hammer commands."""
 
+from concurrent.futures import ThreadPoolExecutor
 import re
+import time
 
+from broker.helpers import Result
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import hammer, hammer_shell
 from robottelo.config import settings
 from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
 from robottelo.logging import logger
+from robottelo.utils.metrics import hammer_metrics
 from robottelo.utils.ssh import get_client
 
 
@@ -172,6 +176,32 @@ class Base:
 
         return (username, password)
 
+    @classmethod
+    def _hammer_args(cls, command, user=None, password=None, output_format=None):
+        """Build the hammer arguments, with credentials, for the cli ``command``"""
+        if cls.omitting_credentials:
+            user, password = None, None
+        else:
+            user, password = cls._get_username_password(user, password)
+        return '-v {} {} {} {}'.format(
+            f'-u {user}' if user else "--interactive no",
+            f'-p {password}' if password else "",
+            f'--output={output_format}' if output_format else "",
+            command,
+        )
+
+    @classmethod
+    def _hammer_command(cls, command, user=None, password=None, output_format=None):
+        """Build the full hammer shell line, with credentials, for the cli ``command``"""
+        time_hammer = settings.performance.time_hammer
+
+        # add time to measure hammer performance
+        return 'LANG={} {} hammer {}'.format(
+            settings.robottelo.locale,
+            'time -p' if time_hammer else '',
+            cls._hammer_args(command, user=user, password=password, output_format=output_format),
+        )
+
     @classmethod
     def execute(
         cls,
@@ -184,32 +214,73 @@ class Base:
         ignore_stderr=None,
         return_raw_response=None,
     ):
-        """Executes the cli ``command`` on the server via ssh"""
-        if cls.omitting_credentials:
-            user, password = None, None
-        else:
-            user, password = cls._get_username_password(user, password)
-        time_hammer = settings.performance.time_hammer
+        """Executes the cli ``command`` on the server via ssh
 
-        # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
-            settings.robottelo.locale,
-            'time -p' if time_hammer else '',
-            f'-u {user}' if user else "--interactive no",
-            f'-p {password}' if password else "",
-            f'--output={output_format}' if output_format else "",
-            command,
-        )
-        response = ssh.command(
-            cmd,
-            hostname=hostname or cls.hostname or settings.server.hostname,
-            output_format=output_format,
-            timeout=timeout,
-        )
+        With ``performance.hammer_backend`` set to ``shell`` the command is streamed into a
+        long-lived hammer process, see :mod:`robottelo.cli.hammer_shell`. The one-shot
+        ``hammer`` execution is used when that process can not be started.
+        """
+        started = time.monotonic()
+        hostname = hostname or cls.hostname or settings.server.hostname
+        response = None
+        if settings.performance.hammer_backend == 'shell':
+            response = hammer_shell.command(
+                cls._hammer_args(
+                    command, user=user, password=password, output_format=output_format
+                ),
+                hostname=hostname,
+                output_format=output_format,
+                timeout=timeout,
+                env={'LANG': settings.robottelo.locale},
+                timed=bool(settings.performance.time_hammer),
+            )
+        if response is None:
+            response = ssh.command(
+                cls._hammer_command(
+                    command, user=user, password=password, output_format=output_format
+                ),
+                hostname=hostname,
+                output_format=output_format,
+                timeout=timeout,
+            )
+        if settings.performance.hammer_metrics is True:
+            timings = getattr(response, 'timings', {})
+            cls._record_timings(timings | {'total': time.monotonic() - started})
         if return_raw_response:
             return response
         return cls._handle_response(response, ignore_stderr=ignore_stderr)
 
+    @classmethod
+    def iter_execute(cls, command, hostname=None, user=None, password=None, output_format='csv'):
+        """Executes the cli ``command`` and yields the parsed rows as hammer prints them
+
+        Rows are parsed from the ssh channel output as it arrives, see
+        :func:`robottelo.ssh.stream_command`, instead of after the whole output was received.
+        The one-shot ``hammer`` execution is always used.
+
+        :raises robottelo.exceptions.CLIReturnCodeError: once the output was consumed, if the
+            command failed.
+        """
+        stream = ssh.stream_command(
+            cls._hammer_command(command, user=user, password=password, output_format=output_format),
+            hostname=hostname or cls.hostname or settings.server.hostname,
+        )
+        if output_format == 'json':
+            yield from hammer.iter_json(stream)
+        else:
+            yield from hammer.iter_csv(hammer.iter_lines(stream))
+        cls._handle_response(Result(status=stream.status, stdout='', stderr=stream.stderr))
+
+    @classmethod
+    def _record_timings(cls, timings):
+        """Record hammer timings under "<command_base> <command_sub>" for the session report
+
+        See :mod:`pytest_plugins.hammer_metrics`.
+        """
+        key = f'{cls.command_base} {cls.command_sub}'
+        for metric, value in timings.items():
+            hammer_metrics.observe(key, metric, value)
+
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
         """Executes the satellite-maintain cli commands on the server via ssh"""
@@ -222,7 +293,8 @@ class Base:
         """Search for an entity using the query ``search[0]="search[1]"``
 
         Will be used the ``list`` command with the ``--search`` option to do
-        the search.
+        the search. Only a single row is fetched, unless the class overrides
+        ``list``, which is then called as is.
 
         If ``options`` argument already have a search key, then the ``search``
         argument will not be evaluated. Which allows different search query.
@@ -235,11 +307,15 @@ class Base:
         if search is not None and 'search' not in options:
             options.update({'search': f'{search[0]}=\\"{search[1]}\\"'})
 
-        result = cls.list(options)
-        if result:
-            result = result[0]
+        if cls.list.__func__ is not Base.list.__func__:
+            # list overrides may change the options or the output format, use them as is
+            result = cls.list(options)
+            if result:
+                result = result[0]
+            return result
 
-        return result
+        # only the first match is needed, fetch a single row
+        return next(cls.iter_list(options, page_size=1), [])
 
     @classmethod
     def info(cls, options=None, output_format=None, return_raw_response=None):
@@ -258,14 +334,19 @@ class Base:
             return_raw_response=return_raw_response,
         )
         if not return_raw_response and output_format != 'json':
+            started = time.monotonic()
             result = hammer.parse_info(result)
+            if settings.performance.hammer_metrics is True:
+                cls._record_timings({'parse_info': time.monotonic() - started})
         return result
 
     @classmethod
-    def list(cls, options=None, per_page=True, output_format='csv'):
+    def list(cls, options=None, per_page=True, output_format='csv', lazy=False):
         """
         List information.
         @param options: ID (sometimes name works as well) to retrieve info.
+        @param lazy: return a generator yielding the rows while they are received,
+            see ``iter_execute``.
         """
 
         cls.command_sub = 'list'
@@ -282,7 +363,54 @@ class Base:
         # if cls.command_requires_org and 'organization-id' not in options:
         #     raise CLIError(f'organization-id option is required for {cls.__name__}.list')
 
-        return cls.execute(cls._construct_command(options), output_format=output_format)
+        if lazy:
+            return cls.iter_execute(cls._construct_command(options), output_format=output_format)
+        result = cls.execute(cls._construct_command(options), output_format=output_format)
+        if isinstance(result, list) and per_page and len(result) == options['per-page']:
+            logger.warning(
+                f'{cls.command_base} list returned a full page of {len(result)} rows, '
+                'the results may be truncated, use iter_list to fetch all of them'
+            )
+        return result
+
+    @classmethod
+    def iter_list(cls, options=None, page_size=1000, prefetch=False, output_format='csv'):
+        """Iterate over every ``list`` result, fetching ``page_size`` rows per hammer call
+
+        Pages are only requested while the caller keeps consuming rows, so stopping early,
+        e.g. after the first match, saves the remaining calls. With ``prefetch`` the next page
+        is fetched on a background thread while the current one is consumed.
+
+        Entities created or deleted while iterating may shift the rows between pages.
+        """
+        options = {**(options or {}), 'per-page': page_size}
+
+        def page_command(page):
+            # built by the caller thread, command_sub is shared by the whole class
+            cls.command_sub = 'list'
+            return cls._construct_command({**options, 'page': page})
+
+        def fetch(command):
+            # an empty output is parsed to {} or None
+            return cls.execute(command, output_format=output_format) or []
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = 1
+            rows = fetch(page_command(page))
+            while True:
+                next_rows = None
+                if executor and len(rows) == page_size:
+                    next_rows = executor.submit(fetch, page_command(page + 1))
+                yield from rows
+                if len(rows) < page_size:
+                    return
+                page += 1
+                rows = fetch(page_command(page)) if next_rows is None else next_rows.result()
+        finally:
+            if executor:
+                # a prefetched page the caller did not get to is dropped
+                executor.shutdown(wait=False, cancel_futures=True)
 
     @classmethod
     def puppetclasses(cls, options=None):
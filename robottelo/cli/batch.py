@@ -0,0 +1,170 @@
+"""Execute many independent hammer commands in a single ssh round trip.
+
+Usage::
+
+    with target_sat.cli.batch() as batch:
+        sync = batch.add(target_sat.cli.Repository, 'synchronize', {'id': repo_id})
+        orgs = batch.add(target_sat.cli.Org, 'list', {'per-page': 10000}, output_format='csv')
+    orgs.result()  # the parsed rows, as returned by Org.execute() for the same command
+
+Only the given options are sent. The defaults some cli helpers add on their own, like the
+``--per-page`` of ``Base.list()``, have to be passed explicitly.
+
+All the queued commands are sent as one remote script when the context exits. Each command
+runs with its own stdout, stderr and exit code, which are framed by the script and handed back
+to the ``_handle_response`` of the cli class the command was queued for. Commands run one after
+another in queue order, so only queue commands that do not depend on each other's output.
+"""
+
+import base64
+import shlex
+from uuid import uuid4
+
+from broker.helpers import Result
+
+from robottelo import ssh
+from robottelo.exceptions import CLIBaseError, CLIError
+
+
+def parse_frame(line, marker):
+    """Decode a ``<marker> <index> <exit code> <b64 stdout> <b64 stderr>`` output line
+
+    :return: an ``(index, Result)`` tuple, None if the line is not a frame for ``marker``
+    """
+    if not line.startswith(f'{marker} '):
+        return None
+    # pad the split in case trailing empty base64 fields were stripped in transit
+    _, index, status, out, err = (line.split(' ') + ['', ''])[:5]
+    return int(index), Result(
+        status=int(status),
+        stdout=base64.b64decode(out).decode(),
+        stderr=base64.b64decode(err).decode(),
+    )
+
+
+class BatchResult:
+    """Placeholder for the outcome of a command queued in a :class:`HammerBatch`"""
+
+    def __init__(self, cli_cls, command, output_format=None, ignore_stderr=None, raw=False):
+        self.cli_cls = cli_cls
+        self.command = command
+        self.output_format = output_format
+        self.ignore_stderr = ignore_stderr
+        self.raw = raw
+        self.response = None
+        self._value = None
+        self._error = None
+
+    @property
+    def done(self):
+        return self.response is not None
+
+    def resolve(self, response):
+        """Apply the regular hammer response handling to the demultiplexed ``response``"""
+        self.response = ssh.parse_output(response, self.output_format)
+        if self.raw:
+            self._value = self.response
+            return
+        try:
+            self._value = self.cli_cls._handle_response(
+                self.response, ignore_stderr=self.ignore_stderr
+            )
+        except CLIBaseError as err:
+            self._error = err
+
+    def result(self):
+        """Return what ``execute`` would have returned, or raise what it would have raised"""
+        if not self.done:
+            raise CLIError(f'Batched command "{self.command}" has not been executed yet')
+        if self._error:
+            raise self._error
+        return self._value
+
+
+class HammerBatch:
+    """Queue hammer commands and run them as one remote script"""
+
+    def __init__(self, hostname=None, timeout=None):
+        self.hostname = hostname
+        self.timeout = timeout
+        self.queue = []
+        self._marker = f'ROBOTTELO-BATCH-{uuid4().hex}'
+
+    def add(
+        self,
+        cli_cls,
+        command_sub,
+        options=None,
+        output_format=None,
+        ignore_stderr=None,
+        return_raw_response=None,
+    ):
+        """Queue ``hammer <cli_cls.command_base> <command_sub> <options>``
+
+        :param cli_cls: a :class:`robottelo.cli.base.Base` subclass, e.g. ``sat.cli.Org``
+        :param command_sub: the hammer subcommand, e.g. ``list``
+        :param options: options passed to ``_construct_command``
+        :return: a :class:`BatchResult`, resolved once the batch ran
+        """
+        # use a subclass so the shared cli class command_sub is left untouched
+        cmd_cls = type(cli_cls.__name__, (cli_cls,), {'command_sub': command_sub})
+        command = cmd_cls._construct_command(options)
+        result = BatchResult(
+            cmd_cls,
+            cmd_cls._hammer_command(command, output_format=output_format),
+            output_format=output_format,
+            ignore_stderr=ignore_stderr,
+            raw=return_raw_response,
+        )
+        self.queue.append(result)
+        return result
+
+    def script(self):
+        """Build the remote script, one framed line per queued command
+
+        Each command is written as ``<marker> <index> <exit code> <b64 stdout> <b64 stderr>``
+        """
+        lines = ['__rt_out=$(mktemp) && __rt_err=$(mktemp) || exit 1']
+        for index, queued in enumerate(self.queue):
+            lines.extend(
+                [
+                    f'( {queued.command} ) >"$__rt_out" 2>"$__rt_err" </dev/null; __rt_rc=$?',
+                    f'echo "{self._marker} {index} $__rt_rc '
+                    '$(base64 -w0 "$__rt_out") $(base64 -w0 "$__rt_err")"',
+                ]
+            )
+        lines.append('rm -f "$__rt_out" "$__rt_err"')
+        return '\n'.join(lines)
+
+    def demultiplex(self, stdout):
+        """Split the framed script output back into one result per queued command"""
+        return dict(filter(None, (parse_frame(line, self._marker) for line in stdout.splitlines())))
+
+    def run(self):
+        """Send the queued commands in one ssh round trip and resolve their results"""
+        if not self.queue:
+            return []
+        response = ssh.command(
+            f'bash -c {shlex.quote(self.script())}',
+            hostname=self.hostname,
+            timeout=self.timeout,
+        )
+        responses = self.demultiplex(response.stdout)
+        for index, queued in enumerate(self.queue):
+            if index not in responses:
+                # the script died before reaching this command, report the batch failure
+                responses[index] = Result(
+                    status=response.status or 255,
+                    stdout='',
+                    stderr=f'Batched command was not executed:\n{response.stderr}',
+                )
+            queued.resolve(responses[index])
+        executed, self.queue = self.queue, []
+        return executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.run()
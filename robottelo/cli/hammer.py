@@ -1,17 +1,25 @@
 """Helpers to interact with hammer command line utility."""
 
 import csv
+from functools import lru_cache
 import json
 import re
 
 from robottelo.logging import logger
 
 
+@lru_cache(maxsize=4096)
 def _normalize(header):
     """Replace empty spaces with '-' and lower all chars"""
     return header.replace(' ', '-').lower()
 
 
+@lru_cache(maxsize=256)
+def _normalize_header(header):
+    """Normalize every column name of a CSV ``header`` tuple"""
+    return tuple(_normalize(column) for column in header)
+
+
 def parse_json(stdout):
     """Parse JSON output from Hammer CLI and convert it to python dictionary
     while normalizing keys.
@@ -27,29 +35,111 @@ def _normalize_obj(obj):
     """Normalize all dict's keys replacing empty spaces with "-" and lowering
     chars
     """
-    if isinstance(obj, dict):
+    # exact type checks are enough for json decoded data and much cheaper than isinstance
+    obj_type = type(obj)
+    if obj_type is dict:
         return {_normalize(k): _normalize_obj(v) for k, v in obj.items()}
-    if isinstance(obj, list):
+    if obj_type is list:
         return [_normalize_obj(v) for v in obj]
     # doing this to conform to csv parser
-    if isinstance(obj, int) and not isinstance(obj, bool):
+    if obj_type is int:
         return str(obj)
     return obj
 
 
-def parse_csv(output):
-    """Parse CSV output from Hammer CLI and return a Python dictionary."""
-    output = output.splitlines()
+def iter_json(chunks):
+    """Lazily parse JSON output from Hammer CLI delivered in text ``chunks``
 
-    # Normalize the column names to use when generating the dictionary
+    The items of a top level list are normalized and yielded as soon as they are complete, so
+    a huge ``list`` output is never held in memory at once. Any other document is parsed like
+    :func:`parse_json` once all the chunks were read and yielded as a single item.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    is_list = None
+    for chunk in chunks:
+        buffer += chunk
+        if is_list is None:
+            stripped = buffer.lstrip()
+            if not stripped:
+                continue
+            is_list = stripped[0] == '['
+            pos = len(buffer) - len(stripped) + 1
+        if not is_list:
+            continue
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer) or buffer[pos] == ']':
+                break
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # the item is not complete yet, wait for the next chunk
+                break
+            if end == len(buffer):
+                # a number may continue in the next chunk, the closing bracket tells for sure
+                break
+            pos = end
+            yield _normalize_obj(item)
+        # drop what was parsed already
+        buffer, pos = buffer[pos:], 0
+    if is_list:
+        if buffer.strip() != ']':
+            # let the decoder report what is wrong with the rest of the output
+            decoder.decode(buffer)
+    elif buffer.strip():
+        yield parse_json(buffer)
+
+
+def iter_lines(chunks):
+    """Split text delivered in arbitrary ``chunks`` into lines, without the line breaks"""
+    pending = ''
+    for chunk in chunks:
+        *lines, pending = (pending + chunk).splitlines(keepends=True) or ['']
+        if pending.splitlines() != [pending] and not pending.endswith('\r'):
+            # the last line is terminated already, unless a '\n' may still follow its '\r'
+            lines.append(pending)
+            pending = ''
+        for line in lines:
+            yield line.splitlines()[0]
+    if pending:
+        yield pending.splitlines()[0]
+
+
+def iter_csv(lines):
+    """Lazily parse CSV output from Hammer CLI, yielding one dictionary per row
+
+    :param lines: an iterable of output lines, e.g. ``iter_lines(chunks)`` for streamed output
+    Rows are built like ``csv.DictReader`` would, keyed by the normalized header columns.
+    """
+    reader = csv.reader(lines)
     try:
-        keys = [_normalize(header) for header in next(csv.reader(output))]
-        return [value for value in csv.DictReader(output[1:], fieldnames=keys)]
+        header = next(reader, None)
+        if header is None:
+            return
+        keys = _normalize_header(tuple(header))
+        width = len(keys)
+        for row in reader:
+            if not row:
+                continue
+            item = dict(zip(keys, row, strict=False))
+            if len(row) < width:
+                item.update(dict.fromkeys(keys[len(row) :]))
+            elif len(row) > width:
+                item[None] = row[width:]
+            yield item
     except csv.Error as err:
-        logger.error(f'Exception while parsing CSV output {output}: {err}')
+        logger.error(f'Exception while parsing CSV output at line {reader.line_num}: {err}')
         raise
 
 
+def parse_csv(output):
+    """Parse CSV output from Hammer CLI and return a Python dictionary."""
+    return list(iter_csv(output.splitlines()))
+
+
 def parse_help(output):
     """Parse the help output from a hammer command and return a dictionary
     mapping the subcommands and options accepted by that command.
@@ -169,6 +259,21 @@ def get_line_indentation_level(line, tab_spaces=4, indentation_spaces=4):
     return spaces // indentation_spaces + (1 if spaces % indentation_spaces > 0 else 0)
 
 
+# patterns used by parse_info, compiled once
+_INFO_NUMBERED_VALUE = re.compile(r'\d+\)\s+(.+)$')
+_INFO_NUMBERED_KEY = re.compile(r'(\d+)\)')
+
+
+def _indentation_level(line):
+    """Same result as ``get_line_indentation_level(line)``, without a per char loop"""
+    stripped = line.lstrip(' \t')
+    if len(line) < 4 or len(stripped) == len(line):
+        return 0
+    prefix = line[: len(line) - len(stripped)]
+    spaces = len(prefix) + 3 * prefix.count('\t')
+    return (spaces + 3) // 4
+
+
 def parse_info(output):
     """Parse the info output and returns a dict mapping the values."""
     # info dictionary
@@ -181,111 +286,108 @@ def parse_info(output):
         # skip empty lines and dividers
         if line == '' or line == '---':
             continue
-        current_indent_level = get_line_indentation_level(line)
+        current_indent_level = _indentation_level(line)
         if current_indent_level <= 1:
             # we are entering or leaving a second level from lower/upper levels
             # clear the second level key
             second_level_key = None
-        if line.startswith(' '):  # sub-properties are indented
-            # values are separated by ':' or '=>', but not by '::' which can be
-            # entity name like 'test::params::keys'
-            if line.find(':') != -1 and line.find('::') == -1:
-                key, value = line.lstrip().split(":", 1)
-            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
-                key, value = line.lstrip().split(" =>", 1)
-            else:
-                key = value = None
-
-            if key is None and value is None:
-                # Parse single attribute collection properties
-                # Template
-                #  1) template1
-                #  2) template2
-                #
-                # or
-                # Template
-                #  template1
-                #  template2
-                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
-
-                if match is None:
-                    match = re.match(r'(.*)$', line.lstrip())
-
-                value = match.group(1)
+        stripped = line.lstrip()
+        if line[0] != ' ':
+            sub_num = None  # new property implies no sub property
+            key, value = stripped.split(':', 1)
+            key = _normalize(key)
+            value = value.lstrip()
+            if value == '':  # 'key:' no value, new sub-property
+                sub_prop = key
+                contents[sub_prop] = {}
+            else:  # 'key: value' line
+                contents[key] = value
+            continue
 
+        # sub-properties are indented
+        # values are separated by ':' or '=>', but not by '::' which can be
+        # entity name like 'test::params::keys'
+        if ':' in line and '::' not in line:
+            key, value = stripped.split(':', 1)
+        elif ' =>' in stripped:
+            key, value = stripped.split(' =>', 1)
+        else:
+            # Parse single attribute collection properties
+            # Template
+            #  1) template1
+            #  2) template2
+            #
+            # or
+            # Template
+            #  template1
+            #  template2
+            match = _INFO_NUMBERED_VALUE.match(stripped)
+            value = stripped if match is None else match.group(1)
+            section = contents[sub_prop]
+            if isinstance(section, list):
+                section.append(value)
+            elif not section:
                 # adding list to 1 level, for example:
                 # {'template': ['template1', 'template2']}
-                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
-                    contents[sub_prop] = []
-                    contents[sub_prop].append(value)
-                elif isinstance(contents[sub_prop], list):
-                    contents[sub_prop].append(value)
-                else:
-                    # adding list to 2 level, for example:
-                    # {'subscription-information':
-                    #      {'registered-by-activation-keys': ['ak1', 'ak2']}
-                    #  }
-                    last_key = list(contents[sub_prop].keys())[-1]
-                    if not contents[sub_prop][last_key]:
-                        contents[sub_prop][last_key] = [value]
-                    else:
-                        contents[sub_prop][last_key].append(value)
+                contents[sub_prop] = [value]
             else:
-                # some properties have many numbered values
-                # Example:
-                # Content:
-                #  1) Repo Name: repo1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                #  2) Repo Name: puppet1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                starts_with_number = re.match(r'(\d+)\)', key)
-                if starts_with_number:
-                    # if this is a numbered list on level 2, do nothing - this script doesn't support it
-                    if current_indent_level >= 2:
-                        continue
-                    sub_num = int(starts_with_number.group(1))
-                    # no. 1) we need to change dict() to list()
-                    if sub_num == 1:
-                        contents[sub_prop] = []
-                    # remove number from key
-                    key = re.sub(r'\d+\)', '', key)
-                    # append empty dict to array
-                    contents[sub_prop].append({})
-
-                key = key.lstrip().replace(' ', '-').lower()
-                value = value.lstrip()
-                # add value to dictionary
-                if sub_num is not None:
-                    contents[sub_prop][-1][key] = value
+                # adding list to 2 level, for example:
+                # {'subscription-information':
+                #      {'registered-by-activation-keys': ['ak1', 'ak2']}
+                #  }
+                last_key = next(reversed(section))
+                if not section[last_key]:
+                    section[last_key] = [value]
                 else:
-                    # a third level is always represented as a dictionary and
-                    # we need to detect if we are at third level
-                    # example:
-                    # Content Information:
-                    #     Content View:
-                    #         ID:   10
-                    #         Name: Default Organization View
-                    # the "ID" and "Name" are located at third indent level
-                    # "content view" is located at second indent level
-                    if current_indent_level == 2 and second_level_key:
-                        # we are at third level indentation
-                        if not contents[sub_prop][second_level_key]:
-                            contents[sub_prop][second_level_key] = {}
-                        contents[sub_prop][second_level_key][key] = value
-                    else:
-                        contents[sub_prop][key] = value
-                    if current_indent_level == 1 and not value:
-                        # always set the last possible second level key
-                        # that can form a third level
-                        second_level_key = key
+                    section[last_key].append(value)
+            continue
+
+        # some properties have many numbered values
+        # Example:
+        # Content:
+        #  1) Repo Name: repo1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        #  2) Repo Name: puppet1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        starts_with_number = _INFO_NUMBERED_KEY.match(key)
+        if starts_with_number:
+            # if this is a numbered list on level 2, do nothing - this script doesn't support it
+            if current_indent_level >= 2:
+                continue
+            sub_num = int(starts_with_number.group(1))
+            # no. 1) we need to change dict() to list()
+            if sub_num == 1:
+                contents[sub_prop] = []
+            # remove number from key
+            key = _INFO_NUMBERED_KEY.sub('', key)
+            # append empty dict to array
+            contents[sub_prop].append({})
+
+        key = _normalize(key.lstrip())
+        value = value.lstrip()
+        # add value to dictionary
+        if sub_num is not None:
+            contents[sub_prop][-1][key] = value
+            continue
+        # a third level is always represented as a dictionary and
+        # we need to detect if we are at third level
+        # example:
+        # Content Information:
+        #     Content View:
+        #         ID:   10
+        #         Name: Default Organization View
+        # the "ID" and "Name" are located at third indent level
+        # "content view" is located at second indent level
+        if current_indent_level == 2 and second_level_key:
+            # we are at third level indentation
+            if not contents[sub_prop][second_level_key]:
+                contents[sub_prop][second_level_key] = {}
+            contents[sub_prop][second_level_key][key] = value
         else:
-            sub_num = None  # new property implies no sub property
-            key, value = line.lstrip().split(":", 1)
-            key = key.lstrip().replace(' ', '-').lower()
-            if value.lstrip() == '':  # 'key:' no value, new sub-property
-                sub_prop = key
-                contents[sub_prop] = {}
-            else:  # 'key: value' line
-                contents[key] = value.lstrip()
+            contents[sub_prop][key] = value
+        if current_indent_level == 1 and not value:
+            # always set the last possible second level key
+            # that can form a third level
+            second_level_key = key
 
     return contents
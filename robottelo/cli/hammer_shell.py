@@ -0,0 +1,231 @@
+"""Long-lived hammer process used as an alternative execution backend for hammer commands.
+
+Every one-shot ``hammer`` invocation boots the Ruby interpreter and loads hammer with all of its
+plugins before doing any work. This backend starts a small Ruby server on the Satellite instead,
+over a persistent ssh channel, which loads hammer and its plugins once. Each hammer command is
+then run in a process forked from that server, so it starts warm but still gets its own exit
+code, stdout and stderr, exactly like the one-shot execution.
+
+``hammer shell`` itself is not used, as it does not report the exit code of its commands which
+:meth:`robottelo.cli.base.Base._handle_response` relies on.
+
+Requests and responses are exchanged as single lines. A request is the base64 encoded JSON
+``{"id": <seq>, "args": <hammer arguments>, "env": {...}, "timed": <bool>}``; a response uses the
+framing of :func:`robottelo.cli.batch.parse_frame`.
+
+One server is kept per Satellite hostname per process (xdist worker). Enable it by setting
+``performance.hammer_backend`` to ``shell``. When the server can not be started, ``command``
+returns None and the caller falls back to the one-shot execution.
+"""
+
+import base64
+import json
+import os
+import shlex
+import threading
+import time
+from uuid import uuid4
+
+from broker.helpers import translate_timeout
+
+from robottelo import ssh
+from robottelo.cli.batch import parse_frame
+from robottelo.exceptions import CLIError
+from robottelo.logging import logger
+
+SERVER_SCRIPT = r"""
+require 'base64'
+require 'json'
+require 'shellwords'
+require 'tempfile'
+
+marker = ARGV.shift
+hammer = ARGV.shift || Gem.bin_path('hammer_cli', 'hammer')
+$stdout.sync = true
+
+# loading hammer again in every fork must not report its constants as redefined
+module Warning
+  def self.warn(msg, *args, **kwargs)
+    super unless msg.include?('already initialized constant') || msg.include?('previous definition of')
+  end
+end
+
+# load hammer and all of its modules once, the forked commands inherit them
+saved_out, saved_err = $stdout.dup, $stderr.dup
+begin
+  $stdout.reopen(File::NULL)
+  $stderr.reopen(File::NULL)
+  ARGV.replace(['--version'])
+  $0 = 'hammer'
+  load hammer
+rescue SystemExit
+ensure
+  $stdout.reopen(saved_out)
+  $stderr.reopen(saved_err)
+end
+puts "#{marker} ready"
+
+while (line = $stdin.gets)
+  request = JSON.parse(Base64.strict_decode64(line.strip))
+  out, err = Tempfile.new('hammer-out'), Tempfile.new('hammer-err')
+  started = Process.clock_gettime(Process::CLOCK_MONOTONIC)
+  pid = fork do
+    $stdin.reopen(File::NULL)
+    $stdout.reopen(out.path, 'w')
+    $stderr.reopen(err.path, 'w')
+    ENV.update(request['env'])
+    ARGV.replace(Shellwords.shellsplit(request['args']))
+    load hammer
+  end
+  Process.wait(pid)
+  elapsed = Process.clock_gettime(Process::CLOCK_MONOTONIC) - started
+  stderr = File.read(err.path)
+  stderr += format("real %.2f\n", elapsed) if request['timed']
+  puts [
+    marker, request['id'], $?.exitstatus || 255,
+    Base64.strict_encode64(File.read(out.path)), Base64.strict_encode64(stderr)
+  ].join(' ')
+  out.close!
+  err.close!
+end
+"""
+
+
+class HammerShellError(CLIError):
+    """Raised when the hammer server died or lost sync while running a command"""
+
+
+class HammerShell:
+    """A long-lived hammer server on a single Satellite
+
+    :param hostname: the Satellite to run hammer on
+    :param hammer_bin: path of the hammer executable, found via rubygems by default
+    """
+
+    def __init__(self, hostname, hammer_bin=None):
+        self.hostname = hostname
+        self.hammer_bin = hammer_bin
+        self._marker = f'ROBOTTELO-HAMMER-{uuid4().hex}'
+        self._client = None
+        self._shell = None
+        self._buffer = ''
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _set_timeout(self, timeout):
+        """Bound blocking reads of the channel, when the ssh backend supports it"""
+        backend_session = getattr(self._client.session, 'session', None)
+        if hasattr(backend_session, 'set_timeout'):
+            backend_session.set_timeout(translate_timeout(timeout or 0))
+
+    def _read_frame(self):
+        """Return the next output line carrying our marker, skipping anything else"""
+        while True:
+            *lines, self._buffer = self._buffer.split('\n')
+            for index, line in enumerate(lines):
+                if line.startswith(f'{self._marker} '):
+                    # keep what was received after the frame for the next read
+                    self._buffer = '\n'.join([*lines[index + 1 :], self._buffer])
+                    return line
+            try:
+                chunk = self._shell.stdout()
+            except Exception as err:
+                raise HammerShellError(f'hammer server on {self.hostname} failed: {err}') from err
+            if not chunk:
+                raise HammerShellError(f'hammer server on {self.hostname} exited')
+            self._buffer += chunk
+
+    def start(self, timeout='5m'):
+        """Open the ssh channel and wait for the hammer server to finish loading"""
+        self._client = ssh.get_client(hostname=self.hostname)
+        self._shell = self._client.session.shell()
+        self._set_timeout(timeout)
+        args = [self._marker, self.hammer_bin] if self.hammer_bin else [self._marker]
+        self._shell.send(f'exec ruby -e {shlex.quote(SERVER_SCRIPT)} {shlex.join(args)}')
+        if self._read_frame() != f'{self._marker} ready':
+            raise HammerShellError(f'hammer server on {self.hostname} did not start')
+        logger.info(f'Started hammer server on {self.hostname}')
+        return self
+
+    def execute(self, args, env=None, timed=False, timeout=None):
+        """Run hammer with the shell quoted ``args`` string and return its result
+
+        :raises HammerShellError: if the server died while the command was sent or running.
+            The command may have run, so it must not be retried blindly.
+        """
+        with self._lock:
+            self._seq += 1
+            request = json.dumps({'id': self._seq, 'args': args, 'env': env or {}, 'timed': timed})
+            try:
+                self._set_timeout(timeout)
+                self._shell.send(base64.b64encode(request.encode()).decode())
+            except Exception as err:
+                raise HammerShellError(f'hammer server on {self.hostname} failed: {err}') from err
+            index, result = parse_frame(self._read_frame(), self._marker)
+            if index != self._seq:
+                raise HammerShellError(
+                    f'hammer server on {self.hostname} out of sync, '
+                    f'expected response {self._seq} got {index}'
+                )
+            return result
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+        self._client = self._shell = None
+
+
+_shells = {}
+_unavailable = set()
+_pid = os.getpid()
+
+
+def get_shell(hostname):
+    """Return the hammer server of this process for ``hostname``, None if it can't be started"""
+    global _pid
+    if _pid != os.getpid():
+        # never share a channel across a fork
+        _shells.clear()
+        _unavailable.clear()
+        _pid = os.getpid()
+    if hostname in _unavailable:
+        return None
+    if hostname not in _shells:
+        try:
+            _shells[hostname] = HammerShell(hostname).start()
+        except Exception as err:
+            logger.warning(
+                f'Unable to start hammer server on {hostname}, '
+                f'falling back to one-shot hammer execution: {err}'
+            )
+            _unavailable.add(hostname)
+            return None
+    return _shells[hostname]
+
+
+def command(args, hostname, output_format=None, timeout=None, env=None, timed=False):
+    """Run hammer with ``args`` through the hammer server of ``hostname``
+
+    :return: the parsed result like :func:`robottelo.ssh.command`, or None when no hammer
+        server is available and the command was not run
+    """
+    shell = get_shell(hostname)
+    if shell is None:
+        return None
+    started = time.monotonic()
+    try:
+        result = shell.execute(args, env=env, timed=timed, timeout=timeout)
+    except HammerShellError:
+        # a new server is started for the next command
+        shell.close()
+        _shells.pop(hostname, None)
+        raise
+    timings = {'connect': 0.0, 'exec': time.monotonic() - started}
+    return ssh.timed_parse_output(result, output_format, timings)
+
+
+def close_all():
+    """Stop every hammer server of this process"""
+    for shell in _shells.values():
+        shell.close()
+    _shells.clear()
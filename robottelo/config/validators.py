@@ -17,7 +17,9 @@ VALIDATORS = dict(
         Validator('server.version.source', default='internal', is_in=['internal', 'ga', 'nightly']),
         Validator('server.version.rhel_version', must_exist=True, cast=str),
         Validator(
-            'server.xdist_behavior', must_exist=True, is_in=['run-on-one', 'balance', 'on-demand']
+            'server.xdist_behavior',
+            must_exist=True,
+            is_in=['run-on-one', 'balance', 'on-demand', 'least-loaded'],
         ),
         Validator('server.auto_checkin', default=False, is_type_of=bool),
         (
@@ -258,8 +260,13 @@ VALIDATORS = dict(
         Validator('jira.comment_visibility', default="Red Hat Employee"),
         Validator('jira.enable_comment', default=False),
         Validator('jira.issue_status', default=["Testing", "Release Pending"]),
-        Validator('jira.cache_file', default='jira_status_cache.json'),
+        Validator('jira.cache_file', default='jira_status_cache.sqlite'),
         Validator('jira.cache_ttl_days', default=7, is_type_of=int),
+        Validator('jira.batch_size', default=50, is_type_of=int),
+        Validator('jira.max_jql_length', default=4000, is_type_of=int),
+        Validator('jira.fetch_workers', default=4, is_type_of=int),
+        Validator('jira.fetch_retries', default=3, is_type_of=int),
+        Validator('jira.fetch_backoff', default=5, cast=float),
     ],
     ldap=[
         Validator(
@@ -326,7 +333,38 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.time_hammer', default=False),
+        Validator('performance.hammer_backend', default='oneshot', is_in=['oneshot', 'shell']),
+        Validator('performance.hammer_metrics', default=False, is_type_of=bool),
+        Validator('performance.ssh_pool.enabled', default=False, is_type_of=bool),
+        Validator('performance.ssh_pool.max_idle_time', default=300, cast=float),
+        Validator('performance.ssh_pool.health_check_interval', default=60, cast=float),
+        Validator('performance.query_cache.enabled', default=False, is_type_of=bool),
+        Validator('performance.query_cache.ttl', default=3600, cast=float),
+        Validator('performance.query_cache.shared', default=False, is_type_of=bool),
+        Validator('performance.fact_probe.enabled', default=False, is_type_of=bool),
+        Validator('performance.fact_probe.cache', default=False, is_type_of=bool),
+        Validator('performance.host_facts.ttl', default=3600, cast=float),
+        Validator('performance.host_facts.offline', default=False, is_type_of=bool),
+        Validator('performance.host_group.max_workers', default=8, is_type_of=int),
+        Validator('performance.host_pool.enabled', default=False, is_type_of=bool),
+        Validator('performance.host_pool.lookahead', default=10, is_type_of=int),
+        Validator('performance.host_pool.max_idle', default=2, is_type_of=int),
+        Validator('performance.host_pool.workers', default=4, is_type_of=int),
+        Validator(
+            'performance.scheduling.scope', default='module', is_in=['module', 'class', 'test']
+        ),
+        Validator('performance.scheduling.default_duration', default=0, cast=float),
+        Validator('performance.scheduling.factory_duration', default=1800, cast=float),
+        Validator('performance.scheduling.history_weight', default=0.5, cast=float),
+        Validator('performance.satellite_load.latency_weight', default=0.3, cast=float),
+        Validator('performance.task_watcher.min_interval', default=1, cast=float),
+        Validator('performance.task_watcher.max_interval', default=30, cast=float),
+        Validator('performance.task_watcher.backoff', default=1.5, cast=float),
+        Validator('performance.task_watcher.chunk_size', default=50, is_type_of=int),
+        Validator('performance.topology.max_workers', default=8, is_type_of=int),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
@@ -335,6 +373,10 @@ VALIDATORS = dict(
             must_exist=True,
         ),
         Validator('report_portal.fail_threshold', default=20),
+        Validator('report_portal.page_size', default=300, is_type_of=int),
+        Validator('report_portal.fetch_workers', default=8, is_type_of=int),
+        Validator('report_portal.launch_cache', default=True, is_type_of=bool),
+        Validator('report_portal.cache_dir', default=''),
     ],
     rh_cloud=[
         Validator('rh_cloud.token', required=True),
@@ -433,6 +475,12 @@ VALIDATORS = dict(
             cast=lambda x: list(map(str, x)),
         ),
         Validator('robottelo.shared_resource_wait', default=60, cast=float),
+        Validator(
+            'robottelo.shared_resource_backend',
+            default='file',
+            is_in=['file', 'inotify', 'redis'],
+        ),
+        Validator('robottelo.func_locker_backend', default='file', is_in=['file', 'redis']),
     ],
     shared_function=[
         Validator('shared_function.storage', is_in=('file', 'redis'), default='file'),
@@ -79,6 +79,22 @@ class ContentHostError(Exception):
     """Indicates error in content configuration."""
 
 
+class HostGroupError(ContentHostError):
+    """Indicates that a call made on several hosts at once raised on some of them.
+
+    :param name: name of the call
+    :param errors: the exceptions raised, by host
+    :param results: the results of all the hosts, a ``GroupResult``
+    """
+
+    def __init__(self, name, errors, results):
+        self.name = name
+        self.errors = errors
+        self.results = results
+        failures = '; '.join(f'{host}: {err!r}' for host, err in errors.items())
+        super().__init__(f'{name} failed on {len(errors)} of {len(results)} hosts: {failures}')
+
+
 class SatelliteHostError(Exception):
     """Indicates error in satellite configuration."""
 
@@ -21,6 +21,7 @@ from robottelo.constants import (
 )
 from robottelo.exceptions import APIResponseError
 from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
+from robottelo.utils.query_cache import invalidates
 
 
 class APIFactory:
@@ -30,6 +31,7 @@ class APIFactory:
         self._satellite = satellite
         self.__dict__.update(initiate_repo_helpers(self._satellite))
 
+    @invalidates('http-proxy')
     def make_http_proxy(self, org, http_proxy_type, use_ip=False):
         """
         Creates HTTP proxy.
@@ -63,6 +65,7 @@ class APIFactory:
             content_default_http_proxy=True,
         ).create()
 
+    @invalidates('content-view', 'lifecycle-environment')
     def cv_publish_promote(self, name=None, env_name=None, repo_id=None, org_id=None):
         """Create, publish and promote CV to selected environment"""
         if org_id is None:
@@ -84,6 +87,7 @@ class APIFactory:
         content_view_version.promote(data={'environment_ids': lce.id})
         return content_view.read()
 
+    @invalidates('repository-set', 'repository', 'product')
     def enable_rhrepo_and_fetchid(
         self, basearch, org_id, product, repo, reposet, releasever=None, strict=False
     ):
@@ -122,6 +126,7 @@ class APIFactory:
         result = self._satellite.api.Repository(name=repo).search(query={'organization_id': org_id})
         return result[0].id
 
+    @invalidates('product', 'repository')
     def create_sync_custom_repo(
         self,
         org_id=None,
@@ -151,6 +156,7 @@ class APIFactory:
         self._satellite.api.Repository(id=repo.id).sync()
         return repo.id
 
+    @invalidates('repository-set', 'repository', 'product')
     def enable_sync_redhat_repo(self, rh_repo, org_id, timeout=1500):
         """Enable the RedHat repo, sync it and returns repo_id"""
         # Enable RH repo and fetch repository_id
@@ -182,6 +188,7 @@ class APIFactory:
         """
         return {f'{name}_name', f'{name}_id'}
 
+    @invalidates('role', 'filter')
     def create_role_permissions(
         self, role, permissions_types_names, search=None
     ):  # pragma: no cover
@@ -262,6 +269,7 @@ class APIFactory:
                 permission=permissions_entities, role=role, search=search
             ).create()
 
+    @invalidates('discovery')
     def create_discovered_host(self, name=None, ip_address=None, mac_address=None, options=None):
         """Creates a discovered host.
 
@@ -292,6 +300,7 @@ class APIFactory:
         facts.update(options)
         return self._satellite.api.DiscoveredHost().facts(json={'facts': facts})
 
+    @invalidates('host')
     def update_vm_host_location(self, vm_client, location_id):
         """Update vm client host location.
 
@@ -302,6 +311,7 @@ class APIFactory:
             id=vm_client.nailgun_host.id, location=self._satellite.api.Location(id=location_id)
         ).update(['location'])
 
+    @invalidates('os')
     def check_create_os_with_title(self, os_title):
         """Check if the OS is present, if not create the required OS
 
@@ -368,13 +378,16 @@ class APIFactory:
             old_value = setting.value
             setting.value = value.strip()
             setting.update({'value'})
+            self._satellite.query_cache.invalidate('settings')
             yield
         except Exception:
             raise
         finally:
             setting.value = old_value
             setting.update({'value'})
+            self._satellite.query_cache.invalidate('settings')
 
+    @invalidates('template')
     def update_provisioning_template(self, name=None, old=None, new=None):
         """Update provisioning template content
 
@@ -398,6 +411,7 @@ class APIFactory:
             return True
         raise ValueError(f'{old} does not exists in template {name}')
 
+    @invalidates('sync-plan')
     def disable_syncplan(self, sync_plan):
         """
         Disable sync plans after a test to reduce distracting task events, logs,
@@ -435,11 +449,9 @@ class APIFactory:
         :param int from_when: Epoch Time (seconds in UTC) to limit number of returned tasks to investigate.
         :param int search_rate: Delay between searches.
         :param int max_tries: How many times search should be executed.
-        :param int poll_rate: Delay between the end of one task check-up and
-                the start of the next check-up. Parameter for
-                ``nailgun.entities.ForemanTask.poll()`` method.
+        :param int poll_rate: Longest delay between two check-ups of the tasks, which are
+                all checked by one search of ``sat.task_watcher``.
         :param int poll_timeout: Maximum number of seconds to wait until timing out.
-                Parameter for ``nailgun.entities.ForemanTask.poll()`` method.
         :return: Relevant errata applicability task.
         :raises: ``AssertionError``. If not tasks were found for given host until timeout.
         """
@@ -461,20 +473,24 @@ class APIFactory:
                 f' started_at >= "{long_format}" '
             )
             tasks = self._satellite.api.ForemanTask().search(query={'search': search_query})
-            tasks_finished = 0
-            for task in tasks:
+            host_tasks = [
+                task
+                for task in tasks
                 if (
                     task.label == 'Actions::Katello::Applicability::Hosts::BulkGenerate'
                     and 'host_ids' in task.input
                     and host_id in task.input['host_ids']
-                ) or (
+                )
+                or (
                     task.label == 'Actions::Katello::Host::UploadPackageProfile'
                     and 'host' in task.input
                     and host_id == task.input['host']['id']
-                ):
-                    task.poll(poll_rate=poll_rate, timeout=poll_timeout)
-                    tasks_finished += 1
-            if tasks_finished > 0:
+                )
+            ]
+            if host_tasks:
+                self._satellite.task_watcher.wait_for(
+                    host_tasks, timeout=poll_timeout, max_interval=poll_rate
+                )
                 break
             time.sleep(search_rate)
         else:
@@ -482,6 +498,7 @@ class APIFactory:
                 f'No task was found using query " {search_query} " for host id: {host_id}'
             )
 
+    @invalidates()
     def register_host_and_needed_setup(
         self,
         client,
@@ -51,10 +51,9 @@ class CapsuleInfo:
         :param search_query: Search query that will be passed to API call.
         :param search_rate: Delay between searches.
         :param max_tries: How many times search should be executed.
-        :param poll_rate: Delay between the end of one task check-up and
-            the start of the next check-up. Parameter for ``sat.api.ForemanTask.poll()`` method.
+        :param poll_rate: Longest delay between two check-ups of the tasks, which are all
+            checked by one search of ``sat.task_watcher``.
         :param poll_timeout: Maximum number of seconds to wait until timing out.
-            Parameter for ``sat.api.ForemanTask.poll()`` method.
         :param must_succeed: Assert success result on finished task.
         :return: List of ``sat.api.ForemanTask`` entities.
         :raises: ``AssertionError``. If not tasks were found until timeout.
@@ -62,8 +61,9 @@ class CapsuleInfo:
         for _ in range(max_tries):
             tasks = self.satellite.api.ForemanTask().search(query={'search': search_query})
             if tasks:
-                for task in tasks:
-                    task.poll(poll_rate=poll_rate, timeout=poll_timeout, must_succeed=must_succeed)
+                self.satellite.task_watcher.wait_for(
+                    tasks, must_succeed=must_succeed, timeout=poll_timeout, max_interval=poll_rate
+                )
                 break
             time.sleep(search_rate)
         else:
@@ -31,6 +31,7 @@ from robottelo.cli.proxy import CapsuleTunnelError
 from robottelo.config import settings
 from robottelo.exceptions import CLIFactoryError, CLIReturnCodeError
 from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
+from robottelo.utils.query_cache import get_cache, invalidates
 
 
 def create_object(cli_object, options, values=None, credentials=None, timeout=None):
@@ -58,6 +59,11 @@ def create_object(cli_object, options, values=None, credentials=None, timeout=No
         raise CLIFactoryError(
             f'Failed to create {cli_object.__name__} with data:\n{pprint.pformat(options, indent=2)}\n{err.msg}'
         ) from err
+    finally:
+        # a failed creation may still have changed the server
+        get_cache(cli_object.hostname or settings.server.hostname).invalidate(
+            cli_object.command_base
+        )
     # Sometimes we get a list with a dictionary and not a dictionary.
     if isinstance(result, list) and len(result) > 0:
         result = result[0]
@@ -546,6 +552,7 @@ class CLIFactory:
 
         return create_object(self._satellite.cli.Template, args, options)
 
+    @invalidates('activation-key')
     def override_repos_for_activation_key(self, ak_id, repos, value=True):
         """Hammer override satellite repo(s) to value for Activation Key.
 
@@ -588,6 +595,7 @@ class CLIFactory:
             'activation_key': self._satellite.cli.ActivationKey.info({'id': ak_id}),
         }
 
+    @invalidates()
     def setup_org_for_a_custom_repo(self, options=None):
         """Sets up Org for the given custom repo by:
 
@@ -708,6 +716,7 @@ class CLIFactory:
             'repository-id': custom_repo['id'],
         }
 
+    @invalidates()
     def _setup_org_for_a_rh_repo(self, options=None, force=False):
         """Sets up Org for the given Red Hat repository by:
 
@@ -946,6 +955,7 @@ class CLIFactory:
             options.update(permission_data)
             self.make_filter(options)
 
+    @invalidates()
     def setup_cdn_and_custom_repositories(
         self, org_id, repos, download_policy='on_demand', synchronize=True
     ):
@@ -1004,6 +1014,7 @@ class CLIFactory:
                 self._satellite.cli.Repository.synchronize({'id': repo_info['id']}, timeout=4800000)
         return custom_product, repos_info
 
+    @invalidates()
     def setup_cdn_and_custom_repos_content(
         self,
         org_id,
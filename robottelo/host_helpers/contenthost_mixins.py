@@ -7,6 +7,7 @@ from tempfile import NamedTemporaryFile
 from robottelo import constants
 from robottelo.config import robottelo_tmp_dir, settings
 from robottelo.logging import logger
+from robottelo.utils import fact_probe
 from robottelo.utils.ohsnap import dogfood_repofile_url, dogfood_repository
 
 
@@ -189,17 +190,7 @@ class SystemFacts:
     def get_facts(self):
         """Get a dictionary representation of all subscription-manager facts"""
         result = self.execute('subscription-manager facts')
-        fact_dict, last_key = {}, None
-        if result.status == 0:
-            for line in result.stdout.splitlines():
-                if ': ' in line:
-                    key, val = line.split(': ', 1)
-                else:
-                    key = last_key
-                    val = f'{fact_dict[key]} {line}'
-                fact_dict[key] = val.strip()
-                last_key = key
-        return fact_dict
+        return fact_probe.parse_rhsm_facts(result.stdout) if result.status == 0 else {}
 
     def set_facts(self, facts_dict):
         """Given a facts dictionary, write the contents to the appropriate files
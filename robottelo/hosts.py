@@ -3,13 +3,12 @@ from configparser import ConfigParser
 import contextlib
 from contextlib import contextmanager
 from datetime import UTC, datetime
-from functools import cached_property, lru_cache
+from functools import cached_property, lru_cache, partial
 import importlib
 import io
 import json
 from pathlib import Path, PurePath
 import random
-import re
 from tempfile import NamedTemporaryFile
 import time
 from urllib.parse import urljoin, urlparse, urlunsplit
@@ -31,6 +30,7 @@ import yaml
 
 from robottelo import constants
 from robottelo.cli.base import Base
+from robottelo.cli.batch import HammerBatch
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
@@ -49,7 +49,6 @@ from robottelo.constants import (
     RHSSO_NEW_USER,
     RHSSO_RESET_PASSWORD,
     RHSSO_USER_UPDATE,
-    SATELLITE_VERSION,
 )
 from robottelo.enums import NetworkType
 from robottelo.exceptions import (
@@ -69,9 +68,11 @@ from robottelo.host_helpers import (
     SatelliteMixins,
 )
 from robottelo.logging import logger
-from robottelo.utils import validate_ssh_pub_key
+from robottelo.utils import fact_probe, host_facts, task_watcher, validate_ssh_pub_key
 from robottelo.utils.datafactory import valid_emails_list
+from robottelo.utils.host_group import HostGroup
 from robottelo.utils.installer import InstallerCommand
+from robottelo.utils.query_cache import get_cache
 
 POWER_OPERATIONS = {
     VmState.RUNNING: 'running',
@@ -94,32 +95,34 @@ def lru_sat_ready_rhel(rhel_ver):
 
 
 def get_sat_version():
-    """Try to read sat_version from envvar SATELLITE_VERSION
-    if not available fallback to ssh connection to get it."""
+    """Read sat_version from the host facts snapshot taken for the collection,
+    if not available fallback to ssh connection to get it, then to robottelo configuration."""
 
-    try:
-        sat_version = Satellite().version
-    except (AuthenticationError, ContentHostError, BoxKeyError) as err:
-        logger.warning('Failed to get Satellite version: %s', err)
-        if sat_version := str(settings.server.version.get('release')) == 'stream':
-            sat_version = str(settings.robottelo.get('satellite_version'))
-        if not sat_version:
-            sat_version = SATELLITE_VERSION
+    if facts := host_facts.snapshot():
+        sat_version = facts['satellite_version']
+    else:
+        try:
+            sat_version = Satellite().version
+        except (AuthenticationError, ContentHostError, BoxKeyError) as err:
+            logger.warning('Failed to get Satellite version: %s', err)
+            sat_version = host_facts.settings_satellite_version()
     return Version('9999' if 'nightly' in sat_version else sat_version)
 
 
 def get_sat_rhel_version():
-    """Try to read rhel_version from Satellite host
-    if not available fallback to robottelo configuration."""
+    """Read rhel_version from the host facts snapshot taken for the collection,
+    if not available fallback to Satellite host, then to robottelo configuration."""
 
+    facts = host_facts.snapshot()
+    # a snapshot built from settings has no rhel_version when it is not configured
+    if facts and facts['rhel_version'] is not None:
+        return Version(facts['rhel_version'])
     try:
         return Satellite().os_version
     except (AuthenticationError, ContentHostError, BoxKeyError) as err:
         logger.warning('Failed to get RHEL version from Satellite: %s', err)
-        if hasattr(settings.server.version, 'rhel_version'):
-            rhel_version = str(settings.server.version.rhel_version)
-        elif hasattr(settings.robottelo, 'rhel_version'):
-            rhel_version = settings.robottelo.rhel_version
+        if (rhel_version := host_facts.settings_rhel_version()) is None:
+            raise
     return Version(rhel_version)
 
 
@@ -163,6 +166,15 @@ class ContentHost(Host, ContentHostMixins):
         logger.debug('Found %s instances from inventory by filter: %s', len(inv_hosts), filter)
         return inv_hosts
 
+    @staticmethod
+    def parallel(hosts, max_workers=None):
+        """Group hosts to make the same call on all of them at once
+
+        e.g. ``ContentHost.parallel(content_hosts).execute('subscription-manager refresh')``,
+        see :mod:`robottelo.utils.host_group`
+        """
+        return HostGroup(hosts, max_workers=max_workers)
+
     @classmethod
     def get_host_by_hostname(cls, hostname):
         """Get an instance of a host from inventory by hostname"""
@@ -235,6 +247,21 @@ class ContentHost(Host, ContentHostMixins):
                 id_dict['registered_to'] = regged_to
         return id_dict
 
+    @cached_property
+    def probed_facts(self):
+        """Facts read from the host in one round trip, see :mod:`robottelo.utils.fact_probe`
+
+        None when ``performance.fact_probe.enabled`` is not set or the probe failed, the
+        properties then read their facts one command at a time.
+        """
+        if settings.performance.fact_probe.enabled is not True:
+            return None
+        try:
+            return fact_probe.get_facts(self)
+        except Exception as err:
+            logger.warning(f'Failed to probe the facts of {self.hostname}: {err}')
+            return None
+
     @property
     def ip_addr(self):
         ipv4, *ipv6 = self.execute('hostname -I').stdout.split()
@@ -242,6 +269,8 @@ class ContentHost(Host, ContentHostMixins):
 
     @cached_property
     def arch(self):
+        if (facts := self.probed_facts) and facts['arch']:
+            return facts['arch']
         return self.get_facts().get('lscpu.architecture') or self.execute('uname -m').stdout.strip()
 
     @cached_property
@@ -249,36 +278,21 @@ class ContentHost(Host, ContentHostMixins):
         """Process redhat-release file for distro and version information
         This is a fallback for when /etc/os-release is not available
         """
+        if (facts := self.probed_facts) and facts['redhat_release'] is not None:
+            return fact_probe.parse_redhat_release(facts['redhat_release'])
         result = self.execute('cat /etc/redhat-release')
         if result.status != 0:
             raise ContentHostError(f'Not able to cat /etc/redhat-release "{result.stderr}"')
-        match = re.match(r'(?P<NAME>.+) release (?P<major>\d+)(.(?P<minor>\d+))?', result.stdout)
-        if match is None:
-            raise ContentHostError(f'Not able to parse release string "{result.stdout}"')
-        r_release = match.groupdict()
-
-        # /etc/os-release compatibility layer
-        r_release['VERSION_ID'] = r_release['major']
-        # not every release have a minor version
-        r_release['VERSION_ID'] += f'.{r_release["minor"]}' if r_release['minor'] else ''
-
-        distro_map = {
-            'Fedora': {'NAME': 'Fedora Linux', 'ID': 'fedora'},
-            'CentOS': {'ID': 'centos'},
-            'Red Hat Enterprise Linux': {'ID': 'rhel'},
-        }
-        # Use the version map to set the NAME and ID fields
-        for distro, properties in distro_map.items():
-            if distro in r_release['NAME']:
-                r_release.update(properties)
-                break
-        return r_release
+        return fact_probe.parse_redhat_release(result.stdout)
 
     @cached_property
     def _os_release(self):
         """Process os-release file for distro and version information"""
-        facts = {}
-        regex = r'^(["\'])(.*)(\1)$'
+        if facts := self.probed_facts:
+            if facts['os_release'] is not None:
+                return facts['os_release']
+            logger.info('No /etc/os-release, falling back to /etc/redhat-release')
+            return self._redhat_release
         result = self.execute('cat /etc/os-release')
         if result.status != 0:
             logger.info(
@@ -286,14 +300,7 @@ class ContentHost(Host, ContentHostMixins):
                 'falling back to /etc/redhat-release'
             )
             return self._redhat_release
-        for ln in [line for line in result.stdout.splitlines() if line.strip()]:
-            line = ln.strip()
-            if line.startswith('#'):
-                continue
-            key, value = line.split('=')
-            if key and value:
-                facts[key] = re.sub(regex, r'\2', value).replace('\\', '')
-        return facts
+        return fact_probe.parse_os_release(result.stdout)
 
     @property
     def os_distro(self):
@@ -316,6 +323,8 @@ class ContentHost(Host, ContentHostMixins):
     @cached_property
     def is_el(self):
         """Boolean representation of whether this host is an EL host"""
+        if (facts := self.probed_facts) is not None:
+            return facts['is_el']
         return self.execute('stat /etc/redhat-release').status == 0
 
     @property
@@ -1823,7 +1832,15 @@ class Capsule(ContentHost, CapsuleMixins):
 
     def capsule_setup(self, sat_host=None, capsule_cert_opts=None, **installer_kwargs):
         """Prepare the host and run the capsule installer"""
+        self.capsule_prepare(sat_host=sat_host)
+        installer = self.capsule_certs_copy(capsule_cert_opts)
+        installer.update(**installer_kwargs)
+        self.capsule_install(installer)
 
+    def capsule_prepare(self, sat_host=None):
+        """Register the host, set up its repositories and firewall, and check the capsule
+        package is installed, nothing is run on the Satellite
+        """
         self.register_to_cdn()
         self.setup_rhel_repos()
         self.setup_capsule_repos()
@@ -1846,12 +1863,21 @@ class Capsule(ContentHost, CapsuleMixins):
         if result.status:
             raise CapsuleHostError(f'The satellite-capsule package was not found\n{result.stdout}')
 
-        # Generate certificate, copy it to Capsule, run installer, check it succeeds
-        if not capsule_cert_opts:
-            capsule_cert_opts = {}
-        certs_tar, _, installer = self.satellite.capsule_certs_generate(self, **capsule_cert_opts)
+    def capsule_certs_copy(self, capsule_cert_opts=None):
+        """Generate the certificates of the capsule on its Satellite and copy them to the capsule
+
+        It runs on the ssh session of the Satellite, which can not be shared between threads.
+
+        :return InstallerCommand: the capsule installer command printed by the Satellite
+        """
+        certs_tar, _, installer = self.satellite.capsule_certs_generate(
+            self, **(capsule_cert_opts or {})
+        )
         self.satellite.session.remote_copy(certs_tar, self)
-        installer.update(**installer_kwargs)
+        return installer
+
+    def capsule_install(self, installer):
+        """Run the capsule installer and check it succeeds"""
         result = self.install(installer)
         if result.status:
             # before exit download the capsule log file
@@ -2067,6 +2093,34 @@ class Satellite(Capsule, SatelliteMixins):
             ).apidoc
         return self._apidoc
 
+    @property
+    def task_watcher(self):
+        """Waits for the tasks of this Satellite, see robottelo.utils.task_watcher"""
+        return task_watcher.get_watcher(self)
+
+    @property
+    def query_cache(self):
+        """Session cache of idempotent queries to this Satellite, see robottelo.utils.query_cache"""
+        return get_cache(self.hostname)
+
+    def cached_search(self, entity, search, tag):
+        """Search nailgun ``entity`` entities through the query cache
+
+        The raw search results are cached, entities are rebuilt from them on every call.
+
+        :param str entity: the nailgun entity name, e.g. ``Organization``
+        :param str search: the search query
+        :param str tag: the resource searched, writes to it invalidate the results
+        """
+        entity_cls = getattr(self.api, entity)
+        results = self.query_cache.get(
+            f'search {entity}',
+            lambda search: entity_cls().search_json(query={'search': search})['results'],
+            search,
+            tags=(tag,),
+        )
+        return [entity_cls(**result) for result in entity_cls().search_normalize(results)]
+
     @property
     def cli(self):
         """Import all robottelo cli entities and wrap them under self.cli"""
@@ -2094,6 +2148,8 @@ class Satellite(Capsule, SatelliteMixins):
                     except AttributeError:
                         # not everything has an mro method, we don't care about them
                         pass
+        # queue independent hammer commands and run them in a single ssh round trip
+        self._cli.batch = partial(HammerBatch, hostname=self.hostname)
         self._cli._configured = True
         return self._cli
 
@@ -1,6 +1,180 @@
 """Utility module to handle the shared ssh connection."""
 
+import codecs
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext, suppress
+import os
+import threading
+import time
+
 from robottelo.cli import hammer
+from robottelo.logging import logger
+
+
+class SSHConnectionPool:
+    """Per-process pool of authenticated ssh clients
+
+    Clients are keyed by ``(hostname, username, port, net_type)``. A client is handed out
+    exclusively to one caller at a time and returned to the pool afterwards, so concurrent
+    callers (threads) never share a session. Idle clients are closed once they exceed
+    ``max_idle_time`` seconds, and a client that sat idle longer than
+    ``health_check_interval`` seconds is probed before being reused.
+
+    Hit/miss/eviction counters are kept in :attr:`stats`.
+    """
+
+    def __init__(self, max_idle_time=300, health_check_interval=60, factory=None):
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+        self._factory = factory
+        self._idle = defaultdict(list)  # key -> [(client, last_used), ...]
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self.pid = os.getpid()
+
+    @staticmethod
+    def make_key(hostname, username, port, net_type):
+        return (hostname, username, port, str(net_type))
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception as err:  # closing a dead session may fail in many ways
+            logger.debug(f'Failed to close pooled ssh client {client.hostname}: {err}')
+
+    def _evict(self, client):
+        self.stats['evictions'] += 1
+        self._close(client)
+
+    def _is_alive(self, client, last_used):
+        """Check that a pooled client still has a usable session"""
+        if getattr(client, '_session', None) is None:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            return client.execute('true', timeout=10000).status == 0
+        except Exception as err:  # any failure means the session is unusable
+            logger.debug(f'Pooled ssh client {client.hostname} failed health check: {err}')
+            return False
+
+    def _sweep(self):
+        """Close every idle client that exceeded max_idle_time, must be called under lock"""
+        now = time.monotonic()
+        for key, entries in list(self._idle.items()):
+            fresh = []
+            for client, last_used in entries:
+                if now - last_used > self.max_idle_time:
+                    self._evict(client)
+                else:
+                    fresh.append((client, last_used))
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+
+    def acquire(self, hostname, username, password, port, net_type):
+        """Return a pooled client for the given credentials, creating one on a miss"""
+        key = self.make_key(hostname, username, port, net_type)
+        with self._lock:
+            self._sweep()
+            entries = self._idle.get(key, [])
+            candidate = entries.pop() if entries else None
+        # health check runs outside of the lock, it may need a round trip
+        while candidate:
+            client, last_used = candidate
+            if self._is_alive(client, last_used):
+                with self._lock:
+                    self.stats['hits'] += 1
+                return client
+            with self._lock:
+                self._evict(client)
+                entries = self._idle.get(key, [])
+                candidate = entries.pop() if entries else None
+        with self._lock:
+            self.stats['misses'] += 1
+        factory = self._factory or get_client
+        return factory(
+            hostname=hostname,
+            username=username,
+            password=password,
+            port=port,
+            net_type=net_type,
+        )
+
+    def release(self, client, key):
+        """Return a client to the pool"""
+        with self._lock:
+            self._idle[key].append((client, time.monotonic()))
+
+    def discard(self, client):
+        """Drop a client that should not be reused"""
+        with self._lock:
+            self._evict(client)
+
+    @contextmanager
+    def connection(self, hostname, username, password, port, net_type):
+        """Context manager handing out a pooled client
+
+        The client is returned to the pool on success and discarded if the block raised.
+        """
+        client = self.acquire(hostname, username, password, port, net_type)
+        try:
+            yield client
+        except BaseException:
+            # also covers a generator closed while it used the client
+            self.discard(client)
+            raise
+        self.release(client, self.make_key(hostname, username, port, net_type))
+
+    def clear(self):
+        """Close and forget every idle client"""
+        with self._lock:
+            for entries in self._idle.values():
+                for client, _ in entries:
+                    self._close(client)
+            self._idle.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def report(self):
+        """Return the pool counters along with the current xdist worker and hit rate"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['idle'] = sum(len(entries) for entries in self._idle.values())
+        total = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / total, 4) if total else 0.0
+        stats['worker'] = os.environ.get('PYTEST_XDIST_WORKER', 'master')
+        return stats
+
+
+_pool = None
+
+
+def get_pool():
+    """Return the per-process :class:`SSHConnectionPool`, configured from settings
+
+    Sessions must never cross a fork, so a new pool is created when the pid changes.
+    """
+    global _pool
+    if _pool is None or _pool.pid != os.getpid():
+        from robottelo.config import settings
+
+        _pool = SSHConnectionPool(
+            max_idle_time=settings.performance.ssh_pool.max_idle_time,
+            health_check_interval=settings.performance.ssh_pool.health_check_interval,
+        )
+    return _pool
+
+
+def pool_stats():
+    """Return the connection pool counters of this process, None if the pool was never used"""
+    if _pool is None or _pool.pid != os.getpid():
+        return None
+    return _pool.report()
 
 
 def get_client(
@@ -42,23 +216,154 @@ def command(
 
     kwargs are passed through to get_connection
 
+    When ``performance.ssh_pool.enabled`` is set, the ssh session is borrowed from the
+    per-process :class:`SSHConnectionPool` instead of being created for this call only.
+
     :param str cmd: The command to run
     :param str output_format: json, csv or None
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
     """
-    client = get_client(
-        hostname=hostname,
-        username=username,
-        password=password,
-        port=port,
-        net_type=net_type,
-    )
+    from robottelo.config import settings
+
+    if settings.performance.ssh_pool.enabled is True:
+        with get_pool().connection(
+            hostname=hostname or settings.server.hostname,
+            username=username or settings.server.ssh_username,
+            password=password or settings.server.ssh_password,
+            port=port or settings.server.ssh_client.port,
+            net_type=net_type or settings.server.network_type,
+        ) as client:
+            result, timings = _timed_execute(client, cmd, timeout)
+    else:
+        client = get_client(
+            hostname=hostname,
+            username=username,
+            password=password,
+            port=port,
+            net_type=net_type,
+        )
+        result, timings = _timed_execute(client, cmd, timeout)
+    return timed_parse_output(result, output_format, timings)
+
+
+def _timed_execute(client, cmd, timeout):
+    """Execute ``cmd`` and return the result with the connect and exec times, in seconds"""
+    started = time.monotonic()
+    # open the session now, so the connection is timed apart from the command
+    getattr(client, 'session', None)
+    connected = time.monotonic()
     result = client.execute(cmd, timeout=timeout)
+    return result, {'connect': connected - started, 'exec': time.monotonic() - connected}
+
 
+def timed_parse_output(result, output_format=None, timings=None):
+    """Parse the ``result`` like :func:`parse_output` and attach ``result.timings``
+
+    ``result.timings`` is a dictionary holding the given ``timings`` together with the parse
+    time in seconds and the raw output size in characters.
+    """
+    timings = dict(timings or {})
+    stdout = getattr(result, 'stdout', None)
+    timings['output_size'] = len(stdout) if isinstance(stdout, str) else 0
+    started = time.monotonic()
+    parse_output(result, output_format)
+    timings['parse'] = time.monotonic() - started
+    # result objects come from the ssh backend, not all of them accept new attributes
+    with suppress(AttributeError):
+        result.timings = timings
+    return result
+
+
+def parse_output(result, output_format=None):
+    """Parse the stdout of a successful hammer ``result`` in place according to output_format
+
+    :param result: a result object with ``stdout`` and ``status`` attributes
+    :param str output_format: json, csv or None
+    :return: the same result object
+    """
     if output_format and result.status == 0:
         if output_format == 'csv':
             result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
         if output_format == 'json':
             result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
     return result
+
+
+class CommandStream:
+    """Iterate over the stdout of a remote command as the ssh channel delivers it
+
+    ``status`` and ``stderr`` are set once the iteration is over. Backends without a raw ssh2
+    channel deliver the whole stdout as one chunk.
+    """
+
+    def __init__(self, cmd, hostname=None, username=None, password=None, timeout=None, **kwargs):
+        self.cmd = cmd
+        self.timeout = timeout
+        self.connection = {
+            'hostname': hostname,
+            'username': username,
+            'password': password,
+            **kwargs,
+        }
+        self.status = None
+        self.stderr = None
+
+    def _connect(self):
+        from robottelo.config import settings
+
+        if settings.performance.ssh_pool.enabled is True:
+            return get_pool().connection(
+                hostname=self.connection['hostname'] or settings.server.hostname,
+                username=self.connection['username'] or settings.server.ssh_username,
+                password=self.connection['password'] or settings.server.ssh_password,
+                port=self.connection.get('port') or settings.server.ssh_client.port,
+                net_type=self.connection.get('net_type') or settings.server.network_type,
+            )
+        return nullcontext(get_client(**self.connection))
+
+    def _read_channel(self, backend_session):
+        from broker.helpers import translate_timeout
+
+        backend_session.set_timeout(translate_timeout(self.timeout or 0))
+        channel = backend_session.open_session()
+        channel.execute(self.cmd)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        size, data = channel.read()
+        while size > 0:
+            if text := decoder.decode(data):
+                yield text
+            size, data = channel.read()
+        if text := decoder.decode(b'', final=True):
+            yield text
+        stderr = []
+        size, data = channel.read_stderr()
+        while size > 0:
+            stderr.append(data)
+            size, data = channel.read_stderr()
+        channel.wait_eof()
+        channel.close()
+        channel.wait_closed()
+        self.status = channel.get_exit_status()
+        self.stderr = b''.join(stderr).decode('utf-8', errors='replace')
+
+    def __iter__(self):
+        with self._connect() as client:
+            backend_session = getattr(client.session, 'session', None)
+            if hasattr(backend_session, 'open_session'):
+                yield from self._read_channel(backend_session)
+                return
+            result = client.execute(self.cmd, timeout=self.timeout)
+            self.status, self.stderr = result.status, result.stderr
+            if result.stdout:
+                yield result.stdout
+
+
+def stream_command(cmd, hostname=None, username=None, password=None, timeout=None, **kwargs):
+    """Run ``cmd`` like :func:`command` but return a :class:`CommandStream` of its stdout
+
+    Nothing is executed until the stream is iterated.
+    """
+    return CommandStream(
+        cmd, hostname=hostname, username=username, password=password, timeout=timeout, **kwargs
+    )
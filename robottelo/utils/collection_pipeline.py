@@ -0,0 +1,152 @@
+"""Shared pass over the collected items for the collection plugins.
+
+Collection plugins used to loop over all the items one after the other. Each of them rebuilt
+lists of marker names with ``item.iter_markers()`` or sets of fixture names per item. Instead
+they register stages in the :class:`CollectionPipeline` of the session. The pipeline walks the
+items once, running every stage on an item before moving to the next one.
+
+Stages receive the :class:`ItemIndex` of the item, an immutable snapshot of its markers and
+fixtures built once, so looking up a marker or a fixture is a set or dict lookup. Adding a marker
+to the item replaces the snapshot with a new one on its next lookup.
+
+There are two kinds of stages:
+
+* ``annotate`` stages add markers or user properties, their return value is ignored
+* ``filter`` stages return True to keep the item, the first one returning False deselects it
+  and the following stages are not run for it
+
+Usage, from a plugin::
+
+    def pytest_configure(config):
+        get_pipeline(config).register('stubbed', deselect_stubbed, kind='filter')
+
+The time spent by every stage and the items it received and kept are kept in
+:attr:`CollectionPipeline.stage_stats`, ``--collection-profile`` reports each stage on its own.
+"""
+
+from collections import Counter
+import time
+from types import MappingProxyType
+from typing import NamedTuple
+
+import pytest
+
+from robottelo.logging import collection_logger as logger
+
+STAGE_KINDS = ('annotate', 'filter')
+
+_index_key = pytest.StashKey[tuple]()
+
+
+class ItemIndex(NamedTuple):
+    """Markers and fixtures of a test item"""
+
+    #: names of all the markers of the item, from every scope
+    marker_names: frozenset
+    #: closest marker of each name, as ``item.get_closest_marker`` returns it
+    markers: MappingProxyType
+    fixturenames: frozenset
+
+    def has_marker(self, name):
+        return name in self.marker_names
+
+    def closest(self, name, default=None):
+        return self.markers.get(name, default)
+
+    def uses_any(self, fixturenames):
+        return not self.fixturenames.isdisjoint(fixturenames)
+
+
+def item_index(item):
+    """Return the :class:`ItemIndex` of an item, built on first use"""
+    # item.add_marker appends to own_markers, an index built before is outdated
+    own_markers = len(item.own_markers)
+    cached = item.stash.get(_index_key, None)
+    if cached is not None and cached[0] == own_markers:
+        return cached[1]
+    markers = {}
+    # iter_markers yields the closest markers first
+    for marker in item.iter_markers():
+        markers.setdefault(marker.name, marker)
+    index = ItemIndex(
+        marker_names=frozenset(markers),
+        markers=MappingProxyType(markers),
+        fixturenames=frozenset(getattr(item, 'fixturenames', ())),
+    )
+    item.stash[_index_key] = (own_markers, index)
+    return index
+
+
+class CollectionPipeline:
+    """Ordered annotate and filter stages run in a single walk over the collected items"""
+
+    def __init__(self):
+        self.stages = []
+        #: items deselected by every filter stage
+        self.stats = Counter()
+        #: ``{name: {'function', 'calls', 'seconds', 'items_in', 'items_out'}}`` of every stage
+        self.stage_stats = {}
+
+    def register(self, name, stage, kind='annotate'):
+        """Register ``stage(item, index)``, stages run in registration order
+
+        :param kind: ``annotate`` or ``filter``, see the module documentation
+        """
+        if kind not in STAGE_KINDS:
+            raise ValueError(f'Unknown collection stage kind {kind}, expected one of {STAGE_KINDS}')
+        if any(registered == name for registered, _, _ in self.stages):
+            raise ValueError(f'Collection stage {name} is already registered')
+        self.stages.append((name, stage, kind))
+        self.stage_stats[name] = {
+            'function': f'{getattr(stage, "__module__", "")}.'
+            f'{getattr(stage, "__qualname__", type(stage).__name__)}',
+            'calls': 0,
+            'seconds': 0,
+            'items_in': 0,
+            'items_out': 0,
+        }
+
+    def run(self, items, config):
+        """Run the stages on every item, deselect the filtered ones and return them"""
+        selected, deselected = [], []
+        seconds = Counter()
+        received = Counter()
+        dropped = Counter()
+        for item in items:
+            index = item_index(item)
+            for name, stage, kind in self.stages:
+                started = time.perf_counter()
+                keep = stage(item, index)
+                seconds[name] += time.perf_counter() - started
+                received[name] += 1
+                if kind == 'filter' and not keep:
+                    dropped[name] += 1
+                    deselected.append(item)
+                    break
+                # an annotate stage may have added markers
+                index = item_index(item)
+            else:
+                selected.append(item)
+        for name, _, _ in self.stages:
+            stats = self.stage_stats[name]
+            stats['calls'] += 1
+            stats['seconds'] += seconds[name]
+            stats['items_in'] += received[name]
+            stats['items_out'] += received[name] - dropped[name]
+        self.stats.update(dropped)
+        logger.debug(
+            f'Collection pipeline ran {len(self.stages)} stages on {len(items)} items, '
+            f'deselected {len(deselected)}: {dict(self.stats)}, '
+            f'seconds per stage: { {name: round(value, 3) for name, value in seconds.items()} }'
+        )
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        return deselected
+
+
+def get_pipeline(config):
+    """Return the collection pipeline of the session, created on first use"""
+    if not hasattr(config, '_collection_pipeline'):
+        config._collection_pipeline = CollectionPipeline()
+    return config._collection_pipeline
@@ -0,0 +1,178 @@
+"""Time spent by the robottelo hook implementations during test collection.
+
+:class:`CollectionProfiler` wraps the implementations of the collection hooks defined by
+robottelo plugins and conftests, and records for each one the number of calls, the time spent,
+the number of items it received and kept, and the network connections and HTTP requests made
+while it ran. Network calls are counted by patching ``socket.socket.connect`` and
+``http.client.HTTPConnection.putrequest`` while the profiler is started.
+
+The stages of the :mod:`robottelo.utils.collection_pipeline` all run in one hook
+implementation, :meth:`CollectionProfiler.add_pipeline` adds each of them as its own entry.
+"""
+
+from collections import defaultdict
+import functools
+import http.client
+import socket
+import threading
+import time
+
+# hooks called during the collection phase
+COLLECTION_HOOKS = (
+    'pytest_collection',
+    'pytest_ignore_collect',
+    'pytest_collect_file',
+    'pytest_pycollect_makemodule',
+    'pytest_pycollect_makeitem',
+    'pytest_generate_tests',
+    'pytest_make_collect_report',
+    'pytest_collectstart',
+    'pytest_itemcollected',
+    'pytest_collectreport',
+    'pytest_collection_modifyitems',
+    'pytest_deselected',
+    'pytest_collection_finish',
+)
+# modules of the implementations to profile, the plugins of robottelo and its conftests
+PROFILED_MODULES = ('pytest_plugins', 'pytest_fixtures', 'robottelo', 'conftest', 'tests')
+COUNTERS = ('calls', 'seconds', 'items_in', 'items_out', 'connections', 'http_requests')
+
+
+class CollectionProfiler:
+    """Profile of the robottelo collection hook implementations of a pytest session"""
+
+    def __init__(self, hooks=COLLECTION_HOOKS, modules=PROFILED_MODULES):
+        self.hooks = hooks
+        self.modules = modules
+        self.stats = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self.collection_seconds = 0
+        self.items = 0
+        self._running = []
+        self._lock = threading.Lock()
+        self._patched = {}
+
+    def _is_profiled(self, hookimpl):
+        if hookimpl.hookwrapper or hookimpl.wrapper:
+            # a wrapper runs around the other implementations, its time includes theirs
+            return False
+        module = getattr(hookimpl.function, '__module__', None) or ''
+        return module.split('.')[0] in self.modules and not getattr(
+            hookimpl.function, '_collection_profiled', False
+        )
+
+    def instrument(self, pluginmanager, plugin=None):
+        """Wrap the collection hook implementations registered in ``pluginmanager``
+
+        :param plugin: only wrap the implementations of this plugin
+        """
+        for name in self.hooks:
+            hook = getattr(pluginmanager.hook, name, None)
+            if hook is None:
+                continue
+            for hookimpl in hook.get_hookimpls():
+                if (plugin is None or hookimpl.plugin is plugin) and self._is_profiled(hookimpl):
+                    hookimpl.function = self._wrap(name, hookimpl)
+
+    def _wrap(self, hook_name, hookimpl):
+        function = hookimpl.function
+        module = function.__module__
+        key = f'{hook_name} {module}.{function.__qualname__}'
+        items_index = hookimpl.argnames.index('items') if 'items' in hookimpl.argnames else None
+
+        @functools.wraps(function)
+        def profiled(*args):
+            stats = self.stats[key]
+            if items_index is not None:
+                stats['items_in'] += len(args[items_index])
+            self._running.append(stats)
+            started = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                stats['seconds'] += time.perf_counter() - started
+                stats['calls'] += 1
+                self._running.pop()
+                if items_index is not None:
+                    stats['items_out'] += len(args[items_index])
+
+        profiled._collection_profiled = True
+        return profiled
+
+    def _count(self, counter):
+        # network calls of threads started by an implementation are counted for it too
+        with self._lock:
+            if self._running:
+                self._running[-1][counter] += 1
+
+    def start(self):
+        """Count the network calls made by the profiled implementations"""
+        if self._patched:
+            return
+        profiler = self
+        connect = socket.socket.connect
+        putrequest = http.client.HTTPConnection.putrequest
+
+        @functools.wraps(connect)
+        def counted_connect(self, *args, **kwargs):
+            profiler._count('connections')
+            return connect(self, *args, **kwargs)
+
+        @functools.wraps(putrequest)
+        def counted_putrequest(self, *args, **kwargs):
+            profiler._count('http_requests')
+            return putrequest(self, *args, **kwargs)
+
+        self._patched = {
+            (socket.socket, 'connect'): connect,
+            (http.client.HTTPConnection, 'putrequest'): putrequest,
+        }
+        socket.socket.connect = counted_connect
+        http.client.HTTPConnection.putrequest = counted_putrequest
+
+    def stop(self):
+        """Restore the network functions patched by :meth:`start`"""
+        for (owner, name), original in self._patched.items():
+            setattr(owner, name, original)
+        self._patched = {}
+
+    def add_pipeline(self, pipeline):
+        """Add the stages of a collection pipeline, as ``collection_pipeline[<stage>]`` entries
+
+        The network calls of the stages are counted for the hook implementation running them.
+        """
+        for name, stage_stats in pipeline.stage_stats.items():
+            stats = self.stats[f'collection_pipeline[{name}] {stage_stats["function"]}']
+            for counter in ('calls', 'seconds', 'items_in', 'items_out'):
+                stats[counter] += stage_stats[counter]
+
+    def to_dict(self):
+        return {
+            'collection_seconds': self.collection_seconds,
+            'items': self.items,
+            'workers': 1,
+            'hooks': {key: dict(stats) for key, stats in self.stats.items()},
+        }
+
+    @staticmethod
+    def merge(*profiles):
+        """Merge the profiles of several processes, e.g. xdist workers collecting in parallel
+
+        Counters are summed, the collection time is the one of the slowest process.
+        """
+        merged = {'collection_seconds': 0, 'items': 0, 'workers': 0, 'hooks': {}}
+        for profile in profiles:
+            merged['collection_seconds'] = max(
+                merged['collection_seconds'], profile['collection_seconds']
+            )
+            merged['items'] = max(merged['items'], profile['items'])
+            merged['workers'] += profile['workers']
+            for key, stats in profile['hooks'].items():
+                total = merged['hooks'].setdefault(key, dict.fromkeys(COUNTERS, 0))
+                for counter, value in stats.items():
+                    total[counter] += value
+        return merged
+
+    @staticmethod
+    def top(profile, count=15):
+        """Return the ``(key, stats)`` of the implementations with the most time, slowest first"""
+        return sorted(profile['hooks'].items(), key=lambda entry: -entry[1]['seconds'])[:count]
@@ -1,4 +1,5 @@
-"""Implements test function locking, using pytest_services file locking
+"""Implements test function locking, using pytest_services file locking, or a redis lock
+shared by several machines when ``robottelo.func_locker_backend`` is set to ``redis``
 
 Usage::
 
@@ -50,6 +51,7 @@ from pytest_services.locks import file_lock
 
 from robottelo.config import settings
 from robottelo.logging import logger
+from robottelo.utils import redis_coordination
 
 TEMP_ROOT_DIR = 'robottelo'
 TEMP_FUNC_LOCK_DIR = 'lock_functions'
@@ -57,6 +59,7 @@ LOCK_DIR = None
 LOCK_DEFAULT_TIMEOUT = 1800  # 30 minutes
 LOCK_FILE_NAME_EXT = 'lock'
 LOCK_DEFAULT_SCOPE = None
+REDIS_KEY_PREFIX = 'robottelo:func_locker'
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
@@ -155,6 +158,19 @@ def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, s
     )
 
 
+def _get_function_name_lock_key(function_name, scope=None, scope_kwargs=None, scope_context=None):
+    """Return the redis key to lock, the same on every machine unlike the temp dir path"""
+    names = [REDIS_KEY_PREFIX]
+    if scope:
+        scope_name = scope(**(scope_kwargs or {})) if callable(scope) else scope
+        if scope_name:
+            names.append(scope_name)
+    if scope_context:
+        names.append(scope_context)
+    names.append(function_name)
+    return ':'.join(names)
+
+
 def _check_deadlock(lock_file_path, process_id):
     """To prevent process deadlock, raise exception if the file content is the
     same as process_id
@@ -188,6 +204,66 @@ def _write_content(handler, content):
     handler.flush()
 
 
+@contextmanager
+def _file_lock(function_name, scope, scope_context, scope_kwargs, timeout):
+    lock_file_path = _get_function_name_lock_path(
+        function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
+    )
+    process_id = str(os.getpid())
+    # to prevent dead lock when recursively calling this function
+    # check if the same process is trying to acquire the lock
+    _check_deadlock(lock_file_path, process_id)
+
+    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+        logger.info(
+            f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
+        )
+        # write the process id that locked this function
+        _write_content(handler, process_id)
+        # let the locked code run
+        try:
+            yield handler
+        finally:
+            # clear the file
+            _write_content(handler, None)
+
+
+@contextmanager
+def _redis_lock(function_name, scope, scope_context, scope_kwargs, timeout):
+    lock_key = _get_function_name_lock_key(
+        function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
+    )
+    process_id = redis_coordination.process_id()
+    lock = redis_coordination.RedisLock(
+        redis_coordination.get_client(),
+        lock_key,
+        timeout=timeout,
+        expire=settings.shared_function.lock_timeout,
+    )
+    # to prevent dead lock when recursively calling this function
+    # check if the same process is trying to acquire the lock
+    if lock.owner() == process_id:
+        raise FunctionLockerError(
+            'recursion detected: the function key already locked by the same process'
+        )
+    if not lock.acquire():
+        raise FunctionLockerError(f'Timeout while waiting for lock {lock_key}')
+    logger.info(
+        f'process id: {process_id} - lock function name:{function_name}  - using redis key: {lock_key}'
+    )
+    try:
+        yield lock
+    finally:
+        lock.release()
+
+
+def _lock(function_name, scope, scope_context, scope_kwargs, timeout):
+    """Return the lock context manager of the backend selected in settings"""
+    if settings.robottelo.func_locker_backend == 'redis':
+        return _redis_lock(function_name, scope, scope_context, scope_kwargs, timeout)
+    return _file_lock(function_name, scope, scope_context, scope_kwargs, timeout)
+
+
 def lock_function(
     function=None,
     scope=_get_default_scope,
@@ -230,28 +306,8 @@ def lock_function(
         @functools.wraps(func)
         def function_wrapper(*args, **kwargs):
             function_name = _get_function_name(func, class_name=class_name)
-            lock_file_path = _get_function_name_lock_path(
-                function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
-            )
-            process_id = str(os.getpid())
-            # to prevent dead lock when recursively calling this function
-            # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
-
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
-                logger.info(
-                    f'process id: {process_id} lock function using file path: {lock_file_path}'
-                )
-                # write the process id that locked this function
-                _write_content(handler, process_id)
-                # call the locked function
-                try:
-                    res = func(*args, **kwargs)
-                finally:
-                    # clear the file
-                    _write_content(handler, None)
-
-            return res
+            with _lock(function_name, scope, scope_context, scope_kwargs, timeout):
+                return func(*args, **kwargs)
 
         return function_wrapper
 
@@ -291,23 +347,5 @@ def locking_function(
         raise FunctionLockerError('Cannot ensure locking when using a non locked function')
     class_name = getattr(function, '__class_name__', None)
     function_name = _get_function_name(function, class_name=class_name)
-    lock_file_path = _get_function_name_lock_path(
-        function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
-    )
-    process_id = str(os.getpid())
-    # to prevent dead lock when recursively calling this function
-    # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
-
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
-        logger.info(
-            f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
-        )
-        # write the process id that locked this function
-        _write_content(handler, process_id)
-        # let the locked code run
-        try:
-            yield handler
-        finally:
-            # clear the file
-            _write_content(handler, None)
+    with _lock(function_name, scope, scope_context, scope_kwargs, timeout) as handler:
+        yield handler
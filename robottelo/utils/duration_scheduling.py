@@ -0,0 +1,107 @@
+"""Predicted test durations for the duration aware xdist scheduling.
+
+:class:`DurationHistory` keeps a moving average of the duration of every test of the previous
+sessions, stored in the pytest cache. Durations can also be read from junit reports with
+:func:`junit_durations`, e.g. the reports of the last Report Portal launch.
+
+The scheduler groups the tests in work units, by default the tests of a module, so the module
+fixtures are set up once on a single Satellite. Tests marked with one of :data:`FACTORY_MARKERS`
+check out their own Satellite or Capsule and are units of their own. The units are handed out
+longest first, :func:`predict_makespan` simulates that distribution.
+"""
+
+import heapq
+import statistics
+from xml.etree import ElementTree
+
+CACHE_KEY = 'robottelo/test_durations'
+SCOPES = ('module', 'class', 'test')
+#: tests with these markers do not use the Satellite of their worker
+FACTORY_MARKERS = frozenset(('destructive', 'factory_instance'))
+DEFAULT_DURATION = 60
+
+
+def split_scope(nodeid, scope='module'):
+    """Return the work unit of a test, its module, its class or the test itself"""
+    if scope == 'test':
+        return nodeid
+    if scope == 'class':
+        return nodeid.rsplit('::', 1)[0]
+    return nodeid.split('::', 1)[0]
+
+
+def junit_name(nodeid):
+    """Return the ``classname.name`` of a test in a junit report"""
+    path, _, name = nodeid.partition('::')
+    return f'{path.removesuffix(".py").replace("/", ".")}.{name.replace("::", ".")}'
+
+
+def junit_durations(path, nodeids):
+    """Return the durations of the given tests found in a junit report, by node id"""
+    by_junit_name = {junit_name(nodeid): nodeid for nodeid in nodeids}
+    durations = {}
+    for case in ElementTree.parse(path).iter('testcase'):
+        nodeid = by_junit_name.get(f'{case.get("classname", "")}.{case.get("name", "")}')
+        if nodeid is not None:
+            durations[nodeid] = durations.get(nodeid, 0) + float(case.get('time') or 0)
+    return durations
+
+
+class DurationHistory:
+    """Moving average of the test durations of the previous sessions, by node id"""
+
+    def __init__(self, durations=None, weight=0.5):
+        self.durations = dict(durations or {})
+        #: weight of the last session in the average
+        self.weight = weight
+
+    @classmethod
+    def load(cls, cache, weight=0.5):
+        return cls(cache.get(CACHE_KEY, {}) if cache is not None else {}, weight=weight)
+
+    def save(self, cache):
+        if cache is not None:
+            cache.set(CACHE_KEY, self.durations)
+
+    def update(self, durations):
+        """Add the durations of a session"""
+        for nodeid, seconds in durations.items():
+            previous = self.durations.get(nodeid)
+            if previous is not None:
+                seconds = self.weight * seconds + (1 - self.weight) * previous
+            self.durations[nodeid] = round(seconds, 3)
+
+
+class DurationPredictor:
+    """Predicted duration of the tests
+
+    Tests without a known duration take ``factory_default`` seconds if they are factory tests,
+    to account for the Satellite checkout, or ``default`` seconds, the median of the known
+    durations if not given.
+    """
+
+    def __init__(self, durations, factory_tests=(), default=None, factory_default=1800):
+        self.durations = durations
+        self.factory_tests = frozenset(factory_tests)
+        if default is None:
+            default = statistics.median(durations.values()) if durations else DEFAULT_DURATION
+        self.default = default
+        self.factory_default = factory_default
+        self.unknown = set()
+
+    def __call__(self, nodeid):
+        if (seconds := self.durations.get(nodeid)) is not None:
+            return seconds
+        self.unknown.add(nodeid)
+        return self.factory_default if nodeid in self.factory_tests else self.default
+
+
+def predict_makespan(unit_durations, workers):
+    """Return the makespan and the worker loads of units handed out longest first
+
+    Each unit goes to the worker that becomes free first.
+    """
+    loads = [0.0] * max(workers, 1)
+    for seconds in sorted(unit_durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + seconds)
+    return max(loads), sorted(loads, reverse=True)
@@ -0,0 +1,202 @@
+"""Read the facts of a host in a single ssh round trip.
+
+The OS release and architecture of a :class:`~robottelo.hosts.ContentHost` used to take a remote
+command each, repeated by every new instance of the same host. With
+``performance.fact_probe.enabled``, the first of these properties read runs :data:`PROBE_SCRIPT`
+instead, which collects all of them at once, and fills the others from its output.
+
+With ``performance.fact_probe.cache``, the facts are also kept in a local directory, keyed by the
+hostname and the boot id of the host. Another instance of the same host, in this session or a
+later one, only reads the boot id to reuse them. The cached facts are kept until the next reboot
+of the host: a ``dnf update`` changing ``/etc/os-release`` without a reboot is not noticed, a
+leapp upgrade, which reboots, is. Both settings are off by default.
+
+The addresses, the registration and the RHSM facts of the host change during the tests, they are
+not probed and are read live by ``ip_addr``, ``subscribed`` and ``get_facts``.
+
+Usage::
+
+    facts = fact_probe.get_facts(host)
+    facts['os_release']['VERSION_ID'], facts['arch'], facts['is_el']
+"""
+
+import base64
+import json
+from pathlib import Path
+import re
+import shlex
+import time
+from uuid import uuid4
+
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.exceptions import ContentHostError
+from robottelo.logging import logger
+
+MARKER = 'ROBOTTELO_FACT'
+# the boot id is shared by the containers running on the same kernel, the start time of their
+# pid 1 sets them apart
+BOOT_ID_COMMAND = (
+    "echo $(cat /proc/sys/kernel/random/boot_id)-$(sed 's/.*) //' /proc/1/stat | cut -d' ' -f20)"
+)
+PROBES = {
+    'boot_id': BOOT_ID_COMMAND,
+    'os_release': 'cat /etc/os-release',
+    'redhat_release': 'cat /etc/redhat-release',
+    'arch': 'uname -m',
+}
+# every probe prints "<marker> <name> <exit code> <base64 stdout>"
+PROBE_SCRIPT = '\n'.join(
+    [
+        'probe() { name=$1; out=$(sh -c "$2" 2>/dev/null); status=$?; '
+        f'printf "{MARKER} %s %s %s\\n" "$name" "$status" "$(printf %s "$out" | base64 -w0)"; }}',
+        *(f'probe {name} {shlex.quote(command)}' for name, command in PROBES.items()),
+    ]
+)
+
+
+def parse_os_release(text):
+    """Return the fields of an /etc/os-release file"""
+    facts = {}
+    regex = r'^(["\'])(.*)(\1)$'
+    for ln in [line for line in text.splitlines() if line.strip()]:
+        line = ln.strip()
+        if line.startswith('#'):
+            continue
+        key, value = line.split('=')
+        if key and value:
+            facts[key] = re.sub(regex, r'\2', value).replace('\\', '')
+    return facts
+
+
+def parse_redhat_release(text):
+    """Return the /etc/os-release fields of an /etc/redhat-release file"""
+    match = re.match(r'(?P<NAME>.+) release (?P<major>\d+)(.(?P<minor>\d+))?', text)
+    if match is None:
+        raise ContentHostError(f'Not able to parse release string "{text}"')
+    r_release = match.groupdict()
+
+    # /etc/os-release compatibility layer
+    r_release['VERSION_ID'] = r_release['major']
+    # not every release have a minor version
+    r_release['VERSION_ID'] += f'.{r_release["minor"]}' if r_release['minor'] else ''
+
+    distro_map = {
+        'Fedora': {'NAME': 'Fedora Linux', 'ID': 'fedora'},
+        'CentOS': {'ID': 'centos'},
+        'Red Hat Enterprise Linux': {'ID': 'rhel'},
+    }
+    # Use the version map to set the NAME and ID fields
+    for distro, properties in distro_map.items():
+        if distro in r_release['NAME']:
+            r_release.update(properties)
+            break
+    return r_release
+
+
+def parse_rhsm_facts(text):
+    """Return the facts printed by ``subscription-manager facts``"""
+    fact_dict, last_key = {}, None
+    for line in text.splitlines():
+        if ': ' in line:
+            key, val = line.split(': ', 1)
+        else:
+            key = last_key
+            val = f'{fact_dict[key]} {line}'
+        fact_dict[key] = val.strip()
+        last_key = key
+    return fact_dict
+
+
+def parse_probe_output(stdout):
+    """Return the ``(exit code, stdout)`` of every probe of :data:`PROBE_SCRIPT`"""
+    outputs = {}
+    for line in stdout.splitlines():
+        if not line.startswith(f'{MARKER} '):
+            continue
+        _, name, status, out = (line.split(' ') + [''])[:4]
+        outputs[name] = int(status), base64.b64decode(out).decode()
+    return outputs
+
+
+def facts_from_output(hostname, outputs):
+    """Build the facts of a host from the parsed output of :data:`PROBE_SCRIPT`"""
+
+    def output(name):
+        status, out = outputs.get(name, (None, ''))
+        return out if status == 0 else None
+
+    os_release = output('os_release')
+    return {
+        'hostname': hostname,
+        'boot_id': (output('boot_id') or '').strip() or None,
+        'os_release': parse_os_release(os_release) if os_release is not None else None,
+        'redhat_release': output('redhat_release'),
+        'is_el': outputs.get('redhat_release', (None, ''))[0] == 0,
+        'arch': (output('arch') or '').strip() or None,
+        'probed_at': time.time(),
+    }
+
+
+def probe(host):
+    """Run :data:`PROBE_SCRIPT` on a host and return its facts"""
+    started = time.monotonic()
+    result = host.execute(PROBE_SCRIPT)
+    outputs = parse_probe_output(result.stdout)
+    if 'boot_id' not in outputs:
+        raise ContentHostError(f'Fact probe of {host.hostname} failed: {result.stderr}')
+    facts = facts_from_output(host.hostname, outputs)
+    logger.debug(f'Probed the facts of {host.hostname} in {time.monotonic() - started:.2f}s')
+    return facts
+
+
+class FactCache:
+    """Keeps the facts of the hosts in a directory, one JSON file per host and boot"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, hostname, boot_id):
+        return self.directory.joinpath(f'{hostname}_{boot_id}.json')
+
+    def has(self, hostname):
+        """Return True if facts of any boot of the host are cached"""
+        return any(self.directory.glob(f'{hostname}_*.json'))
+
+    def get(self, hostname, boot_id):
+        try:
+            return json.loads(self._path(hostname, boot_id).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def set(self, facts):
+        """Store the facts of a host, replacing the ones of its previous boots"""
+        for path in self.directory.glob(f'{facts["hostname"]}_*.json'):
+            path.unlink(missing_ok=True)
+        path = self._path(facts['hostname'], facts['boot_id'])
+        tmp_file = path.with_name(f'{path.name}.{uuid4().hex}.tmp')
+        tmp_file.write_text(json.dumps(facts))
+        tmp_file.replace(path)
+
+
+def get_cache():
+    """Return the local fact cache, None when ``performance.fact_probe.cache`` is disabled"""
+    if settings.performance.fact_probe.cache is not True:
+        return None
+    return FactCache(Path(robottelo_tmp_dir, 'fact_probe'))
+
+
+def get_facts(host, cache=None):
+    """Return the facts of a host, from the cache of its current boot or probed
+
+    :param cache: a :class:`FactCache`, the one of :func:`get_cache` by default
+    """
+    cache = cache if cache is not None else get_cache()
+    if cache is not None and cache.has(host.hostname):
+        boot_id = host.execute(BOOT_ID_COMMAND).stdout.strip()
+        if facts := cache.get(host.hostname, boot_id):
+            return facts
+    facts = probe(host)
+    if cache is not None and facts['boot_id']:
+        cache.set(facts)
+    return facts
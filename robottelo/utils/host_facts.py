@@ -0,0 +1,140 @@
+"""Snapshot of the Satellite host facts needed before any test runs.
+
+Test collection needs the Satellite and RHEL versions of the Satellite host. Reading them over
+ssh on every xdist worker stalls collection when the Satellite is slow or unreachable, so the
+``host_facts`` plugin makes the controller take a snapshot once. The snapshot is kept in the
+pytest cache for ``performance.host_facts.ttl`` seconds and sent to the workers, and with
+``--offline-host-facts`` or ``performance.host_facts.offline`` it is built from settings only.
+
+The snapshot is only used during collection, and only while ``server.hostname`` is the host it
+was taken from. The fixtures and tests read the facts from the Satellite the worker is aligned
+to, which may have been upgraded or re-provisioned since the snapshot was taken.
+
+Outside of a pytest session (scripts, interactive use) no snapshot is taken and the callers read
+the facts from the host as before.
+"""
+
+import threading
+import time
+
+from robottelo.config import settings
+from robottelo.constants import SATELLITE_VERSION
+from robottelo.exceptions import ContentHostError
+from robottelo.logging import logger
+
+CACHE_KEY = 'robottelo/host_facts'
+
+_configured = False
+_collecting = False
+_cache = None
+_offline = False
+_snapshot = None
+_lock = threading.Lock()
+
+
+def settings_satellite_version():
+    """Return the Satellite version according to the robottelo configuration"""
+    if str(settings.server.version.get('release')) == 'stream':
+        return str(settings.robottelo.get('satellite_version'))
+    return SATELLITE_VERSION
+
+
+def settings_rhel_version():
+    """Return the RHEL version of the Satellite host according to the robottelo configuration"""
+    if hasattr(settings.server.version, 'rhel_version'):
+        return str(settings.server.version.rhel_version)
+    if hasattr(settings.robottelo, 'rhel_version'):
+        return settings.robottelo.rhel_version
+    return None
+
+
+def _facts(source, satellite_version, rhel_version):
+    return {
+        'hostname': settings.server.get('hostname'),
+        'satellite_version': satellite_version,
+        'rhel_version': rhel_version,
+        'source': source,
+        'fetched_at': time.time(),
+    }
+
+
+def from_settings():
+    """Build the host facts from the robottelo configuration only"""
+    return _facts('settings', settings_satellite_version(), settings_rhel_version())
+
+
+def fetch():
+    """Read the host facts from the Satellite, falling back to the robottelo configuration"""
+    from dynaconf.vendor.box.exceptions import BoxKeyError
+    from ssh2.exceptions import AuthenticationError
+
+    from robottelo.hosts import Satellite
+
+    started = time.monotonic()
+    try:
+        sat = Satellite()
+        facts = _facts('ssh', sat.version, str(sat.os_version))
+    except (AuthenticationError, ContentHostError, BoxKeyError) as err:
+        logger.warning(f'Failed to read the Satellite host facts, using settings: {err}')
+        return from_settings()
+    logger.info(f'Satellite host facts read in {time.monotonic() - started:.2f}s: {facts}')
+    return facts
+
+
+def _load():
+    if _offline or settings.performance.host_facts.offline is True:
+        return from_settings()
+    if _cache is not None:
+        facts = _cache.get(CACHE_KEY, None)
+        if (
+            facts
+            and facts.get('hostname') == settings.server.get('hostname')
+            and time.time() - facts['fetched_at'] < settings.performance.host_facts.ttl
+        ):
+            return facts
+    facts = fetch()
+    # facts from settings are not persisted, the next session tries the host again
+    if facts['source'] == 'ssh' and _cache is not None:
+        _cache.set(CACHE_KEY, facts)
+    return facts
+
+
+def configure(cache=None, offline=False):
+    """Enable the snapshot for this process
+
+    :param cache: a store with ``get(key, default)`` and ``set(key, value)``, like the pytest cache
+    :param offline: build the snapshot from settings only
+    """
+    global _configured, _collecting, _cache, _offline, _snapshot
+    with _lock:
+        _configured, _collecting, _cache, _offline, _snapshot = True, True, cache, offline, None
+
+
+def collection_finished():
+    """Stop handing out the snapshot, the callers read the facts from the host from now on"""
+    global _collecting
+    with _lock:
+        _collecting = False
+
+
+def set_snapshot(facts):
+    """Use facts taken by another process, e.g. sent by the xdist controller"""
+    global _snapshot
+    with _lock:
+        _snapshot = facts
+
+
+def snapshot():
+    """Return the host facts, taken on first use, or None if the snapshot is not enabled
+
+    None after the collection, or when ``server.hostname`` is not the host of the snapshot.
+    """
+    global _snapshot
+    with _lock:
+        if not _collecting:
+            return None
+        if _snapshot is None and _configured:
+            _snapshot = _load()
+        if _snapshot is None or _snapshot.get('hostname') != settings.server.get('hostname'):
+            return None
+        return _snapshot
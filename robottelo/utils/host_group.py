@@ -0,0 +1,163 @@
+"""Run the same call on several hosts at once.
+
+Usage::
+
+    group = ContentHost.parallel(content_hosts)
+    group.register(module_org, None, ak.name, target_sat)
+    results = group.execute('rpm -q katello-host-tools')
+    [result.status for result in results.values]
+    group.map(lambda host: host.enable_repo(baseos_repos[host.os_version.major]))
+
+Every call waits for all the hosts and returns a :class:`GroupResult` with the result of every
+host, in the order of the hosts. When a call raised on some hosts, :class:`HostGroupError` is
+raised once all the hosts are done, with the results of all of them. The calls run in a thread
+pool of ``performance.host_group.max_workers`` threads, so setting up N hosts takes about as long
+as the slowest one.
+
+Not to be mistaken with the host groups of Satellite, ``target_sat.api.HostGroup``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from robottelo.config import settings
+from robottelo.exceptions import HostGroupError
+from robottelo.logging import logger
+
+
+class HostResult:
+    """Outcome of a call on one host of a :class:`HostGroup`"""
+
+    def __init__(self, host, value=None, error=None, duration=0):
+        self.host = host
+        self.value = value
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def result(self):
+        """Return what the call returned, or raise what it raised"""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self):
+        outcome = f'error={self.error!r}' if self.error is not None else f'value={self.value!r}'
+        return f'<HostResult {self.host} {outcome} {self.duration:.2f}s>'
+
+
+class GroupResult(list):
+    """The :class:`HostResult` of every host, in the order of the hosts
+
+    :param name: name of the call, for the logs and the errors
+    :param duration: seconds from the first call to the end of the last one
+    """
+
+    def __init__(self, results, name='', duration=0):
+        super().__init__(results)
+        self.name = name
+        self.duration = duration
+
+    @property
+    def values(self):
+        """The return values, None for the hosts where the call raised"""
+        return [result.value for result in self]
+
+    @property
+    def errors(self):
+        """The exceptions raised, by host"""
+        return {result.host: result.error for result in self if not result.ok}
+
+    @property
+    def busy_time(self):
+        """Sum of the call durations, what running them one after another would have taken"""
+        return sum(result.duration for result in self)
+
+    def raise_for_errors(self):
+        """Raise :class:`HostGroupError` when the call raised on any host"""
+        if errors := self.errors:
+            raise HostGroupError(self.name, errors, self)
+        return self
+
+
+class HostGroup:
+    """Hosts on which calls are made in parallel, see the module documentation
+
+    :param hosts: the hosts, e.g. the list returned by the ``content_hosts`` fixture
+    :param max_workers: number of hosts called at the same time, defaults to
+        ``performance.host_group.max_workers``
+    """
+
+    def __init__(self, hosts, max_workers=None):
+        self.hosts = list(hosts)
+        self.max_workers = max_workers or settings.performance.host_group.max_workers
+
+    def __iter__(self):
+        return iter(self.hosts)
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def __getitem__(self, index):
+        return self.hosts[index]
+
+    def __repr__(self):
+        return f'<HostGroup {", ".join(str(host) for host in self.hosts)}>'
+
+    @staticmethod
+    def _timed(function, host):
+        started = time.monotonic()
+        try:
+            value = function(host)
+        except Exception as err:
+            return HostResult(host, error=err, duration=time.monotonic() - started)
+        return HostResult(host, value=value, duration=time.monotonic() - started)
+
+    def map(self, function, name=None):
+        """Call ``function(host)`` for every host
+
+        :param name: name of the call in the logs and errors, the function name by default
+        :raises HostGroupError: when the function raised on some hosts, after all of them ran
+        :return GroupResult: the result of every host, in the order of the hosts
+        """
+        name = name or getattr(function, '__name__', repr(function))
+        started = time.monotonic()
+        workers = max(min(self.max_workers, len(self.hosts)), 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='host_group') as executor:
+            results = list(executor.map(lambda host: self._timed(function, host), self.hosts))
+        results = GroupResult(results, name=name, duration=time.monotonic() - started)
+        logger.debug(
+            f'{name} on {len(results)} hosts took {results.duration:.1f}s, '
+            f'{results.busy_time:.1f}s one host after another'
+        )
+        return results.raise_for_errors()
+
+    def call(self, method, *args, **kwargs):
+        """Call the method named ``method`` of every host with the same arguments"""
+        return self.map(lambda host: getattr(host, method)(*args, **kwargs), name=method)
+
+    def execute(self, *args, **kwargs):
+        """Run ``host.execute(*args, **kwargs)`` on every host"""
+        return self.call('execute', *args, **kwargs)
+
+    def put(self, *args, **kwargs):
+        """Run ``host.put(*args, **kwargs)`` on every host"""
+        return self.call('put', *args, **kwargs)
+
+    def register(self, *args, **kwargs):
+        """Run ``host.register(*args, **kwargs)`` on every host"""
+        return self.call('register', *args, **kwargs)
+
+    def __getattr__(self, name):
+        """Any other host method, e.g. ``group.install_katello_host_tools()``"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        call.__name__ = name
+        return call
@@ -0,0 +1,209 @@
+"""Content hosts checked out ahead of the tests which need them.
+
+With ``performance.host_pool.enabled``, the content host fixtures take their hosts from the
+:class:`HostPool` of the process instead of checking them out from broker during the test setup.
+Before every test, :mod:`pytest_plugins.host_pool` tells the pool the hosts needed by the next
+tests, which the pool checks out and sets up in background threads. A fixture gets a ready host
+at once, waits for the one being checked out, or checks one out itself when none was expected.
+
+Hosts are never reused by another test, used hosts are checked in in the background. Ready hosts
+which are not needed by the next tests are kept up to ``performance.host_pool.max_idle``, the
+other ones are checked in.
+
+Usage::
+
+    pool = host_pool.get_pool()
+    host = pool.acquire(deploy_kwargs, 'rhel9-ipv4')
+    ...
+    host.teardown()
+    pool.release(host)
+"""
+
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+import json
+import threading
+import time
+
+from broker import Broker
+
+from robottelo.logging import logger
+
+COUNTERS = (
+    'requests',
+    'hits',
+    'waits',
+    'misses',
+    'failures',
+    'wait_seconds',
+    'max_wait',
+    'checked_out',
+    'idle_checked_in',
+)
+
+_pool = None
+
+
+def deploy_key(deploy_kwargs):
+    """Return a hashable key of broker deploy arguments"""
+    return json.dumps(deploy_kwargs, sort_keys=True, default=str)
+
+
+class HostPool:
+    """Content hosts checked out in background threads, by broker deploy arguments
+
+    :param host_class: class of the hosts checked out from broker
+    :param workers: number of hosts checked out or in at the same time
+    :param max_idle: number of ready hosts kept while the next tests do not need them
+    """
+
+    def __init__(self, host_class, workers=4, max_idle=2):
+        self.host_class = host_class
+        self.max_idle = max_idle
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='host_pool')
+        self._lock = threading.Lock()
+        # checkouts in progress or done, oldest first, by deploy key
+        self._hosts = defaultdict(deque)
+        self._confs = {}
+        self._checkins = []
+        self.stats = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    def _checkout(self, deploy_kwargs):
+        return Broker(**deploy_kwargs, host_class=self.host_class).checkout()
+
+    def _checkin(self, host):
+        Broker(hosts=[host]).checkin()
+
+    def _prepare(self, deploy_kwargs, label):
+        host = self._checkout(deploy_kwargs)
+        try:
+            host.setup()
+        except Exception:
+            self._checkin(host)
+            raise
+        self.stats[label]['checked_out'] += 1
+        return host
+
+    def prefetch(self, demand):
+        """Check out the hosts needed by the next tests
+
+        :param demand: ``(deploy_kwargs, label)`` of every host of the next tests
+        """
+        needed = Counter()
+        with self._lock:
+            for deploy_kwargs, label in demand:
+                key = deploy_key(deploy_kwargs)
+                self._confs.setdefault(key, (deploy_kwargs, label))
+                needed[key] += 1
+            for key, count in needed.items():
+                deploy_kwargs, label = self._confs[key]
+                futures = self._hosts[key]
+                for future in [future for future in futures if future.done()]:
+                    if err := future.exception():
+                        # checked out again below
+                        futures.remove(future)
+                        self.stats[label]['failures'] += 1
+                        logger.warning(f'Pooled {label} content host checkout failed: {err}')
+                for _ in range(count - len(futures)):
+                    self._hosts[key].append(
+                        self._executor.submit(self._prepare, deploy_kwargs, label)
+                    )
+            self._trim(needed)
+
+    def _trim(self, needed):
+        """Check in the ready hosts beyond the needed ones and the idle watermark"""
+        idle = []
+        for key, futures in self._hosts.items():
+            ready = [future for future in futures if future.done() and not future.exception()]
+            idle.extend((key, future) for future in ready[needed.get(key, 0) :])
+        for key, future in idle[self.max_idle :]:
+            self._hosts[key].remove(future)
+            self.stats[self._confs[key][1]]['idle_checked_in'] += 1
+            self.release(future.result())
+
+    def acquire(self, deploy_kwargs, label):
+        """Return a ready host, wait for one being checked out or check one out"""
+        started = time.monotonic()
+        key = deploy_key(deploy_kwargs)
+        stats = self.stats[label]
+        stats['requests'] += 1
+        with self._lock:
+            futures = self._hosts[key]
+            future = next((future for future in futures if future.done()), None)
+            if future is None and futures:
+                future = futures[0]
+            if future is not None:
+                futures.remove(future)
+        host = None
+        if future is not None:
+            ready = future.done()
+            try:
+                host = future.result()
+            except Exception as err:
+                stats['failures'] += 1
+                logger.warning(f'Pooled {label} content host checkout failed: {err}')
+            else:
+                stats['hits' if ready else 'waits'] += 1
+        if host is None:
+            stats['misses'] += 1
+            host = self._prepare(deploy_kwargs, label)
+        waited = time.monotonic() - started
+        stats['wait_seconds'] += waited
+        stats['max_wait'] = max(stats['max_wait'], waited)
+        return host
+
+    def release(self, host):
+        """Check in a host in the background"""
+        self._checkins.append(self._executor.submit(self._checkin, host))
+
+    def close(self):
+        """Check in every host of the pool and wait for all the checkins"""
+        with self._lock:
+            futures = [future for futures in self._hosts.values() for future in futures]
+            self._hosts.clear()
+        for future in futures:
+            if not future.cancel() and not future.exception():
+                self.release(future.result())
+        for future in wait(self._checkins).done:
+            if err := future.exception():
+                logger.warning(f'Content host checkin failed: {err}')
+        self._executor.shutdown()
+
+    def to_dict(self):
+        return {label: dict(stats) for label, stats in self.stats.items()}
+
+    @staticmethod
+    def merge(*pool_stats):
+        """Merge the stats of several processes"""
+        merged = {}
+        for stats in pool_stats:
+            for label, counters in stats.items():
+                total = merged.setdefault(label, dict.fromkeys(COUNTERS, 0))
+                for counter, value in counters.items():
+                    if counter == 'max_wait':
+                        total[counter] = max(total[counter], value)
+                    else:
+                        total[counter] += value
+        return merged
+
+
+def configure(host_class, workers, max_idle):
+    """Create the host pool of the process"""
+    global _pool
+    _pool = HostPool(host_class, workers=workers, max_idle=max_idle)
+    return _pool
+
+
+def get_pool():
+    """Return the host pool of the process, None when it is not enabled"""
+    return _pool
+
+
+def close():
+    """Check in the hosts of the pool and return its stats"""
+    global _pool
+    if _pool is None:
+        return {}
+    pool, _pool = _pool, None
+    pool.close()
+    return pool.to_dict()
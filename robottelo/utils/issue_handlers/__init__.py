@@ -4,9 +4,12 @@ from robottelo.utils.issue_handlers import jira
 
 
 def add_workaround(data, matches, usage, validation=(lambda *a, **k: True), **kwargs):
-    """Adds entry for workaround usage."""
+    """Adds entry for workaround usage.
+
+    Matches are either issue keys or ``(source, number)`` pairs of ``source:number`` issues.
+    """
     for match in matches:
-        issue = f"{match[0]}:{match[1]}"
+        issue = match if isinstance(match, str) else f"{match[0]}:{match[1]}"
         if validation(data, issue, usage, **kwargs):
             data[issue.strip()]['used_in'].append({'usage': usage, **kwargs})
 
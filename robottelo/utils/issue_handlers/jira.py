@@ -1,11 +1,16 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import json
+import os
 from pathlib import Path
+import sqlite3
+import threading
 import time
 
 from jira import JIRA
 from jira.exceptions import JIRAError
 import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
 from wait_for import TimedOutError, wait_for
 
 from robottelo.config import settings
@@ -40,54 +45,154 @@ def _issue_to_flat_dict(issue, out_fields):
 
 class JiraStatusCache:
     """Handles caching of Jira issue statuses to reduce API calls.
-    This class manages a local cache of Jira issue data, allowing for
-    efficient retrieval and storage of issue statuses. The cache is
-    periodically cleaned to remove expired entries based on a configurable
-    time-to-live (TTL) value.
+
+    Issue data is stored in a sqlite database, one row per issue, so xdist workers and scripts
+    update it concurrently without rewriting or losing the entries of each other. The database
+    is opened on first use, entries older than ``jira.cache_ttl_days`` are ignored by the queries
+    and removed when it is opened.
+
+    A ``jira.cache_file`` with the ``.json`` suffix of the previous format is replaced by a
+    ``.sqlite`` database next to it, which imports the JSON entries when it is created.
     """
 
-    def __init__(self):
-        self.cache_file = Path(settings.jira.cache_file)
-        self.cache_ttl_days = settings.jira.cache_ttl_days
-        self.cache = self._load_cache()
-
-    def _load_cache(self):
-        if self.cache_file.exists():
-            logger.debug(f"Loading Jira cache from {self.cache_file}")
-            data = json.loads(self.cache_file.read_text())
-            self._clean_expired_entries(data)
-            logger.debug(f"Loaded {len(self.cache)} entries from Jira cache")
-            return self.cache
-        logger.debug("Jira cache file does not exist, using empty cache")
-        return {}
+    # sqlite limits the number of variables of a query
+    MAX_VARIABLES = 500
+
+    def __init__(self, cache_file=None, cache_ttl_days=None):
+        cache_file = Path(cache_file or settings.jira.cache_file)
+        self.legacy_file = cache_file if cache_file.suffix == '.json' else None
+        self.cache_file = cache_file.with_suffix('.sqlite') if self.legacy_file else cache_file
+        self.cache_ttl_days = (
+            settings.jira.cache_ttl_days if cache_ttl_days is None else cache_ttl_days
+        )
+        self.stats = Counter()
+        self._ages = []
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return self.cache_ttl_days * 86400
+
+    def _connect(self):
+        """Return the database connection of this process, opened on first use"""
+        # a connection inherited from a forked parent must not be used
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        started = time.monotonic()
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # the default rollback journal keeps the database in a single file, e.g. for CI caches
+        connection = sqlite3.connect(self.cache_file, timeout=60, check_same_thread=False)
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS issues '
+                '(key TEXT PRIMARY KEY, data TEXT NOT NULL, timestamp REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS issues_timestamp ON issues (timestamp)')
+            expired = connection.execute(
+                'DELETE FROM issues WHERE timestamp < ?', (time.time() - self.ttl,)
+            ).rowcount
+            if self.legacy_file and self.legacy_file.exists():
+                self._import_legacy(connection)
+        self._connection, self._pid = connection, os.getpid()
+        logger.debug(
+            f'Opened Jira cache {self.cache_file} in {time.monotonic() - started:.3f}s, '
+            f'{expired} expired entries removed'
+        )
+        return connection
+
+    def _import_legacy(self, connection):
+        """Import the entries of the JSON cache file not in the database yet"""
+        try:
+            issues = json.loads(self.legacy_file.read_text()).get('issues', {})
+        except (OSError, ValueError) as err:
+            logger.warning(f'Failed to import the Jira cache {self.legacy_file}: {err}')
+            return
+        connection.executemany(
+            'INSERT OR IGNORE INTO issues (key, data, timestamp) VALUES (?, ?, ?)',
+            [
+                (key, json.dumps(value), value.get('timestamp', 0))
+                for key, value in issues.items()
+                if time.time() - value.get('timestamp', 0) <= self.ttl
+            ],
+        )
+        logger.debug(f'Imported {len(issues)} entries from the Jira cache {self.legacy_file}')
+
+    def _select(self, issue_ids):
+        """Return the data of the unexpired entries of ``issue_ids`` by issue id"""
+        issue_ids = list(dict.fromkeys(issue_ids))
+        now = time.time()
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for index in range(0, len(issue_ids), self.MAX_VARIABLES):
+                chunk = issue_ids[index : index + self.MAX_VARIABLES]
+                rows = connection.execute(
+                    f'SELECT key, data, timestamp FROM issues WHERE timestamp >= ? '
+                    f'AND key IN ({", ".join("?" * len(chunk))})',
+                    (now - self.ttl, *chunk),
+                )
+                found.update((key, (data, timestamp)) for key, data, timestamp in rows)
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(issue_ids) - len(found)
+            self._ages.extend(now - timestamp for _, timestamp in found.values())
+        return {key: json.loads(data) for key, (data, _) in found.items()}
 
     def get(self, issue_id):
-        return self.cache.get(issue_id)
+        return self._select([issue_id]).get(issue_id)
 
     def get_many(self, issue_ids):
-        results = {issue_id: self.cache.get(issue_id) for issue_id in issue_ids}
-        logger.debug(
-            f"Retrieved {sum(1 for v in results.values() if v is not None)} entries from cache"
-        )
+        found = self._select(issue_ids)
+        results = {issue_id: found.get(issue_id) for issue_id in issue_ids}
+        logger.debug(f"Retrieved {len(found)} entries from cache")
         return results
 
     def update(self, issue_id, data):
-        self.cache[issue_id] = data | {"timestamp": time.time()}
+        """Insert or replace the data of an issue, written to the database immediately"""
+        self.update_many({issue_id: data})
 
-    def save(self):
-        logger.debug(f"Saving {len(self.cache)} entries to Jira cache file")
-        self.cache_file.write_text(json.dumps({"issues": self.cache}))
-
-    def _clean_expired_entries(self, data):
+    def update_many(self, issues):
+        """Insert or replace the data of many issues, given by issue id, in one transaction"""
         now = time.time()
-        ttl = self.cache_ttl_days * 86400
-        old_count = len(data.get("issues", {}))
-        self.cache = {
-            key: value
-            for key, value in data.get("issues", {}).items()
-            if now - value.get("timestamp", 0) <= ttl
+        rows = [
+            (issue_id, json.dumps(data | {"timestamp": now}), now)
+            for issue_id, data in issues.items()
+        ]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    'INSERT INTO issues (key, data, timestamp) VALUES (?, ?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET data = excluded.data, '
+                    'timestamp = excluded.timestamp',
+                    rows,
+                )
+            self.stats['writes'] += len(rows)
+
+    def save(self):
+        """Kept for compatibility, entries are saved by :meth:`update`"""
+
+    def metrics(self):
+        """Return the hit rate and the age in seconds of the entries read by this process"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else None,
+            'age_mean': sum(self._ages) / len(self._ages) if self._ages else None,
+            'age_max': max(self._ages, default=None),
         }
-        logger.debug(f"Cleaned expired cache entries: {old_count} → {len(self.cache)}")
+
+    @property
+    def opened(self):
+        """Whether the database was used by this process"""
+        return self._connection is not None and self._pid == os.getpid()
+
+    def close(self):
+        with self._lock:
+            if self.opened:
+                self._connection.close()
+            self._connection = None
 
 
 # Create a global instance of JiraStatusCache
@@ -180,11 +285,12 @@ def try_from_cache(issue_id):
 CACHED_RESPONSES = defaultdict(dict)
 
 
-def _jira_client():
+def _jira_client(**kwargs):
     """Create a JIRA client with token auth (api_key)."""
     return JIRA(
         server=settings.jira.url,
         token_auth=settings.jira.api_key,
+        **kwargs,
     )
 
 
@@ -223,6 +329,168 @@ def get_jira(jql, fields=None):
         raise
 
 
+# Jira answers these with a transient error, the search is retried after a backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# number of follow-up rounds fetching the issues that fetched issues are duplicates of
+MAX_DUPLICATE_ROUNDS = 5
+
+
+def _key_jql(issue_ids):
+    return f"key in ({', '.join(issue_ids)})"
+
+
+def jql_batches(issue_ids, batch_size=None, max_length=None):
+    """Split issue ids into ``key in (...)`` queries bounded in number of ids and length
+
+    :param issue_ids: Jira issue ids, e.g: ['SAT-1', 'SAT-2']
+    :param batch_size: maximum number of ids per query, ``jira.batch_size`` by default
+    :param max_length: maximum length of a query, ``jira.max_jql_length`` by default
+    :returns: list of ``(issue_ids, jql)`` tuples
+    """
+    batch_size = batch_size or settings.jira.batch_size
+    max_length = max_length or settings.jira.max_jql_length
+    batches, batch = [], []
+    for issue_id in dict.fromkeys(issue_ids):
+        if batch and (len(batch) == batch_size or len(_key_jql([*batch, issue_id])) > max_length):
+            batches.append((batch, _key_jql(batch)))
+            batch = []
+        batch.append(issue_id)
+    if batch:
+        batches.append((batch, _key_jql(batch)))
+    return batches
+
+
+def _duplicate_of(issue):
+    """Return the key of the issue a Jira closed as duplicate duplicates, None otherwise"""
+    resolution = issue.fields.resolution.name if issue.fields.resolution else ''
+    if resolution != 'Duplicate':
+        return None
+    for link in getattr(issue.fields, 'issuelinks', None) or []:
+        if link.type.name == 'Duplicate' and hasattr(link, 'outwardIssue'):
+            return link.outwardIssue.key
+    return None
+
+
+def _search_with_retry(client, issue_ids, jql, fields):
+    """Search the issues of a batch, retrying transient errors with an exponential backoff
+
+    Jira rejects the whole query when one of the keys does not exist, such a batch is split in
+    halves until the unknown keys are isolated and skipped.
+    """
+    retries, backoff = settings.jira.fetch_retries, settings.jira.fetch_backoff
+    attempt = 0
+    while True:
+        try:
+            return list(client.search_issues(jql_str=jql, fields=fields, maxResults=len(issue_ids)))
+        except JIRAError as err:
+            status_code = getattr(err, 'status_code', None)
+            if status_code == 400:
+                if len(issue_ids) == 1:
+                    logger.warning(f'Jira rejected the query for {issue_ids[0]}: {err.text}')
+                    return []
+                half = len(issue_ids) // 2
+                return [
+                    issue
+                    for ids in (issue_ids[:half], issue_ids[half:])
+                    for issue in _search_with_retry(client, ids, _key_jql(ids), fields)
+                ]
+            if status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                raise
+            headers = getattr(err.response, 'headers', None) or {}
+            delay = float(headers.get('Retry-After') or backoff * 2**attempt)
+        except (RequestsConnectionError, Timeout) as err:
+            if attempt >= retries:
+                raise
+            delay = backoff * 2**attempt
+            logger.debug(f'Jira connection error: {err}')
+        attempt += 1
+        logger.warning(
+            f'Jira search of {len(issue_ids)} issues failed, retry {attempt}/{retries} '
+            f'in {delay:.1f}s'
+        )
+        time.sleep(delay)
+
+
+def fetch_jira_issues(issue_ids, jira_fields=None, workers=None):
+    """Fetch many issues from the Jira API in concurrent batched queries
+
+    Issue ids are split by :func:`jql_batches` and the batches searched by a pool of
+    ``jira.fetch_workers`` threads. Issues closed as duplicate get the data of the issue they
+    duplicate in ``dupe_data``, fetched in follow-up rounds of batched queries.
+
+    :param issue_ids: Jira issue ids, e.g: ['SAT-1', 'SAT-2']
+    :param jira_fields: fields of the returned issue data, ``common_jira_fields`` by default
+    :returns: dict of issue data by issue id, unknown issues are omitted. Moved or renamed
+        issues are found under both the requested id and their current ``key``.
+    :raises JIRAError: when a batch still fails after the retries
+    """
+    jira_fields = jira_fields or common_jira_fields
+    search_fields = ','.join(sorted({*jira_fields, 'resolution', 'issuelinks'}))
+    workers = workers or settings.jira.fetch_workers
+    local = threading.local()
+
+    def search(batch):
+        """Return the ``(requested id, issue)`` pairs found for a batch"""
+        # clients are not shared between threads, a requests session is not thread safe
+        if not hasattr(local, 'client'):
+            # retries are done by _search_with_retry, with the backoff of the settings
+            local.client = _jira_client(max_retries=0)
+        batch_ids, jql = batch
+        found = _search_with_retry(local.client, batch_ids, jql, search_fields)
+        keys = {issue.key for issue in found}
+        pairs = [(issue.key, issue) for issue in found if issue.key in batch_ids]
+        if missing := [issue_id for issue_id in batch_ids if issue_id not in keys]:
+            # Jira answers with the current key of moved or renamed issues, the requested id
+            # they match can only be told by searching them one by one
+            moved = [issue for issue in found if issue.key not in batch_ids]
+            if len(missing) == 1 and len(moved) == 1:
+                pairs.append((missing[0], moved[0]))
+            elif moved:
+                for issue_id in missing:
+                    single = _search_with_retry(
+                        local.client, [issue_id], _key_jql([issue_id]), search_fields
+                    )
+                    pairs.extend((issue_id, issue) for issue in single)
+        return pairs
+
+    issues, duplicate_of, moved_to = {}, {}, {}
+    pending = list(dict.fromkeys(issue_id.strip() for issue_id in issue_ids))
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jira') as executor:
+        for round_number in range(MAX_DUPLICATE_ROUNDS + 1):
+            if not pending:
+                break
+            batches = jql_batches(pending)
+            logger.debug(
+                f'Jira fetch round {round_number}: {len(pending)} issues in {len(batches)} batches'
+            )
+            for found in executor.map(search, batches):
+                for issue_id, issue in found:
+                    issues[issue.key] = _issue_to_flat_dict(issue, jira_fields)
+                    if issue_id != issue.key:
+                        moved_to[issue_id] = issue.key
+                    if dupe := _duplicate_of(issue):
+                        duplicate_of[issue.key] = dupe
+            pending = [
+                key
+                for key in dict.fromkeys(duplicate_of.values())
+                if key not in issues and key not in moved_to
+            ]
+    logger.debug(f'Fetched {len(issues)} Jira issues in {time.monotonic() - started:.2f}s')
+
+    def with_duplicates(key, seen):
+        data = dict(issues[key])
+        dupe = duplicate_of.get(key)
+        dupe = moved_to.get(dupe, dupe)
+        # duplicate chains Jira should not contain, like cycles, are cut
+        if dupe in issues and dupe not in seen:
+            data['dupe_data'] = with_duplicates(dupe, {*seen, dupe})
+        return data
+
+    fetched = {key: with_duplicates(key, {key}) for key in issues}
+    return fetched | {issue_id: fetched[key] for issue_id, key in moved_to.items()}
+
+
 def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no cover
     """Get a list of marked Jira data and query Jira REST API.
 
@@ -268,9 +536,7 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
         # Provide default data for collected Jira's.
         default_data = [get_default_jira(issue_id) for issue_id in remaining_issues]
         # Update cache with defaults
-        for issue in default_data:
-            jira_cache.update(issue['key'], issue)
-        jira_cache.save()
+        jira_cache.update_many({issue['key']: issue for issue in default_data})
 
         # Return combination of cached and default data
         return [
@@ -283,19 +549,14 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     for field in ('is_open', 'version'):
         assert field not in jira_fields
 
-    # Generate jql
     if isinstance(remaining_issues, str):
         remaining_issues = [issue_id.strip() for issue_id in remaining_issues.split(',')]
-    jql = ' OR '.join([f"id = {issue_id}" for issue_id in remaining_issues])
-    issues = get_jira(jql, jira_fields)
-    fetched_data = [
-        _issue_to_flat_dict(issue, jira_fields) for issue in issues if issue is not None
-    ]
+    fetched = fetch_jira_issues(remaining_issues, jira_fields)
+    fetched = {issue_id: fetched[issue_id] for issue_id in remaining_issues if issue_id in fetched}
+    fetched_data = list(fetched.values())
 
-    # Update cache with new data
-    for issue in fetched_data:
-        jira_cache.update(issue['key'], issue)
-    jira_cache.save()
+    # Update cache with new data, by requested id as the key of moved issues changed
+    jira_cache.update_many(fetched)
 
     # Combine cached and fetched data
     result_data = [
@@ -331,7 +592,7 @@ def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
                     try:
                         jira_data = get_data_jira([issue_id], cached_data)
                         jira_data = jira_data and jira_data[0]
-                    except TimedOutError:
+                    except (TimedOutError, JIRAError, RequestsConnectionError, Timeout):
                         logger.warning(
                             f"Failed to fetch data for {issue_id} after retries. Using default."
                         )
@@ -340,7 +601,6 @@ def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
                     # Update cache with new data if found
                     if jira_data:
                         jira_cache.update(issue_id, jira_data)
-                        jira_cache.save()
         except (KeyError, TypeError):
             # Return default if anything goes wrong
             jira_data = get_default_jira(issue_id)
@@ -0,0 +1,119 @@
+"""Usages of the ``is_open`` helper in test modules.
+
+The issue collection needs every ``is_open('SAT-123')`` call of the collected tests. Reading the
+source of every test item with ``inspect`` and matching it with regexes is repeated for each
+parametrized item and on every run, :func:`scan_source` instead parses a test module once and
+records the usages per function definition. :class:`IssueUsageIndex` keeps the result in the
+pytest cache, so unchanged test modules are not parsed again.
+"""
+
+import ast
+import inspect
+from pathlib import Path
+import re
+import time
+
+from robottelo.utils.metadata_index import FileIndex
+
+COMPONENT = re.compile(
+    # To match :CaseComponent: FooBar
+    r'\s*:CaseComponent:\s*(?P<component>\S*)',
+    re.IGNORECASE,
+)
+
+
+def _issue_argument(node):
+    """Return the issue passed to an ``is_open`` call node, None for other calls"""
+    func = node.func
+    name = func.id if isinstance(func, ast.Name) else getattr(func, 'attr', None)
+    if name != 'is_open' or not node.args:
+        return None
+    arg = node.args[0]
+    if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and arg.value.strip():
+        return arg.value.strip()
+    return None
+
+
+class _UsageVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.functions = {}
+        self.module = []
+        self._scopes = []
+        self._functions = []
+        self._negated = set()
+
+    def _visit_scope(self, node, is_function):
+        self._scopes.append(node.name)
+        qualname = '.'.join(self._scopes)
+        if is_function:
+            self._functions.append(qualname)
+            self.functions.setdefault(qualname, [])
+            # nested definitions are qualified like python does, e.g. test.<locals>.helper
+            self._scopes.append('<locals>')
+        self.generic_visit(node)
+        if is_function:
+            self._scopes.pop()
+            self._functions.pop()
+        self._scopes.pop()
+
+    def visit_ClassDef(self, node):
+        self._visit_scope(node, is_function=False)
+
+    def visit_FunctionDef(self, node):
+        self._visit_scope(node, is_function=True)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not) and isinstance(node.operand, ast.Call):
+            self._negated.add(id(node.operand))
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if issue := _issue_argument(node):
+            usage = ['not is_open' if id(node) in self._negated else 'is_open', issue, node.lineno]
+            self.module.append(usage)
+            # the source of a function includes its decorators and nested definitions
+            for qualname in self._functions:
+                self.functions[qualname].append(usage)
+        self.generic_visit(node)
+
+
+def scan_source(source):
+    """Return the ``is_open`` usages of a module source
+
+    :return: a dictionary with ``functions``, the usages of each function by qualified name,
+        ``module``, all the usages of the module, and ``component``, the first ``:CaseComponent:``
+        token of the module. Usages are ``[usage, issue, lineno]`` lists, where usage is either
+        ``is_open`` or ``not is_open``.
+    """
+    visitor = _UsageVisitor()
+    if 'is_open(' in source:
+        visitor.visit(ast.parse(source))
+    component = COMPONENT.search(source)
+    return {
+        'functions': {name: usages for name, usages in visitor.functions.items() if usages},
+        'module': visitor.module,
+        'component': component.group('component') if component else None,
+    }
+
+
+class IssueUsageIndex(FileIndex):
+    """``is_open`` usages of test modules, parsed once per module"""
+
+    # bump when the stored usages change, to discard shards of previous versions
+    version = 1
+
+    def module_usages(self, path):
+        """Return the result of :func:`scan_source` for the module at ``path``"""
+        started = time.perf_counter()
+        try:
+            return self.entry(Path(path), lambda path: scan_source(path.read_text()))['data']
+        finally:
+            self.stats['seconds'] += time.perf_counter() - started
+
+    def function_usages(self, function):
+        """Return the ``[usage, issue, lineno]`` usages found in the source of a function"""
+        function = inspect.unwrap(function)
+        usages = self.module_usages(function.__code__.co_filename)
+        return usages['functions'].get(function.__qualname__, [])
@@ -0,0 +1,210 @@
+"""Persistent index of the testimony tokens found in test docstrings.
+
+Parsing the docstrings of the function, class and module of every collected test is repeated on
+every run and by every xdist worker. :class:`MetadataIndex` keeps the parsed tokens of each test
+function in one JSON shard per test file, stored with the file modification time, size and
+content digest. A shard is reused as long as the file is unchanged, so only changed files are
+parsed again.
+"""
+
+from collections import Counter
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import re
+import time
+from uuid import uuid4
+
+# bump when the regexes or the stored tokens change, to discard shards of previous versions
+INDEX_VERSION = 2
+
+component_regex = re.compile(
+    # To match :CaseComponent: FooBar
+    r'\s*:CaseComponent:\s*(?P<component>\S*)',
+    re.IGNORECASE,
+)
+
+importance_regex = re.compile(
+    # To match :CaseImportance: Critical
+    r'\s*:CaseImportance:\s*(?P<importance>\S*)',
+    re.IGNORECASE,
+)
+
+team_regex = re.compile(
+    # To match :Team: Rocket
+    r'\s*:Team:\s*(?P<team>\S*)',
+    re.IGNORECASE,
+)
+
+blocked_by_regex = re.compile(
+    # To match :BlockedBy: SAT-32932
+    r'\s*:BlockedBy:\s*(?P<blocked_by>.*\S*)',
+    re.IGNORECASE,
+)
+
+verifies_regex = re.compile(
+    # To match :Verifies: SAT-32932
+    r'\s*:Verifies:\s*(?P<verifies>.*\S*)',
+    re.IGNORECASE,
+)
+
+
+def parse_tokens(docstring):
+    """Return the testimony tokens of a docstring as a dictionary, absent tokens are omitted
+
+    ``component``, ``importance`` and ``team`` are the first lowercased value found,
+    ``verifies`` and ``blocked_by`` the list of issues of the last occurrence.
+    """
+    tokens = {}
+    for name, regex in (
+        ('component', component_regex),
+        ('importance', importance_regex),
+        ('team', team_regex),
+    ):
+        if found := regex.findall(docstring):
+            tokens[name] = found[0].lower()
+    for name, regex in (('verifies', verifies_regex), ('blocked_by', blocked_by_regex)):
+        if found := regex.findall(docstring):
+            tokens[name] = [issue.strip() for issue in found[-1].split(',')]
+    return tokens
+
+
+def item_docstrings(item):
+    """Return the docstrings of the function, class and module of a test item, smallest first"""
+    return [
+        doc
+        for doc in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
+        if doc is not None
+    ]
+
+
+def _file_digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class FileIndex:
+    """Data derived from source files, persisted in one JSON shard per file in ``directory``
+
+    A shard is reused while the file modification time and size are unchanged, or its content
+    digest when only the modification time changed. Without a directory the index only lives for
+    the current process.
+    """
+
+    # bump in subclasses when the stored data changes, to discard shards of previous versions
+    version = 1
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else None
+        self.stats = Counter()
+        self._files = {}
+        self._dirty = set()
+
+    def _shard(self, path):
+        return self.directory / f'{hashlib.sha1(str(path).encode()).hexdigest()}.json'
+
+    def _read_shard(self, path):
+        if self.directory is None:
+            return None
+        try:
+            entry = json.loads(self._shard(path).read_text())
+        except (OSError, ValueError):
+            return None
+        if entry.get('version') != self.version or entry.get('path') != str(path):
+            return None
+        return entry
+
+    def entry(self, path, build):
+        """Return the index entry of a file, rebuilt with ``build(path)`` if the file changed
+
+        ``build`` returns the data to store, a JSON serializable dictionary, available under the
+        ``data`` key of the entry.
+        """
+        if path in self._files:
+            return self._files[path]
+        stat = path.stat()
+        entry = self._read_shard(path)
+        if entry and (entry['mtime_ns'], entry['size']) != (stat.st_mtime_ns, stat.st_size):
+            # touched by a checkout or a rebase, only the content matters
+            if entry['sha256'] == _file_digest(path):
+                entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+                self._dirty.add(path)
+            else:
+                entry = None
+        if entry:
+            self.stats['files_reused'] += 1
+        else:
+            self.stats['files_parsed'] += 1
+            entry = {
+                'version': self.version,
+                'path': str(path),
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': _file_digest(path),
+                'data': build(path),
+            }
+            self._dirty.add(path)
+        self._files[path] = entry
+        return entry
+
+    def mark_dirty(self, path):
+        """Save the entry of ``path`` again, after its data was extended"""
+        self._dirty.add(path)
+
+    def save(self):
+        """Write the shards of the files parsed since the index was loaded"""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self._dirty:
+            shard = self._shard(path)
+            # xdist workers write the same shards, a reader must never see a partial one
+            tmp = shard.with_name(f'.{shard.name}.{uuid4().hex}.tmp')
+            tmp.write_text(json.dumps(self._files[path]))
+            os.replace(tmp, shard)
+        self._dirty.clear()
+
+
+class MetadataIndex(FileIndex):
+    """Testimony tokens of test items, parsed once per test function"""
+
+    version = INDEX_VERSION
+
+    @staticmethod
+    def _is_indexable(item):
+        """Whether every docstring of the item comes from the test file itself
+
+        Docstrings inherited from classes defined elsewhere can change without the test file
+        changing, the tokens of such items are not indexed.
+        """
+        module_name = item.module.__name__
+        if item.function.__module__ != module_name:
+            return False
+        cls = getattr(item, 'cls', None)
+        return cls is None or all(
+            base.__module__ in (module_name, 'builtins') for base in cls.__mro__
+        )
+
+    def tokens(self, item):
+        """Return the tokens of the function, class and module docstrings of a test item
+
+        The list follows the docstrings order of :func:`item_docstrings`, smallest scope first.
+        """
+        started = time.perf_counter()
+        try:
+            if not self._is_indexable(item):
+                self.stats['items_not_indexed'] += 1
+                return [parse_tokens(doc) for doc in item_docstrings(item)]
+            path = Path(item.module.__file__)
+            nodes = self.entry(path, lambda path: {})['data']
+            # a test inherited by several classes has one function but different class docstrings
+            cls = getattr(item, 'cls', None)
+            key = f'{cls.__qualname__ if cls else ""}::{item.function.__qualname__}'
+            if key not in nodes:
+                nodes[key] = [parse_tokens(doc) for doc in item_docstrings(item)]
+                self.mark_dirty(path)
+            self.stats['items'] += 1
+            return nodes[key]
+        finally:
+            self.stats['seconds'] += time.perf_counter() - started
@@ -0,0 +1,155 @@
+"""Lightweight latency histograms that can be merged across xdist workers.
+
+A :class:`MetricsRegistry` groups :class:`Histogram` objects by a key (e.g. a hammer
+``command_base command_sub``) and a metric name (e.g. ``exec``). Registries are exported to plain
+dictionaries, which makes them JSON serializable and easy to send from xdist workers to the
+controller through ``workeroutput``, where they are merged with :meth:`MetricsRegistry.merge`.
+"""
+
+from collections import defaultdict
+import json
+import math
+import threading
+
+# upper bounds of the histogram buckets, in seconds for timings
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900)
+# upper bounds of the buckets for sizes, in characters or bytes
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+
+class Histogram:
+    """A fixed bucket histogram keeping count, sum, min and max"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        # the last bucket collects everything above the highest bound
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value):
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), -1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket it falls in"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'min': round(self.min, 6) if self.count else None,
+            'max': round(self.max, 6) if self.count else None,
+            'mean': round(self.total / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'bounds': list(self.bounds),
+            'buckets': self.counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(buckets=data['bounds'])
+        hist.counts = list(data['buckets'])
+        hist.count = data['count']
+        hist.total = data['sum']
+        if hist.count:
+            hist.min, hist.max = data['min'], data['max']
+        return hist
+
+    def update(self, other):
+        """Add the observations of another histogram with the same bounds"""
+        if other.bounds != self.bounds:
+            raise ValueError('Can not merge histograms with different buckets')
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class MetricsRegistry:
+    """Thread safe collection of histograms grouped by key and metric name"""
+
+    def __init__(self, buckets=None):
+        # metric name -> bucket bounds, for metrics not measured in seconds
+        self.buckets = buckets or {}
+        self._lock = threading.Lock()
+        self._data = defaultdict(dict)
+
+    def _histogram(self, key, metric):
+        metrics = self._data[key]
+        if metric not in metrics:
+            metrics[metric] = Histogram(self.buckets.get(metric, DEFAULT_BUCKETS))
+        return metrics[metric]
+
+    def observe(self, key, metric, value):
+        with self._lock:
+            self._histogram(key, metric).observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __bool__(self):
+        return bool(self._data)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                key: {metric: hist.to_dict() for metric, hist in metrics.items()}
+                for key, metrics in self._data.items()
+            }
+
+    def update(self, data):
+        """Merge an exported registry dictionary into this registry"""
+        with self._lock:
+            for key, metrics in data.items():
+                for metric, hist_data in metrics.items():
+                    hist = Histogram.from_dict(hist_data)
+                    if metric in self._data[key]:
+                        self._data[key][metric].update(hist)
+                    else:
+                        self._data[key][metric] = hist
+
+    @classmethod
+    def merge(cls, *exports):
+        """Return a new registry combining several exported registry dictionaries"""
+        merged = cls()
+        for data in exports:
+            merged.update(data)
+        return merged
+
+    def top(self, metric, count=10):
+        """Return the ``count`` keys with the highest total for ``metric``, with that total"""
+        with self._lock:
+            totals = [
+                (key, metrics[metric].total, metrics[metric].count)
+                for key, metrics in self._data.items()
+                if metric in metrics
+            ]
+        return sorted(totals, key=lambda item: item[1], reverse=True)[:count]
+
+    def dump(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True))
+
+
+# timings of hammer commands executed by robottelo.cli.base.Base, keyed by
+# "<command_base> <command_sub>"
+hammer_metrics = MetricsRegistry(buckets={'output_size': SIZE_BUCKETS})
@@ -0,0 +1,176 @@
+"""Read-through cache for idempotent Satellite queries made during a test session.
+
+Lookups like the default organization or location are repeated by many fixtures, modules and
+xdist workers. With ``performance.query_cache.enabled``, :class:`QueryCache` keeps their results
+per Satellite hostname for ``performance.query_cache.ttl`` seconds, and with
+``performance.query_cache.shared`` also in the ``func_shared`` storage (file or redis), so a
+result computed by one worker is reused by the others.
+
+Only cache queries whose results writes invalidate through tags. Facts of the host itself, like
+its version, change with upgrades and reinstalls of a host keeping its hostname, and are kept by
+the host instance instead.
+
+Entries are content addressed: the key is a digest of the Satellite, the query name, its arguments
+and the current generation of every resource tag the query reads. Writes made through
+``cli_factory``/``api_factory`` invalidate the tags of the resources they change by renewing
+their generation, which makes every dependent key unreachable without having to enumerate them.
+
+Usage::
+
+    orgs = sat.query_cache.get('org', search_orgs, name, tags=('organization',))
+    sat.query_cache.invalidate('organization')
+"""
+
+from collections import Counter
+import functools
+import hashlib
+import json
+import threading
+import time
+from uuid import uuid4
+
+from robottelo.config import settings
+from robottelo.logging import logger
+
+KEY_PREFIX = 'query_cache'
+# generation tag included in every tagged key, renewed by writes of unknown scope
+ANY_RESOURCE = '*'
+
+
+class QueryCache:
+    """Per Satellite read-through cache with TTL, tag invalidation and hit/miss counters
+
+    :param namespace: the Satellite hostname, the cache is not shared between Satellites
+    :param storage: a ``func_shared`` storage handler to share entries between processes
+    :param scope: the ``func_shared`` scope, so sessions don't share entries through the storage
+    """
+
+    def __init__(self, namespace, ttl=None, storage=None, scope=None):
+        self.namespace = namespace
+        self.scope = scope
+        self.ttl = ttl
+        self.storage = storage
+        self.stats = Counter()
+        self._entries = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _digest(self, *parts):
+        data = json.dumps([self.scope, self.namespace, *parts], sort_keys=True, default=str)
+        return f'{KEY_PREFIX}_{hashlib.sha256(data.encode()).hexdigest()}'
+
+    def _generation(self, tag):
+        """Return the current generation of a tag, from the shared storage when available"""
+        generation = None
+        if self.storage is not None:
+            generation = self.storage.get(self._digest('generation', tag))
+        return self._generations.get(tag, 0) if generation is None else generation
+
+    def key(self, name, args=(), kwargs=None, tags=()):
+        tags = sorted({*tags, ANY_RESOURCE}) if tags else []
+        generations = [self._generation(tag) for tag in tags]
+        return self._digest(name, args, kwargs or {}, tags, generations)
+
+    def get(self, name, func, *args, ttl=None, tags=(), shared=True, **kwargs):
+        """Return ``func(*args, **kwargs)``, computing it only if not cached yet
+
+        :param name: the query name, together with the arguments it identifies the result
+        :param ttl: seconds the result stays valid, the cache default when None
+        :param tags: resources the query reads, writes to them invalidate the result
+        :param shared: share the result through the storage, it must be json serializable
+        """
+        if settings.performance.query_cache.enabled is not True:
+            self.stats['bypassed'] += 1
+            return func(*args, **kwargs)
+        key = self.key(name, args, kwargs, tags)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and (entry['expires'] is None or entry['expires'] > now):
+            self.stats['hits'] += 1
+            return entry['value']
+        if shared and self.storage is not None:
+            entry = self.storage.get(key)
+            if entry and (entry['expires'] is None or entry['expires'] > now):
+                self.stats['shared_hits'] += 1
+                with self._lock:
+                    self._entries[key] = entry
+                return entry['value']
+        self.stats['misses'] += 1
+        value = func(*args, **kwargs)
+        ttl = self.ttl if ttl is None else ttl
+        entry = {'value': value, 'expires': None if ttl is None else time.time() + ttl}
+        with self._lock:
+            self._entries[key] = entry
+        if shared and self.storage is not None:
+            self.storage.set(key, entry)
+        return value
+
+    def invalidate(self, *tags):
+        """Invalidate the results reading any of ``tags``, or every tagged result without tags"""
+        self.stats['invalidations'] += 1
+        for tag in tags or (ANY_RESOURCE,):
+            generation = uuid4().hex
+            self._generations[tag] = generation
+            if self.storage is not None:
+                self.storage.set(self._digest('generation', tag), generation)
+
+    def clear(self):
+        """Forget the results cached by this process"""
+        with self._lock:
+            self._entries.clear()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _shared_storage():
+    """Return the configured ``func_shared`` storage handler and scope, None if it can't be used"""
+    from robottelo.utils.decorators.func_shared import shared
+
+    try:
+        # reading the scope loads the storage configuration
+        scope = shared._get_default_scope()
+        return shared._get_default_storage_handler(), scope
+    except Exception as err:  # storage backends fail in many ways, sharing is best effort
+        logger.warning(f'Query cache is not shared, the storage is not available: {err}')
+        return None, None
+
+
+def get_cache(hostname):
+    """Return the query cache of the Satellite ``hostname``, created on first use"""
+    with _caches_lock:
+        if hostname not in _caches:
+            storage = scope = None
+            if settings.performance.query_cache.shared is True:
+                storage, scope = _shared_storage()
+            _caches[hostname] = QueryCache(
+                hostname, ttl=settings.performance.query_cache.ttl, storage=storage, scope=scope
+            )
+        return _caches[hostname]
+
+
+def stats():
+    """Return the counters of every query cache of this process, summed"""
+    with _caches_lock:
+        return dict(sum((cache.stats for cache in _caches.values()), Counter()))
+
+
+def invalidates(*tags):
+    """Decorate a factory method writing to ``self._satellite`` to invalidate ``tags`` after it
+
+    Without tags every tagged result of the Satellite is invalidated.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                get_cache(self._satellite.hostname).invalidate(*tags)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,127 @@
+"""Redis primitives to coordinate processes running on several machines.
+
+They back the ``redis`` backends of :mod:`robottelo.utils.shared_resource` and
+:mod:`robottelo.utils.decorators.func_locker`, so that test runners sharding one Satellite across
+several controller machines can wait on each other. The connection is configured by the
+``shared_function.redis_*`` settings, shared with the redis storage of ``func_shared``.
+"""
+
+import os
+import socket
+import time
+from uuid import uuid4
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from robottelo.config import settings
+from robottelo.logging import logger
+
+
+def get_client():
+    """Return a redis client configured from the ``shared_function`` settings"""
+    if redis is None:
+        raise ImportError('The redis package is required by the redis coordination backends')
+    return redis.StrictRedis(
+        host=settings.shared_function.redis_host,
+        port=settings.shared_function.redis_port,
+        db=settings.shared_function.redis_db,
+        password=settings.shared_function.redis_password,
+    )
+
+
+def process_id():
+    """Identify the current process across machines"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class RedisWatcher:
+    """Wait for messages published on a redis channel
+
+    The channel is subscribed on creation, nothing published afterwards is missed.
+    """
+
+    def __init__(self, client, channel):
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+
+    def wait(self, timeout):
+        """Block up to ``timeout`` seconds, or until a message is published"""
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            if self._pubsub.get_message(timeout=remaining) is not None:
+                return
+
+    def close(self):
+        self._pubsub.close()
+
+
+class RedisLock:
+    """Mutual exclusion on a redis key
+
+    The lock is taken with an atomic ``SET NX`` and released with a ``WATCH`` guarded delete,
+    so only its owner can release it. Waiters are woken up through pub/sub when it is released
+    instead of polling. With ``expire`` the key expires after that many seconds, so a crashed
+    owner can't keep it forever.
+
+    :param timeout: seconds to wait for the lock, forever when None
+    """
+
+    # upper bound of a wait for a release notification, in case the owner died silently
+    RECHECK_INTERVAL = 5
+
+    def __init__(self, client, key, timeout=None, expire=None):
+        self.client = client
+        self.key = key
+        self.channel = f'{key}:released'
+        self.timeout = timeout
+        self.expire = expire
+        self.token = None
+
+    def owner(self):
+        """Return the process id of the current owner, None if the lock is free"""
+        value = self.client.get(self.key)
+        return value.decode().rsplit(':', 1)[0] if value else None
+
+    def acquire(self):
+        """Wait for the lock, return False if it could not be taken within the timeout"""
+        token = f'{process_id()}:{uuid4().hex}'
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        watcher = RedisWatcher(self.client, self.channel)
+        try:
+            while not self.client.set(self.key, token, nx=True, ex=self.expire):
+                remaining = self.RECHECK_INTERVAL
+                if deadline is not None:
+                    remaining = min(deadline - time.monotonic(), remaining)
+                    if remaining <= 0:
+                        return False
+                watcher.wait(remaining)
+        finally:
+            watcher.close()
+        self.token = token
+        return True
+
+    def release(self):
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(self.key)
+                if pipe.get(self.key) == self.token.encode():
+                    pipe.multi()
+                    pipe.delete(self.key)
+                    pipe.publish(self.channel, 'released')
+                    pipe.execute()
+                else:
+                    logger.warning(f'Lock {self.key} expired before being released')
+            except redis.WatchError:
+                logger.warning(f'Lock {self.key} expired and was taken over before being released')
+        self.token = None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise TimeoutError(f'Timeout while waiting for lock {self.key}')
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -1,7 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+
 import requests
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from robottelo.config import settings
+from robottelo.config import robottelo_tmp_dir, settings
 from robottelo.logging import logger
 
 
@@ -27,12 +35,24 @@ class ReportPortal:
     statuses = ['FAILED', 'PASSED', 'SKIPPED', 'INTERRUPTED', 'IN_PROGRESS']
     importance_levels = ['Low', 'Medium', 'High', 'Critical', 'Fips']
 
-    def __init__(self, rp_url=None, rp_api_key=None, rp_project=None):
-        """initiate report portal properties"""
+    def __init__(self, rp_url=None, rp_api_key=None, rp_project=None, cache_dir=None):
+        """initiate report portal properties
+
+        :param cache_dir: Directory of the launch cache, ``report_portal.cache_dir`` by default.
+            Without it, the launch cache is disabled if ``report_portal.launch_cache`` is false.
+        """
         self.rp_url = rp_url or settings.report_portal.portal_url
         self.rp_project = rp_project or settings.report_portal.project
         self.rp_api_key = rp_api_key or settings.report_portal.api_key
         self.rp_project_settings = None
+        self.cache_dir = None
+        if cache_dir is not None or settings.report_portal.launch_cache is True:
+            self.cache_dir = Path(
+                cache_dir
+                or settings.report_portal.cache_dir
+                or Path(robottelo_tmp_dir, 'report_portal_launches')
+            )
+        self._local = threading.local()
 
         # fetch the project settings
         settings_req = requests.get(
@@ -105,20 +125,53 @@ class ReportPortal:
         stop=stop_after_attempt(6),
         wait=wait_fixed(10),
     )
-    def get_tests(self, launch=None, **test_args):
+    def _get_items_page(self, params, page):
+        """Return the JSON body of one page of test items"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            # a session per fetching thread, to reuse its connection for the following pages
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+            session.verify = False
+        resp = session.get(url=f'{self.api_url}/item', params={**params, 'page.page': page})
+        resp.raise_for_status()
+        return resp.json()
+
+    def _launch_cache_file(self, launch, params):
+        """Return the cache file of the test items of a launch fetched with the given filters
+
+        Only finished launches are cached. The last modification time of the launch is part of the
+        key, as analyzing its failures changes their defect types.
+        """
+        if self.cache_dir is None or launch.get('status') in ('IN_PROGRESS', None):
+            return None
+        key = json.dumps(
+            {'params': params, 'modified': launch.get('lastModified'), 'url': self.api_url},
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return self.cache_dir.joinpath(str(launch['id']), f'{digest}.json')
+
+    def get_tests(self, launch=None, page_size=None, workers=None, **test_args):
         """Returns tests data customized by kwargs parameters.
 
         This is a main function that will be called to retrieve the tests data
         of a particular test status or/and defect_type
 
+        The first page of test items tells the number of pages, the other pages are fetched
+        concurrently. The test items of a finished launch are cached on disk by launch id.
+
         :param str launch: Dict of a target launch to fetch test items for
+        :param int page_size: Number of test items per page, ``report_portal.page_size`` by default
+        :param int workers: Number of pages fetched at the same time,
+            ``report_portal.fetch_workers`` by default
         :param dict test_args: apply the given filters and their values to the search request
         :returns dict: All filtered tests dict based on params data keyed by test name and test
             properties as value, in format -
             ```{'test_name1':test1_properties_dict, 'test_name2':test2_properties_dict}```
         """
         params = {
-            'page.size': 50,
+            'page.size': page_size or settings.report_portal.page_size,
             'page.sort': 'name',
             'filter.eq.launchId': launch["id"],
             'filter.ne.type': "SUITE",
@@ -137,30 +190,39 @@ class ReportPortal:
             params['filter.has.attributeKey'] = 'team'
             params['filter.has.attributeValue'] = test_args['team']
 
-        # send HTTP request to RP API, retrieve the paginated results and join them together
-        page = 1
-        total_pages = 1
-        resp_tests = []
-        while page <= total_pages:
-            logger.debug(page)
-            params['page.page'] = page
-            resp = requests.get(
-                url=f'{self.api_url}/item',
-                headers=self.headers,
-                params=params,
-                verify=False,
-            )
-            resp.raise_for_status()
-            resp_tests.extend(resp.json()['content'])
-            total_pages = resp.json()['page']['totalPages']
-            page += 1
+        cache_file = self._launch_cache_file(launch, params)
+        if cache_file is not None and cache_file.exists():
+            logger.debug(f'Using the cached test items of launch {launch["id"]}: {cache_file}')
+            resp_tests = json.loads(cache_file.read_text())
+        else:
+            # send HTTP requests to RP API, the first page tells how many pages there are
+            first_page = self._get_items_page(params, 1)
+            total_pages = first_page['page']['totalPages']
+            pages = [first_page['content']]
+            if total_pages > 1:
+                workers = min(workers or settings.report_portal.fetch_workers, total_pages - 1)
+                logger.debug(
+                    f'Fetching {total_pages} pages of launch {launch["id"]} with {workers} workers'
+                )
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rp') as executor:
+                    # map keeps the pages in order
+                    pages.extend(
+                        page['content']
+                        for page in executor.map(
+                            partial(self._get_items_page, params), range(2, total_pages + 1)
+                        )
+                    )
+            resp_tests = [test for page in pages for test in page]
+            if cache_file is not None:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+                tmp_file.write_text(json.dumps(resp_tests))
+                tmp_file.replace(cache_file)
 
         # Only select tests matching the supplied paths. This is a workaround for RP API limitation
         # - unable to combine multiple filters of a same type
-        if test_args.get('paths'):
+        if paths := test_args.get('paths'):
             resp_tests = [
-                test
-                for test in resp_tests
-                if any([path for path in test_args['paths'] if path in test['name']])
+                test for test in resp_tests if any(path in test['name'] for path in paths)
             ]
         return resp_tests
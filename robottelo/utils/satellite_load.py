@@ -0,0 +1,351 @@
+"""Load of the Satellites shared by the xdist workers, for the ``least-loaded`` xdist behavior.
+
+Every worker publishes a record in a store shared with the other workers, and with the workers
+of the other test runners using the same Satellites: the Satellite it uses, the number of tests
+it is running on it and a moving average of the latency it observed on every Satellite. The
+store is a directory with a JSON file per worker, or a redis hash when
+``robottelo.shared_resource_backend`` is ``redis``.
+
+The latency is the duration of :func:`probe_latency`, a cheap API call made to every Satellite
+before each pick. The durations of the hammer and API calls of the tests are not used, they
+depend on the command more than on the load of the Satellite.
+
+At the start of the session and of every test module, :meth:`SatelliteLoad.pick` moves the
+worker to the Satellite with the lowest ``(active tests + 1) * relative latency``, staying on the
+current one unless another one is less loaded. Picks are serialized by a lock in the store. The
+worker keeps a timeline of its tests and of the latency it observed, the xdist controller merges
+them with :func:`utilization_timeline`.
+"""
+
+from contextlib import nullcontext
+import hashlib
+from itertools import pairwise
+import json
+from pathlib import Path
+import statistics
+import time
+from uuid import uuid4
+
+from broker.helpers import FileLock
+import requests
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils import redis_coordination
+
+# records of workers which did not update them for this long are ignored, e.g. crashed workers
+RECORD_TTL = 7200
+# answered with the version of the application, no backend service is checked
+PROBE_PATH = '/api/status'
+
+_tracker = None
+
+
+class FileLoadStore:
+    """Keeps the worker records in a directory, one JSON file per worker"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def lock(self):
+        return FileLock(self.directory.joinpath('pick'))
+
+    def read(self):
+        records = {}
+        for path in self.directory.glob('*.json'):
+            try:
+                records[path.stem] = json.loads(path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                # removed or replaced while listing the directory
+                continue
+        return records
+
+    def write(self, worker, record):
+        path = self.directory.joinpath(f'{worker}.json')
+        tmp_file = path.with_name(f'{path.name}.{uuid4().hex}.tmp')
+        tmp_file.write_text(json.dumps(record))
+        tmp_file.replace(path)
+
+    def delete(self, worker):
+        self.directory.joinpath(f'{worker}.json').unlink(missing_ok=True)
+
+
+class RedisLoadStore:
+    """Keeps the worker records in a redis hash"""
+
+    def __init__(self, name, client=None):
+        self.client = client or redis_coordination.get_client()
+        self.key = f'robottelo:satellite_load:{name}'
+
+    def lock(self):
+        return redis_coordination.RedisLock(self.client, f'{self.key}:lock', timeout=60, expire=60)
+
+    def read(self):
+        return {
+            worker.decode(): json.loads(record)
+            for worker, record in self.client.hgetall(self.key).items()
+        }
+
+    def write(self, worker, record):
+        with self.client.pipeline() as pipe:
+            pipe.hset(self.key, worker, json.dumps(record))
+            pipe.expire(self.key, RECORD_TTL)
+            pipe.execute()
+
+    def delete(self, worker):
+        self.client.hdel(self.key, worker)
+
+
+def get_store(hostnames):
+    """Return the store shared by the workers using the same Satellites"""
+    name = hashlib.sha256(','.join(sorted(hostnames)).encode()).hexdigest()[:12]
+    if settings.robottelo.shared_resource_backend == 'redis':
+        return RedisLoadStore(name)
+    return FileLoadStore(f'/tmp/robottelo_satellite_load_{name}')
+
+
+class SatelliteLoad:
+    """The Satellite of an xdist worker, picked by the load of all the workers
+
+    :param hostnames: the Satellites to pick from
+    :param worker_id: the xdist worker id, made unique across machines
+    :param latency_weight: weight of the last observation in the latency moving average
+    :param probe: returns the latency of a Satellite in seconds, or None, called for every
+        Satellite before a pick, see :func:`probe_latency`
+    """
+
+    def __init__(self, hostnames, worker_id, store=None, latency_weight=0.3, probe=None):
+        self.hostnames = list(hostnames)
+        self.probe = probe
+        self.worker = f'{redis_coordination.process_id()}:{worker_id}'.replace('/', '_')
+        self.worker_id = worker_id
+        self.store = store or get_store(self.hostnames)
+        self.latency_weight = latency_weight
+        self.hostname = None
+        #: the Satellite of the session fixtures, set by ``align_to_satellite``
+        self.session_hostname = None
+        self.active = 0
+        self.latency = {}
+        #: ``[timestamp, event, hostname, value]``, events are start, end, latency and pick
+        self.events = []
+
+    def _record(self):
+        return {
+            'hostname': self.hostname,
+            'active': self.active,
+            'latency': self.latency,
+            'updated': time.time(),
+        }
+
+    def _publish(self):
+        self.store.write(self.worker, self._record())
+
+    def load(self):
+        """Return the workers, active tests and mean latency of every Satellite
+
+        The record of this worker is left out, the load is the one it would move to.
+        """
+        now = time.time()
+        load = {hostname: {'workers': 0, 'active': 0, 'latency': []} for hostname in self.hostnames}
+        for worker, record in self.store.read().items():
+            if worker == self.worker or now - record.get('updated', 0) > RECORD_TTL:
+                continue
+            if (hostname := record.get('hostname')) in load:
+                load[hostname]['workers'] += 1
+                load[hostname]['active'] += record.get('active', 0)
+            for hostname, latency in record.get('latency', {}).items():
+                if hostname in load:
+                    load[hostname]['latency'].append(latency)
+        for hostname, latency in self.latency.items():
+            if hostname in load:
+                load[hostname]['latency'].append(latency)
+        for value in load.values():
+            value['latency'] = statistics.mean(value['latency']) if value['latency'] else None
+        return load
+
+    @staticmethod
+    def scores(load):
+        """Return the score of every Satellite, the lowest is the least loaded
+
+        A worker between two tests counts as one active test, it is about to run the next one.
+        """
+        known = [value['latency'] for value in load.values() if value['latency']]
+        reference = statistics.median(known) if known else None
+        scores = {}
+        for hostname, value in load.items():
+            relative = value['latency'] / reference if value['latency'] and reference else 1
+            scores[hostname] = (max(value['active'], value['workers']) + 1) * relative
+        return scores
+
+    def pick(self):
+        """Move to the least loaded Satellite and return its hostname"""
+        if self.probe is not None and len(self.hostnames) > 1:
+            # probed outside of the lock, the other workers do not wait for the network
+            for hostname in self.hostnames:
+                if (seconds := self.probe(hostname)) is not None:
+                    self.observe_latency(hostname, seconds)
+        # a single worker picks at a time, so two idle workers do not pile onto one Satellite
+        with self.store.lock() if len(self.hostnames) > 1 else nullcontext():
+            load = self.load()
+            scores = self.scores(load)
+            best = min(self.hostnames, key=lambda hostname: scores[hostname])
+            if self.hostname is None or scores[best] < scores[self.hostname]:
+                if best != self.hostname:
+                    logger.info(
+                        f'worker_id={self.worker_id}: moving from {self.hostname} to the least '
+                        f'loaded Satellite {best}, load: {load}'
+                    )
+                    self.events.append([time.time(), 'pick', best, scores[best]])
+                self.hostname = best
+            self._publish()
+        return self.hostname
+
+    def stay(self, hostname):
+        """Move to ``hostname`` without looking at the load, e.g. for the session fixtures"""
+        if hostname != self.hostname:
+            self.events.append([time.time(), 'pick', hostname, None])
+            self.hostname = hostname
+            self._publish()
+        return self.hostname
+
+    def test_started(self):
+        self.active += 1
+        self.events.append([time.time(), 'start', self.hostname, self.active])
+        self._publish()
+
+    def test_finished(self):
+        self.active = max(self.active - 1, 0)
+        now = time.time()
+        self.events.append([now, 'end', self.hostname, self.active])
+        if (latency := self.latency.get(self.hostname)) is not None:
+            self.events.append([now, 'latency', self.hostname, latency])
+        self._publish()
+
+    def observe_latency(self, hostname, seconds):
+        """Add a probe duration to the latency average of a Satellite
+
+        The average is published with the next test start or end, and added to the timeline at
+        the end of the test.
+        """
+        if hostname not in self.hostnames:
+            return
+        previous = self.latency.get(hostname)
+        if previous is not None:
+            seconds = self.latency_weight * seconds + (1 - self.latency_weight) * previous
+        self.latency[hostname] = round(seconds, 4)
+
+    def close(self):
+        self.store.delete(self.worker)
+
+
+def start(hostnames, worker_id):
+    """Start tracking the load of the Satellites for this worker, return its tracker"""
+    global _tracker
+    _tracker = SatelliteLoad(
+        hostnames,
+        worker_id,
+        latency_weight=settings.performance.satellite_load.latency_weight,
+        probe=probe_latency,
+    )
+    return _tracker
+
+
+def get_tracker():
+    """Return the tracker of this worker, None unless the xdist behavior is ``least-loaded``"""
+    return _tracker
+
+
+def stop():
+    """Remove the record of this worker, its tracker is kept for the session report"""
+    if _tracker is not None:
+        _tracker.close()
+
+
+def probe_latency(hostname, timeout=10):
+    """Return the seconds a Satellite takes to answer a cheap API call, None when it fails"""
+    started = time.monotonic()
+    try:
+        requests.get(
+            f'https://{hostname}{PROBE_PATH}',
+            auth=(settings.server.admin_username, settings.server.admin_password),
+            verify=settings.server.verify_ca,
+            timeout=timeout,
+        )
+    except requests.RequestException as err:
+        logger.debug(f'Latency probe of {hostname} failed: {err}')
+        return None
+    return round(time.monotonic() - started, 4)
+
+
+def pinned_modules(items):
+    """Return the modules of the tests which must stay on the Satellite of the session
+
+    They use a session fixture depending on ``_default_sat``, e.g. an organization created on
+    the first Satellite of the worker, so the worker can not move to another Satellite for them.
+    """
+    depends = {'_default_sat': True}
+
+    def depends_on_default_sat(name, fixturedefs):
+        if name not in depends:
+            depends[name] = False
+            definitions = fixturedefs.get(name) or ()
+            depends[name] = any(
+                depends_on_default_sat(argname, fixturedefs)
+                for definition in definitions
+                for argname in definition.argnames
+            )
+        return depends[name]
+
+    modules = set()
+    for item in items:
+        fixturedefs = getattr(getattr(item, '_fixtureinfo', None), 'name2fixturedefs', {})
+        for name, definitions in fixturedefs.items():
+            if name in ('_default_sat', 'align_to_satellite'):
+                continue
+            if definitions[-1].scope == 'session' and depends_on_default_sat(name, fixturedefs):
+                modules.add(item.nodeid.split('::', 1)[0])
+                break
+    return modules
+
+
+def utilization_timeline(events, started=None):
+    """Merge the events of the workers into a timeline per Satellite
+
+    :param events: the ``events`` of the trackers of all the workers
+    :returns dict: ``{hostname: [[seconds since start, active tests, mean latency], ...]}``
+    """
+    events = sorted(events)
+    started = started if started is not None else (events[0][0] if events else 0)
+    active = {}
+    latency = {}
+    timeline = {}
+    for timestamp, event, hostname, value in events:
+        if event == 'start':
+            active[hostname] = active.get(hostname, 0) + 1
+        elif event == 'end':
+            active[hostname] = max(active.get(hostname, 0) - 1, 0)
+        elif event == 'latency':
+            latency[hostname] = value
+        else:
+            continue
+        timeline.setdefault(hostname, []).append(
+            [round(timestamp - started, 3), active.get(hostname, 0), latency.get(hostname)]
+        )
+    return timeline
+
+
+def utilization_summary(timeline):
+    """Return the busy seconds, peak active tests and last latency of every Satellite"""
+    summary = {}
+    for hostname, samples in timeline.items():
+        busy = 0
+        for (timestamp, active, _), (next_timestamp, _, _) in pairwise(samples):
+            busy += active * (next_timestamp - timestamp)
+        latencies = [sample[2] for sample in samples if sample[2] is not None]
+        summary[hostname] = {
+            'test_seconds': round(busy, 3),
+            'peak_active': max(sample[1] for sample in samples),
+            'latency': latencies[-1] if latencies else None,
+        }
+    return summary
@@ -14,6 +14,13 @@ recoverable, the main watcher will fail and release all other processes.
 It is recommended to use this class as a context manager, as it will automatically register and
 report when the process is done.
 
+Waiting processes poll the file by default. With ``robottelo.shared_resource_backend`` set to
+``inotify`` they are instead woken up by the kernel as soon as the file is written, the poll
+intervals only remain as an upper bound. Set to ``redis``, the status is kept in the redis server
+of the ``shared_function`` settings instead of a file, so processes on several machines can
+share a resource, and they are woken up through redis pub/sub. Each process logs how long after a
+phase transition it noticed it.
+
 Example:
     >>> with SharedResource("target_sat.hostname", upgrade_action, **upgrade_kwargs) as resource:
     ...     # Do pre-upgrade setup steps
@@ -22,10 +29,13 @@ Example:
     ...     # Do post-upgrade cleanup steps if any
 """
 
+import ctypes
 import datetime
 import json
 import os
 from pathlib import Path
+import select
+import struct
 import time
 from uuid import uuid4
 
@@ -33,12 +43,163 @@ from broker.helpers import FileLock
 from wait_for import wait_for
 
 from robottelo.config import settings
+from robottelo.utils import redis_coordination
 
 
 class SharedResourceError(Exception):
     """An exception class for SharedResource errors."""
 
 
+class ResourceWatcher:
+    """Waits for changes of a shared resource file by sleeping, i.e. polling."""
+
+    def __init__(self, resource_file):
+        self.resource_file = resource_file
+
+    def wait(self, timeout):
+        """Blocks up to ``timeout`` seconds, or less if the resource file may have changed."""
+        time.sleep(timeout)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(ResourceWatcher):
+    """Wakes up as soon as the shared resource file is written, using Linux inotify.
+
+    The parent directory is watched, so the creation, rewrite and removal of the file are all
+    seen. Events are queued from the creation of the watcher, a change happening between a
+    status check and the following ``wait`` is never missed.
+    """
+
+    # IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE, writes are complete when seen
+    EVENTS = 0x008 | 0x080 | 0x100 | 0x200
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, resource_file):
+        super().__init__(resource_file)
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self._fd, bytes(resource_file.parent), self.EVENTS) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f'inotify_add_watch failed for {resource_file.parent}')
+        self._name = os.fsencode(resource_file.name)
+
+    def _changed(self):
+        """Consumes the queued events, returns whether one of them is about the resource file."""
+        changed = False
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return False
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            changed |= data[offset : offset + length].rstrip(b'\0') == self._name
+            offset += length
+        return changed
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable or self._changed():
+                return
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class FileResourceStore:
+    """Keeps the shared resource status in a JSON file."""
+
+    def __init__(self, resource_file):
+        self.resource_file = resource_file
+        self.lock = FileLock(resource_file)
+
+    def exists(self):
+        return self.resource_file.exists()
+
+    def read(self):
+        return json.loads(self.resource_file.read_text())
+
+    def write(self, data):
+        """Replaces the resource file at once, so readers never see a partial write."""
+        tmp_file = self.resource_file.with_name(f"{self.resource_file.name}.{uuid4().hex}.tmp")
+        tmp_file.write_text(json.dumps(data, indent=4))
+        tmp_file.replace(self.resource_file)
+
+    def delete(self):
+        self.resource_file.unlink()
+
+    def watcher(self):
+        return get_watcher(self.resource_file)
+
+
+class RedisResourceStore:
+    """Keeps the shared resource status in redis, every change is published on the same key.
+
+    A missing status raises FileNotFoundError, like the file store does.
+    """
+
+    # a status left behind by a crashed run must not be picked up by the next ones
+    TTL = 86400
+
+    def __init__(self, resource_name, client=None):
+        self.client = client or redis_coordination.get_client()
+        self.key = f"robottelo:shared_resource:{resource_name}"
+        self.lock = redis_coordination.RedisLock(
+            self.client, f"{self.key}:lock", timeout=60, expire=60
+        )
+
+    def exists(self):
+        return bool(self.client.exists(self.key))
+
+    def read(self):
+        value = self.client.get(self.key)
+        if value is None:
+            raise FileNotFoundError(f"Shared resource {self.key} not found in redis")
+        return json.loads(value)
+
+    def write(self, data):
+        with self.client.pipeline() as pipe:
+            pipe.set(self.key, json.dumps(data), ex=self.TTL)
+            pipe.publish(self.key, "changed")
+            pipe.execute()
+
+    def delete(self):
+        with self.client.pipeline() as pipe:
+            pipe.delete(self.key)
+            pipe.publish(self.key, "changed")
+            pipe.execute()
+
+    def watcher(self):
+        return redis_coordination.RedisWatcher(self.client, self.key)
+
+
+def get_store(resource_name):
+    """Returns the resource store selected by ``robottelo.shared_resource_backend``."""
+    if settings.robottelo.shared_resource_backend == "redis":
+        return RedisResourceStore(resource_name)
+    return FileResourceStore(Path(f"/tmp/{resource_name}.shared"))
+
+
+def get_watcher(resource_file):
+    """Returns the resource watcher selected by ``robottelo.shared_resource_backend``."""
+    if settings.robottelo.shared_resource_backend == 'inotify':
+        try:
+            return InotifyWatcher(resource_file)
+        except (AttributeError, OSError) as err:  # not on Linux, or out of inotify watches
+            SharedResource.log(f'inotify is not available, polling instead: {err}', 'WARNING')
+    return ResourceWatcher(resource_file)
+
+
 class SharedResource:
     """A class representing a shared resource.
 
@@ -48,7 +209,7 @@ class SharedResource:
         action_kwargs (dict): The keyword arguments to be passed to the action function.
         action_is_recoverable (bool): Whether the action is recoverable or not.
         id (str): The unique identifier of the shared resource.
-        resource_file (Path): The path to the file representing the shared resource.
+        store (FileResourceStore | RedisResourceStore): Where the resource status is kept.
         is_main (bool): Whether the current instance is the main watcher or not.
         is_recovering (bool): Whether the current instance is recovering from an error or not.
     """
@@ -72,8 +233,7 @@ class SharedResource:
             action_validator (function): The function to validate the action results.
             action_kwargs (dict): The keyword arguments to be passed to the action function.
         """
-        self.resource_file = Path(f"/tmp/{resource_name}.shared")
-        self.lock_file = FileLock(self.resource_file)
+        self.store = get_store(resource_name)
         self.id = str(uuid4().fields[-1])
         self.action = action
         self.action_validator = action_validator
@@ -83,7 +243,16 @@ class SharedResource:
         self.is_recovering = False
         self.retries = retries
         self.delay = delay
+        self._watcher = None
 
+    @property
+    def watcher(self):
+        """The resource watcher, created on first use so every later change is seen."""
+        if self._watcher is None:
+            self._watcher = self.store.watcher()
+        return self._watcher
+
+    @staticmethod
     def log(message, level="DEBUG"):
         """Pytest has a limitation to use logging.logger from conftest.py
         so we need to emulate the logger by std-out the output
@@ -102,11 +271,12 @@ class SharedResource:
         Args:
             status (str): The new status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
+        with self.store.lock:
+            curr_data = self.store.read()
             curr_data["statuses"][self.id] = status
+            curr_data["statuses_updated"] = time.time()
             self.log(f"Updating watcher status to {status}")
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+            self.store.write(curr_data)
 
     def _update_main_status(self, status):
         """Updates the main status of the shared resource.
@@ -114,10 +284,11 @@ class SharedResource:
         Args:
             status (str): The new main status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
+        with self.store.lock:
+            curr_data = self.store.read()
             curr_data["main_status"] = status
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+            curr_data["main_status_updated"] = time.time()
+            self.store.write(curr_data)
 
     def _check_all_status(self, status):
         """Checks if all watchers have the specified status.
@@ -128,12 +299,20 @@ class SharedResource:
         Returns:
             bool: True if all watchers have the specified status, False otherwise.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            for watcher_id in curr_data["watchers"]:
-                if curr_data["statuses"].get(watcher_id) != status:
-                    return False
-            return True
+        # no lock needed to read, the status is always replaced at once
+        curr_data = self.store.read()
+        for watcher_id in curr_data["watchers"]:
+            if curr_data["statuses"].get(watcher_id) != status:
+                return False
+        return True
+
+    def _log_transition(self, phase, updated):
+        """Logs how long after a phase transition, at ``updated`` epoch time, it was noticed."""
+        if updated is not None:
+            self.log(
+                f"{os.environ.get('PYTEST_XDIST_WORKER')} noticed {phase} "
+                f"{time.time() - updated:.3f}s after the transition"
+            )
 
     def _wait_for_status(self, status):
         """Waits until all watchers have the specified status.
@@ -141,42 +320,47 @@ class SharedResource:
         Args:
             status (str): The status to wait for.
         """
+        watcher = self.watcher
         while not self._check_all_status(status):
             if status == "done":
                 self.log("Main worker still waiting for all workers to report status 'done'.")
-            time.sleep(1)
+            watcher.wait(1)
+        curr_data = self.store.read()
+        self._log_transition(f"all watchers {status}", curr_data.get("statuses_updated"))
 
     def _wait_for_main_watcher(self):
         """Waits for the main watcher to finish."""
+        watcher = self.watcher
         while True:
-            curr_data = json.loads(self.resource_file.read_text())
+            curr_data = self.store.read()
             if curr_data["main_status"] == "error":
                 raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
             if curr_data["main_status"] == "action_error":
                 self._try_take_over()
             elif curr_data["main_status"] != "done":
-                time.sleep(settings.robottelo.shared_resource_wait)
+                watcher.wait(settings.robottelo.shared_resource_wait)
             else:
+                self._log_transition("main status done", curr_data.get("main_status_updated"))
                 self.log("Main status now done, breaking wait loop")
                 break
 
     def _try_take_over(self):
         """Tries to take over as the main watcher."""
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
+        with self.store.lock:
+            curr_data = self.store.read()
             if curr_data["main_status"] in ("action_error", "error"):
                 curr_data["main_status"] = "recovering"
                 curr_data["main_watcher"] = self.id
-                self.resource_file.write_text(json.dumps(curr_data, indent=4))
+                self.store.write(curr_data)
                 self.is_main = True
                 self.is_recovering = True
         self.wait()
 
     def register(self):
         """Registers the current process as a watcher."""
-        with self.lock_file:
-            if self.resource_file.exists():
-                curr_data = json.loads(self.resource_file.read_text())
+        with self.store.lock:
+            if self.store.exists():
+                curr_data = self.store.read()
                 self.is_main = False
             else:  # First watcher to register, becomes the main watcher, and creates the file
                 curr_data = {
@@ -188,18 +372,18 @@ class SharedResource:
                 self.is_main = True
             curr_data["watchers"].append(self.id)
             curr_data["statuses"][self.id] = "pending"
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+            self.store.write(curr_data)
 
     def unregister(self):
         """Unregisters the current process as a watcher."""
         self.log(f"Unregistering {os.environ.get('PYTEST_XDIST_WORKER')}")
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
+        with self.store.lock:
+            curr_data = self.store.read()
             self.log("Removing watcher ID from resource file")
             curr_data["watchers"].remove(self.id)
             del curr_data["statuses"][self.id]
             self.log("Writing new resource file")
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+            self.store.write(curr_data)
 
     def ready(self):
         """Marks the current process as ready to perform the action."""
@@ -221,7 +405,7 @@ class SharedResource:
         except Exception as err:
             if not self.action_is_recoverable:
                 self._update_main_status("error")
-                self.resource_file.unlink()
+                self.store.delete()
                 raise SharedResourceError('Main worker failed during action') from err
             self._update_main_status('action_error')
             raise SharedResourceError('Recoverable failures in main worker') from err
@@ -251,6 +435,14 @@ class SharedResource:
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Marks the current process as done and updates the main watcher if needed."""
+        try:
+            self._exit(exc_type, exc_value)
+        finally:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    def _exit(self, exc_type, exc_value):
         try:
             self.unregister()
         except Exception as e:
@@ -267,18 +459,23 @@ class SharedResource:
             raise exc_value
         if exc_type is None:
             self.log('Setting status to done')
-            self.done()
+            try:
+                self.done()
+            except FileNotFoundError:
+                # already unregistered, the main watcher may have finished and removed the file
+                if self.is_main:
+                    raise
             if self.is_main:
                 self._wait_for_status("done")
                 self.log("All workers done, removing resource file")
-                self.resource_file.unlink()
+                self.store.delete()
         else:
             self._update_status("error")
             if self.is_main:
                 if self._check_all_status("error"):
                     # All have failed, delete the file
                     self.log("All workers FAILED, removing resource file")
-                    self.resource_file.unlink()
+                    self.store.delete()
                 else:
                     self.log("Setting main status to ERROR")
                     self._update_main_status("error")
@@ -0,0 +1,231 @@
+"""Wait for many Foreman tasks with a single search per tick.
+
+Polling tasks with ``ForemanTask.poll()`` takes one request per task every poll, one task after
+another. The :class:`TaskWatcher` of a Satellite instead keeps the set of tasks waited for by
+all the threads of the process, and refreshes all of them with one ``id ^ (...)`` search per
+tick in a background thread. Ticks come every ``min_interval`` seconds while tasks progress, and
+back off up to ``max_interval`` seconds while none of them changes.
+
+Every watched task gets a :class:`~concurrent.futures.Future`, resolved with the task entity
+once the task is stopped or paused. The future raises ``TaskFailedError`` when the task did not
+succeed and ``must_succeed`` is set, and ``TaskTimedOutError`` after its timeout, like
+``ForemanTask.poll()``.
+
+The time spent blocked in :meth:`TaskWatcher.wait_for` is added up per test, see
+:func:`wait_times`, and written to ``logs/task_waits.json`` by ``pytest_plugins.task_watcher``.
+
+Usage::
+
+    tasks = sat.api.ForemanTask().search(query={'search': 'label = Actions::Katello::...'})
+    sat.task_watcher.wait_for(tasks, timeout=600)
+    future = sat.task_watcher.watch(task_id)
+"""
+
+from collections import defaultdict
+from concurrent.futures import Future, wait
+import os
+import threading
+import time
+
+from nailgun.entity_mixins import TaskFailedError, TaskTimedOutError
+
+from robottelo.config import settings
+from robottelo.logging import logger
+
+FINISHED_STATES = ('paused', 'stopped')
+# nailgun.entity_mixins.TASK_TIMEOUT
+DEFAULT_TIMEOUT = 300
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+_wait_times = defaultdict(float)
+_wait_times_lock = threading.Lock()
+
+
+def current_test():
+    """Return the node id of the running test, None outside of a test"""
+    if current := os.environ.get('PYTEST_CURRENT_TEST'):
+        return current.rsplit(' ', 1)[0]
+    return None
+
+
+def _field(task, name):
+    return task.get(name) if isinstance(task, dict) else getattr(task, name, None)
+
+
+class _Watch:
+    def __init__(self, must_succeed, timeout, max_interval):
+        self.future = Future()
+        self.must_succeed = must_succeed
+        self.deadline = time.monotonic() + timeout
+        self.max_interval = max_interval
+        self.progress = None
+
+
+class TaskWatcher:
+    """Foreman tasks of a Satellite waited for by the threads of this process
+
+    :param search: called with a search query, returns the matching tasks, e.g. nailgun
+        ``ForemanTask`` entities
+    :param min_interval: seconds between ticks while the tasks progress
+    :param max_interval: seconds between ticks once backed off
+    :param backoff: factor applied to the interval after a tick without any change
+    :param chunk_size: number of tasks refreshed by one search
+    """
+
+    def __init__(self, search, min_interval=1, max_interval=30, backoff=1.5, chunk_size=50):
+        self._search = search
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self._watches = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._interval = min_interval
+        self.stats = defaultdict(float)
+
+    def watch(self, task, must_succeed=True, timeout=None, max_interval=None):
+        """Start watching a task and return the future of its final state
+
+        :param task: a task entity or id
+        :param timeout: seconds after which the future raises ``TaskTimedOutError``
+        :param max_interval: longest time between two refreshes of this task
+        """
+        task_id = str(_field(task, 'id') if not isinstance(task, str | int) else task)
+        with self._lock:
+            if task_id in self._watches:
+                return self._watches[task_id].future
+            watch = _Watch(must_succeed, timeout or DEFAULT_TIMEOUT, max_interval)
+            self._watches[task_id] = watch
+            self.stats['tasks'] += 1
+            # a new task may finish quickly, stop backing off
+            self._interval = self.min_interval
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='task_watcher', daemon=True)
+                self._thread.start()
+        return watch.future
+
+    def wait_for(self, tasks, must_succeed=True, timeout=None, max_interval=None):
+        """Wait until all the tasks are finished and return them, in the order of ``tasks``
+
+        :raises TaskFailedError: after all the tasks finished, for the first failed task
+        :raises TaskTimedOutError: for the first task not finished in ``timeout`` seconds
+        """
+        started = time.monotonic()
+        futures = [
+            self.watch(task, must_succeed=must_succeed, timeout=timeout, max_interval=max_interval)
+            for task in tasks
+        ]
+        try:
+            wait(futures)
+        finally:
+            waited = time.monotonic() - started
+            with self._lock:
+                self.stats['wait_seconds'] += waited
+            _add_wait_time(waited)
+            logger.debug(f'Waited {waited:.1f}s for {len(futures)} tasks')
+        return [future.result() for future in futures]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+                task_ids = list(self._watches)
+                caps = [w.max_interval for w in self._watches.values() if w.max_interval]
+            changed = self._tick(task_ids)
+            with self._lock:
+                if changed:
+                    self._interval = self.min_interval
+                else:
+                    self._interval = min(self._interval * self.backoff, self.max_interval)
+                interval = min([self._interval, *caps])
+            time.sleep(interval)
+
+    def _tick(self, task_ids):
+        """Refresh the watched tasks, resolve the finished ones, return True if any changed"""
+        changed = False
+        found = {}
+        for start in range(0, len(task_ids), self.chunk_size):
+            chunk = task_ids[start : start + self.chunk_size]
+            self.stats['searches'] += 1
+            try:
+                tasks = self._search(f'id ^ ({",".join(chunk)})')
+            except Exception as err:
+                self.stats['search_errors'] += 1
+                logger.warning(f'Failed to search {len(chunk)} watched tasks: {err}')
+                continue
+            found.update((str(_field(task, 'id')), task) for task in tasks)
+        now = time.monotonic()
+        with self._lock:
+            for task_id in task_ids:
+                watch = self._watches[task_id]
+                task = found.get(task_id)
+                if task is not None:
+                    progress = (_field(task, 'state'), _field(task, 'progress'))
+                    changed |= progress != watch.progress
+                    watch.progress = progress
+                if task is not None and progress[0] in FINISHED_STATES:
+                    del self._watches[task_id]
+                    if _field(task, 'result') == 'success' or not watch.must_succeed:
+                        self.stats['succeeded'] += 1
+                        watch.future.set_result(task)
+                    else:
+                        self.stats['failed'] += 1
+                        watch.future.set_exception(
+                            TaskFailedError(
+                                f'Task {task_id} did not succeed. Task information: '
+                                f'{_task_info(task)}'
+                            )
+                        )
+                elif now > watch.deadline:
+                    del self._watches[task_id]
+                    self.stats['timed_out'] += 1
+                    watch.future.set_exception(
+                        TaskTimedOutError(
+                            f'Timed out polling task {task_id}. Task information: '
+                            f'{_task_info(task) if task is not None else None}'
+                        )
+                    )
+        return changed
+
+
+def _task_info(task):
+    if isinstance(task, dict):
+        return task
+    return {
+        name: getattr(task, name, None)
+        for name in ('id', 'label', 'state', 'result', 'progress', 'humanized')
+    }
+
+
+def get_watcher(satellite):
+    """Return the task watcher of a Satellite, shared by all the threads of the process"""
+    with _watchers_lock:
+        if satellite.hostname not in _watchers:
+            _watchers[satellite.hostname] = TaskWatcher(
+                lambda search: satellite.api.ForemanTask().search(
+                    query={
+                        'search': search,
+                        'per_page': settings.performance.task_watcher.chunk_size,
+                    }
+                ),
+                min_interval=settings.performance.task_watcher.min_interval,
+                max_interval=settings.performance.task_watcher.max_interval,
+                backoff=settings.performance.task_watcher.backoff,
+                chunk_size=settings.performance.task_watcher.chunk_size,
+            )
+        return _watchers[satellite.hostname]
+
+
+def _add_wait_time(seconds):
+    with _wait_times_lock:
+        _wait_times[current_test()] += seconds
+
+
+def wait_times():
+    """Return the seconds spent waiting for tasks, by test node id (None outside of tests)"""
+    with _wait_times_lock:
+        return dict(_wait_times)
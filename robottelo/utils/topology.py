@@ -0,0 +1,204 @@
+"""Check out the hosts of a test environment at the same time.
+
+A :class:`Topology` declares the hosts an environment needs, e.g. a Satellite, a Capsule and two
+content hosts of different RHEL versions, as :class:`Member` objects with their broker arguments.
+:meth:`Topology.deploy` checks out every host in its own thread and retries the failed checkouts
+one host at a time, so a Satellite and its content hosts are provisioned in the time of the
+slowest one instead of back to back. Once all of them arrived, the ``wire`` callback connects
+them, e.g. registers the Capsule to the Satellite.
+
+Usage::
+
+    topology = Topology(
+        'capsule_lb',
+        [
+            Member('satellite', Satellite, sat_deploy_args),
+            Member('capsule', Capsule, cap_deploy_args),
+        ],
+        wire=lambda hosts: hosts['capsule'][0].capsule_setup(sat_host=hosts['satellite'][0]),
+    )
+    with topology.deploy() as hosts:
+        sat, cap = hosts['satellite'][0], hosts['capsule'][0]
+
+The ``topology_factory`` fixture builds the members from the deploy settings, and configures
+the capsules with the first satellite, the satellite side one capsule at a time.
+
+The checkout, wiring and ready times of every deployed topology are kept in :func:`reports`,
+which ``pytest_plugins.topology`` writes to ``logs/topology.json``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import threading
+import time
+
+from broker import Broker
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.host_group import HostGroup
+
+_reports = []
+_reports_lock = threading.Lock()
+
+
+class Member:
+    """Hosts of a topology checked out with the same broker arguments
+
+    :param name: name of the hosts in the topology, e.g. ``satellite`` or ``rhel9``
+    :param host_class: class of the hosts, e.g. :class:`~robottelo.hosts.Satellite`
+    :param deploy_kwargs: broker arguments of the checkout
+    :param count: number of hosts
+    :param setup: called with every host once checked out, before the wiring
+    """
+
+    def __init__(self, name, host_class, deploy_kwargs, count=1, setup=None):
+        self.name = name
+        self.host_class = host_class
+        self.deploy_kwargs = dict(deploy_kwargs)
+        self.count = count
+        self.setup = setup
+
+    def __repr__(self):
+        return f'<Member {self.name} x{self.count}>'
+
+
+class Topology:
+    """Hosts of a test environment, see the module documentation
+
+    :param name: name of the topology in the reports
+    :param members: the :class:`Member` of every kind of host
+    :param wire: called with the hosts by member name once all of them arrived
+    :param retry_limit: checkout attempts of every host
+    :param delay: seconds between the attempts of a host
+    :param max_workers: number of hosts checked out at the same time, defaults to
+        ``performance.topology.max_workers``
+    """
+
+    def __init__(self, name, members, wire=None, retry_limit=3, delay=300, max_workers=None):
+        self.name = name
+        self.members = list(members)
+        self.wire = wire
+        self.retry_limit = retry_limit
+        self.delay = delay
+        self.max_workers = max_workers or settings.performance.topology.max_workers
+        self.report = None
+
+    def _checkout(self, member):
+        return Broker(**member.deploy_kwargs, host_class=member.host_class).checkout()
+
+    def _checkin(self, hosts):
+        Broker(hosts=hosts).checkin()
+
+    def _checkout_host(self, member, record):
+        """Check out a host of a member with its own retries, filling its report record"""
+        started = time.monotonic()
+        while True:
+            record['attempts'] += 1
+            try:
+                host = self._checkout(member)
+                break
+            except Exception as err:
+                if record['attempts'] >= self.retry_limit:
+                    record['seconds'] = round(time.monotonic() - started, 3)
+                    record['error'] = repr(err)
+                    raise
+                logger.warning(
+                    f'{self.name}: checkout of {member.name} #{record["index"]} failed, attempt '
+                    f'{record["attempts"]} of {self.retry_limit}: {err}'
+                )
+                time.sleep(self.delay)
+        record['hostname'] = host.hostname
+        if member.setup is not None:
+            try:
+                member.setup(host)
+            except Exception as err:
+                record['error'] = repr(err)
+                self._checkin([host])
+                raise
+        record['seconds'] = round(time.monotonic() - started, 3)
+        return host
+
+    def checkout(self):
+        """Check out every host at the same time and wire them together
+
+        When a host can not be checked out in ``retry_limit`` attempts, the other hosts are
+        checked in and its last error is raised.
+
+        :return dict: the hosts of every member, by member name
+        """
+        started = time.monotonic()
+        jobs = [
+            (member, {'member': member.name, 'index': index, 'attempts': 0, 'hostname': None})
+            for member in self.members
+            for index in range(member.count)
+        ]
+        workers = max(min(self.max_workers, len(jobs)), 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='topology') as executor:
+            futures = [executor.submit(self._checkout_host, *job) for job in jobs]
+        hosts = {member.name: [] for member in self.members}
+        errors = []
+        for (member, _), future in zip(jobs, futures, strict=True):
+            if err := future.exception():
+                errors.append(err)
+            else:
+                hosts[member.name].append(future.result())
+        records = [record for _, record in jobs]
+        checked_out = time.monotonic()
+        self.report = {
+            'name': self.name,
+            'hosts': records,
+            'checkout_seconds': round(checked_out - started, 3),
+            'slowest_host_seconds': max(
+                (record.get('seconds', 0) for record in records), default=0
+            ),
+        }
+        try:
+            if errors:
+                raise errors[0]
+            if self.wire is not None:
+                self.wire(hosts)
+        except Exception as err:
+            self.report['error'] = repr(err)
+            _add_report(self.report)
+            if arrived := [host for member_hosts in hosts.values() for host in member_hosts]:
+                self._checkin(arrived)
+            raise
+        ready = time.monotonic()
+        self.report['wire_seconds'] = round(ready - checked_out, 3)
+        self.report['ready_seconds'] = round(ready - started, 3)
+        _add_report(self.report)
+        logger.info(
+            f'Topology {self.name} ready in {self.report["ready_seconds"]:.0f}s: '
+            f'{self.report["checkout_seconds"]:.0f}s of checkout, '
+            f'{self.report["wire_seconds"]:.0f}s of wiring'
+        )
+        return hosts
+
+    def checkin(self, hosts):
+        """Tear down every host at the same time and check them in"""
+        hosts = [host for member_hosts in hosts.values() for host in member_hosts]
+        try:
+            HostGroup(hosts, max_workers=self.max_workers).teardown()
+        finally:
+            self._checkin(hosts)
+
+    @contextmanager
+    def deploy(self):
+        """Check out the hosts, yield them by member name and check them in"""
+        hosts = self.checkout()
+        try:
+            yield hosts
+        finally:
+            self.checkin(hosts)
+
+
+def _add_report(report):
+    with _reports_lock:
+        _reports.append(report)
+
+
+def reports():
+    """Return the reports of the topologies deployed by this process"""
+    with _reports_lock:
+        return list(_reports)
@@ -0,0 +1,56 @@
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "click",
+# ]
+# ///
+"""Compare cold and warm collection times of the testimony token metadata index
+
+The index stored in the pytest cache is removed before the cold run, the warm run then reuses
+it. The wall time of each ``pytest --collect-only`` run is reported along with the collection
+log line of ``pytest_plugins.metadata_markers`` describing the index usage.
+"""
+
+from pathlib import Path
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+import click
+
+INDEX_DIR = Path('.pytest_cache', 'd', 'metadata_index')
+LOG_FILE = Path('logs', 'robottelo.log')
+
+
+def collect(paths):
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-m', 'pytest', '--collect-only', '-q', *paths],
+        check=True,
+        capture_output=True,
+    )
+    elapsed = time.perf_counter() - started
+    report = ''
+    if LOG_FILE.exists():
+        lines = re.findall(r'Testimony tokens of .*', LOG_FILE.read_text())
+        report = lines[-1] if lines else ''
+    return elapsed, report
+
+
+@click.command()
+@click.argument('paths', nargs=-1)
+def benchmark(paths):
+    """Collect PATHS (tests/foreman by default) with a cold, then a warm metadata index"""
+    paths = paths or ('tests/foreman',)
+    shutil.rmtree(INDEX_DIR, ignore_errors=True)
+    for run in ('cold', 'warm'):
+        elapsed, report = collect(paths)
+        click.echo(f'{run}: collected in {elapsed:.2f}s')
+        if report:
+            click.echo(f'    {report}')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,251 @@
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "click",
+# ]
+# ///
+"""Benchmark the hammer output parsers on large synthetic outputs
+
+Compares the previous whole-output ``parse_csv``/``parse_json`` implementations with the
+current ones and with the streaming ``iter_csv``/``iter_json`` parsers fed in ssh sized chunks,
+and the previous ``parse_info`` state machine with the current one on the recorded
+``hammer <entity> info`` corpus and on a large synthetic content view info output. The best wall
+time and the peak memory allocated while parsing are reported.
+"""
+
+import csv
+import io
+import json
+from pathlib import Path
+import re
+import time
+import tracemalloc
+
+import click
+
+from robottelo.cli import hammer
+
+COLUMNS = ['Id', 'Name', 'Operating System', 'Host Group', 'IPv4', 'MAC', 'Global Status']
+
+
+def legacy_parse_csv(output):
+    output = output.splitlines()
+    keys = [header.replace(' ', '-').lower() for header in next(csv.reader(output))]
+    return [value for value in csv.DictReader(output[1:], fieldnames=keys)]
+
+
+def _legacy_normalize_obj(obj):
+    if isinstance(obj, dict):
+        return {k.replace(' ', '-').lower(): _legacy_normalize_obj(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_legacy_normalize_obj(v) for v in obj]
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        return str(obj)
+    return obj
+
+
+def legacy_parse_json(stdout):
+    return _legacy_normalize_obj(json.loads(stdout))
+
+
+def legacy_parse_info(output):
+    """``parse_info`` before it was rewritten, comments stripped, kept as the baseline"""
+
+    def level(line):
+        spaces = 0
+        if len(line) >= 4:
+            for char in line:
+                if char not in (' ', '\t'):
+                    break
+                spaces += 4 if char == '\t' else 1
+        return spaces // 4 + (1 if spaces % 4 > 0 else 0)
+
+    contents = {}
+    sub_prop = sub_num = second_level_key = None
+    for line in output.splitlines():
+        if line == '' or line == '---':
+            continue
+        current_indent_level = level(line)
+        if current_indent_level <= 1:
+            second_level_key = None
+        if line.startswith(' '):
+            if line.find(':') != -1 and line.find('::') == -1:
+                key, value = line.lstrip().split(":", 1)
+            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
+                key, value = line.lstrip().split(" =>", 1)
+            else:
+                key = value = None
+            if key is None and value is None:
+                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
+                if match is None:
+                    match = re.match(r'(.*)$', line.lstrip())
+                value = match.group(1)
+                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
+                    contents[sub_prop] = []
+                    contents[sub_prop].append(value)
+                elif isinstance(contents[sub_prop], list):
+                    contents[sub_prop].append(value)
+                else:
+                    last_key = list(contents[sub_prop].keys())[-1]
+                    if not contents[sub_prop][last_key]:
+                        contents[sub_prop][last_key] = [value]
+                    else:
+                        contents[sub_prop][last_key].append(value)
+            else:
+                starts_with_number = re.match(r'(\d+)\)', key)
+                if starts_with_number:
+                    if current_indent_level >= 2:
+                        continue
+                    sub_num = int(starts_with_number.group(1))
+                    if sub_num == 1:
+                        contents[sub_prop] = []
+                    key = re.sub(r'\d+\)', '', key)
+                    contents[sub_prop].append({})
+                key = key.lstrip().replace(' ', '-').lower()
+                value = value.lstrip()
+                if sub_num is not None:
+                    contents[sub_prop][-1][key] = value
+                else:
+                    if current_indent_level == 2 and second_level_key:
+                        if not contents[sub_prop][second_level_key]:
+                            contents[sub_prop][second_level_key] = {}
+                        contents[sub_prop][second_level_key][key] = value
+                    else:
+                        contents[sub_prop][key] = value
+                    if current_indent_level == 1 and not value:
+                        second_level_key = key
+        else:
+            sub_num = None
+            key, value = line.lstrip().split(":", 1)
+            key = key.lstrip().replace(' ', '-').lower()
+            if value.lstrip() == '':
+                sub_prop = key
+                contents[sub_prop] = {}
+            else:
+                contents[key] = value.lstrip()
+    return contents
+
+
+def generate_rows(count):
+    for index in range(count):
+        yield [
+            index,
+            f'host-{index:08d}.example.com',
+            'RedHat 9.4',
+            f'hostgroup-{index % 50}',
+            f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}',
+            f'52:54:00:{index // 65536 % 256:02x}:{index // 256 % 256:02x}:{index % 256:02x}',
+            'OK',
+        ]
+
+
+def generate_csv(count):
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(COLUMNS)
+    writer.writerows(generate_rows(count))
+    return output.getvalue()
+
+
+def generate_json(count):
+    return json.dumps([dict(zip(COLUMNS, row, strict=True)) for row in generate_rows(count)])
+
+
+def generate_content_view_info(count):
+    """A content view info output listing ``count`` repositories, versions and keys"""
+    lines = ['Id:           3', 'Name:         Big CV', 'Label:        Big_CV', 'Yum Repositories:']
+    for index in range(1, count + 1):
+        lines.extend(
+            [
+                f' {index}) Id:    {index}',
+                f'    Name:  Repository {index}',
+                f'    Label: Repository_{index}',
+            ]
+        )
+    lines.append('Versions:')
+    for index in range(1, count + 1):
+        lines.extend(
+            [
+                f' {index}) Id:        {index}',
+                f'    Version:   {index}.0',
+                '    Published: 2024/05/13 13:55:17',
+            ]
+        )
+    lines.append('Activation Keys:')
+    lines.extend(f' {index}) ak-{index}' for index in range(1, count + 1))
+    return '\n'.join(lines)
+
+
+def chunked(output, size):
+    return (output[i : i + size] for i in range(0, len(output), size))
+
+
+def consume(rows):
+    """Walk through streamed rows without keeping them, like a caller filtering them would"""
+    return sum(1 for _ in rows)
+
+
+def measure(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+@click.command()
+@click.option('--rows', default=100_000, show_default=True, help='Rows in the synthetic output.')
+@click.option('--repeat', default=3, show_default=True, help='Runs per parser, best is kept.')
+@click.option('--chunk-size', default=32768, show_default=True, help='Streamed chunk size.')
+@click.option(
+    '--corpus',
+    default=Path(__file__).parent.parent / 'tests' / 'robottelo' / 'data' / 'hammer_info',
+    show_default=True,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help='Directory of recorded hammer info outputs.',
+)
+def benchmark(rows, repeat, chunk_size, corpus):
+    """Compare hammer output parsers on large synthetic outputs"""
+    csv_output = generate_csv(rows)
+    json_output = generate_json(rows)
+    info_outputs = {path.stem: path.read_text() for path in sorted(corpus.glob('*.txt'))}
+    info_outputs['synthetic content_view'] = generate_content_view_info(rows // 10)
+    for output in info_outputs.values():
+        assert legacy_parse_info(output) == hammer.parse_info(output)
+    assert legacy_parse_csv(csv_output) == hammer.parse_csv(csv_output)
+    assert legacy_parse_json(json_output) == list(hammer.iter_json(chunked(json_output, 4096)))
+    cases = {
+        'csv legacy parse_csv': lambda: legacy_parse_csv(csv_output),
+        'csv parse_csv': lambda: hammer.parse_csv(csv_output),
+        'csv iter_csv (streamed)': lambda: consume(
+            hammer.iter_csv(hammer.iter_lines(chunked(csv_output, chunk_size)))
+        ),
+        'json legacy parse_json': lambda: legacy_parse_json(json_output),
+        'json parse_json': lambda: hammer.parse_json(json_output),
+        'json iter_json (streamed)': lambda: consume(
+            hammer.iter_json(chunked(json_output, chunk_size))
+        ),
+    }
+    for name, output in info_outputs.items():
+        # the recorded outputs are tiny, parse them many times to get measurable timings
+        loops = 1 if name.startswith('synthetic') else 1000
+        cases[f'info legacy {name} x{loops}'] = lambda output=output, loops=loops: [
+            legacy_parse_info(output) for _ in range(loops)
+        ]
+        cases[f'info {name} x{loops}'] = lambda output=output, loops=loops: [
+            hammer.parse_info(output) for _ in range(loops)
+        ]
+    click.echo(f'{rows} rows, csv {len(csv_output)} chars, json {len(json_output)} chars')
+    click.echo(f'{"parser":<44}{"best time (s)":>16}{"peak memory (MiB)":>20}')
+    for name, func in cases.items():
+        best, peak = measure(func, repeat)
+        click.echo(f'{name:<44}{best:>16.3f}{peak / 2**20:>20.1f}')
+
+
+if __name__ == '__main__':
+    benchmark()
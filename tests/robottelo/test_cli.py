@@ -285,23 +285,70 @@ class BaseCliTestCase(unittest.TestCase):
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
 
-    @mock.patch('robottelo.cli.base.Base.list')
+    @mock.patch('robottelo.cli.base.Base.iter_list')
     def test_exists_without_option_and_empty_return(self, lst_method):
         """Check exists method without options and empty return"""
-        lst_method.return_value = []
+        lst_method.return_value = iter([])
         response = Base.exists(search=['id', 1])
-        lst_method.assert_called_once_with({'search': 'id=\\"1\\"'})
+        lst_method.assert_called_once_with({'search': 'id=\\"1\\"'}, page_size=1)
         assert response == []
 
-    @mock.patch('robottelo.cli.base.Base.list')
+    @mock.patch('robottelo.cli.base.Base.iter_list')
     def test_exists_with_option_and_no_empty_return(self, lst_method):
         """Check exists method with options and no empty return"""
-        lst_method.return_value = [1, 2]
+        lst_method.return_value = iter([1, 2])
         my_options = {'search': 'foo=bar'}
         response = Base.exists(my_options, search=['id', 1])
-        lst_method.assert_called_once_with(my_options)
+        lst_method.assert_called_once_with(my_options, page_size=1)
         assert response == 1
 
+    @mock.patch('robottelo.cli.base.Base.iter_list')
+    def test_exists_uses_list_override(self, iter_list):
+        """Check exists calls the list of a class overriding it instead of paging"""
+        calls = []
+
+        class Docker(Base):
+            command_base = 'docker tag'
+
+            @classmethod
+            def list(cls, options=None, per_page=False):
+                calls.append(options)
+                return [{'id': '1'}, {'id': '2'}]
+
+        response = Docker.exists(search=['name', 'latest'])
+        assert calls == [{'search': 'name=\\"latest\\"'}]
+        assert not iter_list.called
+        assert response == {'id': '1'}
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_iter_list_fetches_pages_on_demand(self, construct, execute):
+        """Check iter_list requests pages until a short page and only while consumed"""
+        construct.side_effect = lambda options: options['page']
+        pages = {1: [1, 2], 2: [3, 4], 3: [5]}
+        execute.side_effect = lambda page, output_format: pages[page]
+        rows = Base.iter_list({'organization-id': 1}, page_size=2)
+        assert next(rows) == 1
+        assert execute.call_count == 1
+        assert list(rows) == [2, 3, 4, 5]
+        assert execute.call_count == 3
+        construct.assert_called_with({'organization-id': 1, 'per-page': 2, 'page': 3})
+        assert Base.command_sub == 'list'
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_iter_list_prefetch(self, construct, execute):
+        """Check iter_list fetches the next page in the background and stops on empty pages"""
+        construct.side_effect = lambda options: options['page']
+        pages = {1: [1, 2], 2: [3, 4], 3: {}}
+        execute.side_effect = lambda page, output_format: pages[page]
+        rows = Base.iter_list(page_size=2, prefetch=True)
+        assert next(rows) == 1
+        # the second page was requested while the first one is consumed
+        construct.assert_called_with({'per-page': 2, 'page': 2})
+        assert list(rows) == [2, 3, 4]
+        assert execute.call_count == 3
+
     @mock.patch('robottelo.cli.base.Base.command_requires_org')
     def test_info_requires_organization_id(self, _):  # noqa: PT019 - not a fixture
         """Check info raises CLIError with organization-id is not present in
@@ -0,0 +1,165 @@
+"""Tests for module ``robottelo.cli.batch``."""
+
+import base64
+import subprocess
+from unittest import mock
+
+from broker.helpers import Result
+import pytest
+
+from robottelo.cli.base import Base
+from robottelo.cli.batch import BatchResult, HammerBatch
+from robottelo.exceptions import CLIError, CLIReturnCodeError
+
+
+class FakeCli:
+    """Stand-in for a hammer cli class, only the response handling is needed"""
+
+    command_base = 'fake'
+    command_sub = 'run'
+
+    @classmethod
+    def _handle_response(cls, response, ignore_stderr=None):
+        if response.status != 0:
+            raise CLIReturnCodeError(response.status, response.stderr, 'failed')
+        return response.stdout
+
+
+def run_locally(cmd, **kwargs):
+    """Run the batch script with a local shell instead of ssh"""
+    proc = subprocess.run(cmd, shell=True, capture_output=True, text=True, check=False)
+    return Result(status=proc.returncode, stdout=proc.stdout, stderr=proc.stderr)
+
+
+def queue(batch, command, **kwargs):
+    result = BatchResult(FakeCli, command, **kwargs)
+    batch.queue.append(result)
+    return result
+
+
+@mock.patch('robottelo.cli.batch.ssh.command', side_effect=run_locally)
+def test_batch_runs_in_one_round_trip(command):
+    with HammerBatch() as batch:
+        first = queue(batch, 'echo one')
+        failing = queue(batch, 'echo boom >&2; exit 3')
+        csv_out = queue(batch, 'printf "Id,Name\\n1,foo\\n"', output_format='csv')
+        raw = queue(batch, 'echo "a b  c"; echo warn >&2', raw=True)
+        empty = queue(batch, 'true')
+    assert command.call_count == 1
+    assert first.result() == 'one\n'
+    with pytest.raises(CLIReturnCodeError) as err:
+        failing.result()
+    assert err.value.status == 3
+    assert err.value.stderr == 'boom\n'
+    assert csv_out.result() == [{'id': '1', 'name': 'foo'}]
+    assert raw.result().stdout == 'a b  c\n'
+    assert raw.result().stderr == 'warn\n'
+    assert empty.result() == ''
+    assert batch.queue == []
+
+
+@mock.patch('robottelo.cli.batch.ssh.command', side_effect=run_locally)
+def test_batch_commands_are_isolated(command):
+    """A command reading stdin or exiting must not swallow the rest of the script"""
+    with HammerBatch() as batch:
+        reader = queue(batch, 'cat')
+        exiting = queue(batch, 'exit 7')
+        last = queue(batch, 'echo last')
+    assert reader.result() == ''
+    assert exiting.response.status == 7
+    assert last.result() == 'last\n'
+
+
+@mock.patch('robottelo.cli.batch.ssh.command')
+def test_batch_missing_frames_are_errors(command):
+    command.return_value = Result(status=1, stdout='', stderr='mktemp failed')
+    batch = HammerBatch()
+    result = queue(batch, 'echo never')
+    batch.run()
+    with pytest.raises(CLIReturnCodeError) as err:
+        result.result()
+    assert 'mktemp failed' in err.value.stderr
+
+
+def test_batch_result_before_run():
+    batch = HammerBatch()
+    result = queue(batch, 'echo one')
+    with pytest.raises(CLIError, match='has not been executed yet'):
+        result.result()
+
+
+@mock.patch('robottelo.cli.batch.ssh.command')
+def test_batch_not_run_on_error(command):
+    batch = HammerBatch()
+    queue(batch, 'echo one')
+    with pytest.raises(RuntimeError), batch:
+        raise RuntimeError
+    assert not command.called
+
+
+class Org(Base):
+    command_base = 'organization'
+
+
+def frame(marker, index, status, stdout='', stderr=''):
+    out, err = (base64.b64encode(text.encode()).decode() for text in (stdout, stderr))
+    return f'{marker} {index} {status} {out} {err}'
+
+
+@mock.patch('robottelo.cli.base.settings')
+@mock.patch('robottelo.cli.batch.ssh.command')
+def test_batch_add_builds_hammer_commands(command, settings):
+    settings.performance.time_hammer = False
+    settings.robottelo.locale = 'en_US.UTF-8'
+    settings.server.admin_username = 'admin'
+    settings.server.admin_password = 'changeme'
+    batch = HammerBatch()
+    orgs = batch.add(Org, 'list', {'search': 'name=foo'}, output_format='csv')
+    info = batch.add(Org, 'info', {'id': 1}, return_raw_response=True)
+    assert orgs.command == (
+        'LANG=en_US.UTF-8  hammer -v -u admin -p changeme --output=csv '
+        'organization list --search="name=foo" '
+    )
+    assert 'organization info --id="1"' in info.command
+    # the shared cli class is left untouched
+    assert Org.command_sub is None
+    command.return_value = Result(
+        status=0,
+        stdout='\n'.join(
+            [
+                frame(batch._marker, 0, 0, 'Id,Name\n1,foo\n'),
+                frame(batch._marker, 1, 0, 'Id: 1\n'),
+            ]
+        ),
+        stderr='',
+    )
+    batch.run()
+    assert command.call_count == 1
+    assert orgs.result() == [{'id': '1', 'name': 'foo'}]
+    assert info.result().stdout == 'Id: 1\n'
+
+
+@mock.patch('robottelo.cli.base.settings')
+@mock.patch('robottelo.cli.batch.ssh.command')
+def test_batch_add_failed_entry_raises(command, settings):
+    batch = HammerBatch()
+    failing = batch.add(Org, 'delete', {'id': 1})
+    listed = batch.add(Org, 'list', output_format='csv')
+    command.return_value = Result(
+        status=0,
+        stdout='\n'.join(
+            [
+                frame(batch._marker, 0, 70, stderr='Could not delete the organization'),
+                frame(batch._marker, 1, 0, 'Id,Name\n1,foo\n'),
+            ]
+        ),
+        stderr='',
+    )
+    batch.run()
+    with pytest.raises(CLIReturnCodeError) as err:
+        failing.result()
+    assert err.value.status == 70
+    assert 'Command "organization delete" finished with status 70' in err.value.msg
+    assert 'Could not delete the organization' in err.value.stderr
+    # a failed entry does not affect the others
+    assert listed.result() == [{'id': '1', 'name': 'foo'}]
@@ -0,0 +1,95 @@
+"""Tests for module ``robottelo.utils.collection_pipeline``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.utils.collection_pipeline import CollectionPipeline, item_index
+
+
+class FakeItem:
+    """The parts of a pytest item the pipeline uses, with markers of a parent scope"""
+
+    def __init__(self, name, marks=(), parent_marks=(), fixturenames=()):
+        self.name = name
+        self.own_markers = [mark.mark for mark in marks]
+        self.parent_markers = [mark.mark for mark in parent_marks]
+        self.fixturenames = list(fixturenames)
+        self.stash = pytest.Stash()
+        self.iter_calls = 0
+
+    def iter_markers(self):
+        self.iter_calls += 1
+        yield from reversed(self.own_markers)
+        yield from self.parent_markers
+
+    def add_marker(self, marker):
+        marker = getattr(pytest.mark, marker) if isinstance(marker, str) else marker
+        self.own_markers.append(marker.mark)
+
+
+def test_item_index():
+    item = FakeItem(
+        'test',
+        marks=[pytest.mark.tier1, pytest.mark.network('ipv6')],
+        parent_marks=[pytest.mark.network('ipv4'), pytest.mark.destructive],
+        fixturenames=['target_sat', 'rhel_contenthost'],
+    )
+    index = item_index(item)
+    assert index.marker_names == {'tier1', 'network', 'destructive'}
+    assert index.has_marker('destructive')
+    assert index.closest('network').args == ('ipv6',)
+    assert index.closest('stubbed') is None
+    assert index.uses_any({'rhel_contenthost', 'module_target_sat'})
+    assert not index.uses_any({'capsule_factory'})
+    assert item_index(item) is index
+    assert item.iter_calls == 1
+    # adding a marker makes the index outdated
+    item.add_marker('stubbed')
+    assert item_index(item).has_marker('stubbed')
+    assert item.iter_calls == 2
+
+
+def test_pipeline_single_walk():
+    pipeline = CollectionPipeline()
+    calls = []
+
+    def annotate(item, index):
+        calls.append(('annotate', item.name))
+        if index.has_marker('stubbed'):
+            item.add_marker('content_host')
+
+    def not_content_host(item, index):
+        calls.append(('filter', item.name))
+        return not index.has_marker('content_host')
+
+    def last(item, index):
+        calls.append(('last', item.name))
+        return True
+
+    pipeline.register('annotate', annotate)
+    pipeline.register('not_content_host', not_content_host, kind='filter')
+    pipeline.register('last', last, kind='filter')
+    with pytest.raises(ValueError, match='already registered'):
+        pipeline.register('last', last)
+    with pytest.raises(ValueError, match='Unknown collection stage kind'):
+        pipeline.register('other', last, kind='sort')
+
+    items = [FakeItem('one'), FakeItem('two', marks=[pytest.mark.stubbed]), FakeItem('three')]
+    two = items[1]
+    config = mock.Mock()
+    assert pipeline.run(items, config) == [two]
+    assert [item.name for item in items] == ['one', 'three']
+    config.hook.pytest_deselected.assert_called_once_with(items=[two])
+    # each item goes through all its stages before the next one, a deselected item stops
+    assert calls == [
+        ('annotate', 'one'),
+        ('filter', 'one'),
+        ('last', 'one'),
+        ('annotate', 'two'),
+        ('filter', 'two'),
+        ('annotate', 'three'),
+        ('filter', 'three'),
+        ('last', 'three'),
+    ]
+    assert pipeline.stats == {'not_content_host': 1}
@@ -0,0 +1,152 @@
+"""Tests for module ``robottelo.utils.collection_profile``."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from unittest import mock
+import urllib.request
+
+import pluggy
+
+from robottelo.utils.collection_pipeline import CollectionPipeline
+from robottelo.utils.collection_profile import CollectionProfiler
+from tests.robottelo.test_collection_pipeline import FakeItem
+
+hookspec = pluggy.HookspecMarker('profiled')
+hookimpl = pluggy.HookimplMarker('profiled')
+
+
+class Specs:
+    @hookspec
+    def pytest_collection_modifyitems(self, session, config, items):
+        pass
+
+    @hookspec
+    def pytest_collection_finish(self, session):
+        pass
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(204)
+        self.end_headers()
+
+
+class Deselecting:
+    def __init__(self, url):
+        self.url = url
+
+    @hookimpl
+    def pytest_collection_modifyitems(self, items):
+        time.sleep(0.05)
+        urllib.request.urlopen(self.url).close()
+        items[:] = items[:3]
+
+
+class Wrapper:
+    @hookimpl(wrapper=True)
+    def pytest_collection_modifyitems(self, items):
+        return (yield)
+
+
+class Late:
+    @hookimpl
+    def pytest_collection_finish(self, session):
+        pass
+
+
+def test_collection_profiler():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    manager = pluggy.PluginManager('profiled')
+    manager.add_hookspecs(Specs)
+    manager.register(Deselecting(f'http://{server.server_address[0]}:{server.server_address[1]}'))
+    manager.register(Wrapper())
+    profiler = CollectionProfiler()
+    profiler.instrument(manager)
+    # plugins registered later are instrumented on registration, only once
+    late = Late()
+    manager.register(late)
+    profiler.instrument(manager, late)
+    profiler.instrument(manager, late)
+    profiler.start()
+    try:
+        items = list(range(10))
+        manager.hook.pytest_collection_modifyitems(session=None, config=None, items=items)
+        manager.hook.pytest_collection_finish(session=None)
+        manager.hook.pytest_collection_finish(session=None)
+    finally:
+        profiler.stop()
+        server.shutdown()
+        server.server_close()
+    assert items == [0, 1, 2]
+
+    profile = profiler.to_dict()
+    module = __name__
+    assert set(profile['hooks']) == {
+        f'pytest_collection_modifyitems {module}.Deselecting.pytest_collection_modifyitems',
+        f'pytest_collection_finish {module}.Late.pytest_collection_finish',
+    }
+    deselecting, late_stats = (
+        profile['hooks'][key] for key in sorted(profile['hooks'], reverse=True)
+    )
+    assert deselecting['calls'] == 1
+    assert deselecting['seconds'] >= 0.05
+    assert (deselecting['items_in'], deselecting['items_out']) == (10, 3)
+    assert (deselecting['connections'], deselecting['http_requests']) == (1, 1)
+    assert late_stats['calls'] == 2
+    assert late_stats['connections'] == late_stats['items_in'] == 0
+
+    merged = CollectionProfiler.merge(profile, profile)
+    assert merged['workers'] == 2
+    assert CollectionProfiler.top(merged, 1)[0][1]['calls'] == 2
+
+
+def slow_annotate(item, index):
+    time.sleep(0.01)
+
+
+def keep_first(item, index):
+    return item.name == 'test_0'
+
+
+class Pipeline:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    @hookimpl
+    def pytest_collection_modifyitems(self, config, items):
+        self.pipeline.run(items, config)
+
+
+def test_collection_profiler_pipeline_stages():
+    """Every stage of the collection pipeline is reported on its own"""
+    pipeline = CollectionPipeline()
+    pipeline.register('slow', slow_annotate)
+    pipeline.register('first', keep_first, kind='filter')
+    manager = pluggy.PluginManager('profiled')
+    manager.add_hookspecs(Specs)
+    manager.register(Pipeline(pipeline))
+    profiler = CollectionProfiler()
+    profiler.instrument(manager)
+    items = [FakeItem(f'test_{number}') for number in range(4)]
+    manager.hook.pytest_collection_modifyitems(session=None, config=mock.Mock(), items=items)
+    profiler.add_pipeline(pipeline)
+    assert [item.name for item in items] == ['test_0']
+
+    hooks = profiler.to_dict()['hooks']
+    module = __name__
+    assert set(hooks) == {
+        f'pytest_collection_modifyitems {module}.Pipeline.pytest_collection_modifyitems',
+        f'collection_pipeline[slow] {module}.slow_annotate',
+        f'collection_pipeline[first] {module}.keep_first',
+    }
+    slow = hooks[f'collection_pipeline[slow] {module}.slow_annotate']
+    assert slow['seconds'] >= 0.04
+    assert (slow['calls'], slow['items_in'], slow['items_out']) == (1, 4, 4)
+    first = hooks[f'collection_pipeline[first] {module}.keep_first']
+    assert (first['items_in'], first['items_out']) == (4, 1)
+    assert pipeline.stats == {'first': 3}
@@ -0,0 +1,110 @@
+"""Tests for the duration aware xdist scheduling."""
+
+import json
+from types import SimpleNamespace
+
+from pytest_plugins.duration_scheduling import DurationScheduling
+from robottelo.utils.duration_scheduling import (
+    DurationHistory,
+    DurationPredictor,
+    junit_durations,
+    predict_makespan,
+)
+
+TESTS = [
+    'tests/foreman/api/test_short.py::test_one',
+    'tests/foreman/api/test_short.py::test_two',
+    'tests/foreman/api/test_short.py::test_three',
+    'tests/foreman/api/test_provisioning.py::test_pxe',
+    'tests/foreman/api/test_provisioning.py::test_pxe_uefi',
+    'tests/foreman/cli/test_host.py::TestHost::test_create',
+    'tests/foreman/destructive/test_rename.py::test_rename',
+]
+DURATIONS = {
+    TESTS[0]: 2,
+    TESTS[1]: 3,
+    TESTS[2]: 1,
+    TESTS[3]: 2400,
+    TESTS[4]: 2000,
+    TESTS[5]: 30,
+}
+
+
+class FakeConfig:
+    def getvalue(self, name):
+        return {'tx': ['2*popen']}[name]
+
+
+class FakeNode:
+    def __init__(self, worker_id):
+        self.gateway = SimpleNamespace(id=worker_id)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def test_junit_durations(tmp_path):
+    junit = tmp_path / 'junit.xml'
+    junit.write_text(
+        '<testsuites><testsuite>'
+        '<testcase classname="tests.foreman.api.test_short" name="test_one" time="4.5"/>'
+        '<testcase classname="tests.foreman.cli.test_host.TestHost" name="test_create" time="9"/>'
+        '<testcase classname="tests.foreman.api.test_removed" name="test_gone" time="9"/>'
+        '</testsuite></testsuites>'
+    )
+    assert junit_durations(junit, TESTS) == {TESTS[0]: 4.5, TESTS[5]: 9}
+
+
+def test_duration_history_and_prediction():
+    history = DurationHistory({TESTS[0]: 10}, weight=0.5)
+    history.update({TESTS[0]: 20, TESTS[1]: 3})
+    assert history.durations == {TESTS[0]: 15, TESTS[1]: 3}
+
+    predict = DurationPredictor(DURATIONS, factory_tests=[TESTS[6]], factory_default=1800)
+    assert predict(TESTS[3]) == 2400
+    assert predict(TESTS[6]) == 1800
+    # the median of the known durations
+    assert predict('tests/foreman/api/test_new.py::test_new') == 16.5
+    assert predict.unknown == {TESTS[6], 'tests/foreman/api/test_new.py::test_new'}
+
+    assert predict_makespan([5, 4, 3, 3, 3], 2) == (10, [10, 8])
+
+
+def test_duration_scheduling(tmp_path):
+    # the factory tests written by a worker at the end of its collection
+    tmp_path.joinpath('gw0.json').write_text(json.dumps([TESTS[6]]))
+    sched = DurationScheduling(
+        FakeConfig(), markers_dir=tmp_path, durations=dict(DURATIONS), factory_duration=1800
+    )
+    gw0, gw1 = FakeNode('gw0'), FakeNode('gw1')
+    for node in (gw0, gw1):
+        sched.add_node(node)
+        sched.add_node_collection(node, TESTS)
+    sched.schedule()
+
+    # the provisioning module goes first, the destructive test is a unit of its own and both
+    # other modules follow
+    assert list(sched.assigned_work[gw0]) == ['tests/foreman/api/test_provisioning.py']
+    assert list(sched.assigned_work[gw1]) == [TESTS[6], 'tests/foreman/cli/test_host.py']
+    assert list(sched.workqueue) == ['tests/foreman/api/test_short.py']
+    assert sched.predicted['makespan'] == 4400
+    assert sched.predicted['loads'] == [4400, 1836]
+
+    for index in gw1.sent:
+        sched.mark_test_complete(gw1, index, duration=DURATIONS.get(TESTS[index], 1500))
+    assert not sched.workqueue
+    assert sorted(gw1.sent) == [0, 1, 2, 5, 6]
+    for index in gw0.sent:
+        sched.mark_test_complete(gw0, index, duration=DURATIONS[TESTS[index]])
+    assert sched.tests_finished
+
+    report = sched.report()
+    assert report['predicted_makespan'] == 4400
+    assert report['actual_loads'] == {'gw0': 4400, 'gw1': 1536}
+    assert (report['units'], report['tests'], report['factory_tests']) == (4, 7, 1)
+    assert report['unknown_durations'] == 1
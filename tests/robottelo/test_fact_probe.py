@@ -0,0 +1,88 @@
+"""Tests for module ``robottelo.utils.fact_probe``."""
+
+import subprocess
+
+from broker.helpers import Result
+import pytest
+
+from robottelo.exceptions import ContentHostError
+from robottelo.utils import fact_probe
+
+
+class LocalHost:
+    """Runs the commands on the local machine"""
+
+    hostname = 'client.example.com'
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, cmd):
+        self.commands.append(cmd)
+        process = subprocess.run(['sh', '-c', cmd], capture_output=True, text=True)
+        return Result(status=process.returncode, stdout=process.stdout, stderr=process.stderr)
+
+
+def test_probe_output():
+    outputs = {
+        'boot_id': (0, 'abc-12\n'),
+        'os_release': (
+            0,
+            '# comment\nNAME="Red Hat Enterprise Linux"\nVERSION_ID="9.4"\nID=rhel\n',
+        ),
+        'redhat_release': (0, 'Red Hat Enterprise Linux release 9.4 (Plow)\n'),
+        'arch': (0, 'x86_64\n'),
+    }
+    facts = fact_probe.facts_from_output('client.example.com', outputs)
+    assert facts['boot_id'] == 'abc-12'
+    assert facts['os_release'] == {
+        'NAME': 'Red Hat Enterprise Linux',
+        'VERSION_ID': '9.4',
+        'ID': 'rhel',
+    }
+    assert facts['is_el'] is True
+    assert facts['arch'] == 'x86_64'
+    assert fact_probe.parse_redhat_release(facts['redhat_release'])['VERSION_ID'] == '9.4'
+    with pytest.raises(ContentHostError):
+        fact_probe.parse_redhat_release('Debian GNU/Linux 12')
+
+    # a host without /etc/os-release nor /etc/redhat-release
+    facts = fact_probe.facts_from_output(
+        'client.example.com',
+        {'boot_id': (0, 'abc-12'), 'os_release': (1, ''), 'redhat_release': (1, '')},
+    )
+    assert (facts['os_release'], facts['is_el'], facts['redhat_release']) == (None, False, None)
+
+
+def test_parse_rhsm_facts():
+    text = 'cpu.core(s)_per_socket: 1\ndistribution.name: Red Hat\nEnterprise\n'
+    assert fact_probe.parse_rhsm_facts(text) == {
+        'cpu.core(s)_per_socket': '1',
+        'distribution.name': 'Red Hat Enterprise',
+    }
+
+
+def test_get_facts_cached_by_boot_id(tmp_path):
+    cache = fact_probe.FactCache(tmp_path)
+    host = LocalHost()
+    facts = fact_probe.get_facts(host, cache=cache)
+    assert host.commands == [fact_probe.PROBE_SCRIPT]
+    assert facts['boot_id']
+    assert (
+        facts['arch']
+        == subprocess.run(['uname', '-m'], capture_output=True, text=True).stdout.strip()
+    )
+
+    # another instance of the same host only reads the boot id
+    other = LocalHost()
+    assert fact_probe.get_facts(other, cache=cache) == facts
+    assert other.commands == [fact_probe.BOOT_ID_COMMAND]
+
+    # after a reboot the host is probed again and the facts of the previous boot are dropped
+    rebooted = LocalHost()
+    cache.set({**facts, 'boot_id': 'previous-boot'})
+    fact_probe.get_facts(rebooted, cache=cache)
+    assert rebooted.commands == [fact_probe.BOOT_ID_COMMAND, fact_probe.PROBE_SCRIPT]
+    assert [path.name for path in tmp_path.iterdir()] == [
+        f'client.example.com_{facts["boot_id"]}.json'
+    ]
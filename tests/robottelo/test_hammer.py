@@ -1,7 +1,15 @@
 """Tests for Robottelo's hammer helpers"""
 
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
 from robottelo.cli import hammer
 
+INFO_CORPUS = Path(__file__).parent / 'data' / 'hammer_info'
+
 
 class TestParseCSV:
     """Tests for parsing CSV hammer output"""
@@ -110,6 +118,65 @@ class TestParseJSON:
         assert hammer.parse_json(json_output) == hammer.parse_csv(csv_ouput_lines)[0]
 
 
+def chunked(output, size):
+    return [output[i : i + size] for i in range(0, len(output), size)]
+
+
+class TestStreamingParsers:
+    """Tests for the lazy hammer output parsers"""
+
+    csv_output = '\r\n'.join(
+        [
+            'Id,Name,Operating System',
+            '1,"multi',
+            'line",RHEL 9',
+            '2,"quoted, comma",',
+            '',
+            '3,short',
+            '4,long,extra,values',
+            '',
+        ]
+    )
+    json_output = '[\n  {"ID": 1, "Name": "a ]}", "Enabled": true},\n  {"ID": 22, "Sub Dict": {"A B": [1]}}\n]\n'
+
+    @pytest.mark.parametrize('size', [1, 2, 7, 1024])
+    def test_iter_csv_matches_dict_reader(self, size):
+        lines = list(hammer.iter_lines(chunked(self.csv_output, size)))
+        assert lines == self.csv_output.splitlines()
+        rows = list(hammer.iter_csv(lines))
+        assert rows == [
+            {'id': '1', 'name': 'multiline', 'operating-system': 'RHEL 9'},
+            {'id': '2', 'name': 'quoted, comma', 'operating-system': ''},
+            {'id': '3', 'name': 'short', 'operating-system': None},
+            {'id': '4', 'name': 'long', 'operating-system': 'extra', None: ['values']},
+        ]
+        header, *body = self.csv_output.splitlines()
+        assert rows == list(csv.DictReader(body, fieldnames=['id', 'name', 'operating-system']))
+
+    def test_iter_csv_empty(self):
+        assert list(hammer.iter_csv([])) == []
+        assert hammer.parse_csv('Id,Name\n') == []
+
+    @pytest.mark.parametrize('size', [1, 3, 16, 1024])
+    def test_iter_json_list(self, size):
+        items = list(hammer.iter_json(chunked(self.json_output, size)))
+        assert items == hammer.parse_json(self.json_output)
+        assert items == [
+            {'id': '1', 'name': 'a ]}', 'enabled': True},
+            {'id': '22', 'sub-dict': {'a-b': ['1']}},
+        ]
+
+    @pytest.mark.parametrize('size', [1, 1024])
+    def test_iter_json_scalars_and_documents(self, size):
+        assert list(hammer.iter_json(chunked('[12, 345]', size))) == ['12', '345']
+        assert list(hammer.iter_json(chunked(' []', size))) == []
+        assert list(hammer.iter_json(chunked('{"ID": 160}\n', size))) == [{'id': '160'}]
+
+    def test_iter_json_truncated(self):
+        with pytest.raises(json.JSONDecodeError):
+            list(hammer.iter_json(chunked('[{"ID": 1}, {"ID"', 4)))
+
+
 class TestParseHelp:
     """Tests for parsing hammer help output"""
 
@@ -534,3 +601,16 @@ class TestParseInfo:
     def test_parse_json_list(self):
         """Can parse a list in json"""
         assert hammer.parse_json('["item1", "item2"]') == ['item1', 'item2']
+
+    @pytest.mark.parametrize('sample', sorted(path.stem for path in INFO_CORPUS.glob('*.txt')))
+    def test_parse_info_corpus(self, sample):
+        """Real ``hammer <entity> info`` outputs keep parsing to the recorded result"""
+        output = (INFO_CORPUS / f'{sample}.txt').read_text()
+        expected = json.loads((INFO_CORPUS / f'{sample}.json').read_text())
+        assert hammer.parse_info(output) == expected
+
+    @pytest.mark.parametrize(
+        'line', ['', 'a', '   a', '    a', '     a', '\ta', ' \t a', '\t\t', '         ']
+    )
+    def test_indentation_level(self, line):
+        assert hammer._indentation_level(line) == hammer.get_line_indentation_level(line)
@@ -0,0 +1,81 @@
+"""Tests for module ``robottelo.cli.hammer_shell``."""
+
+import os
+import shutil
+import subprocess
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import hammer_shell
+from robottelo.cli.hammer_shell import HammerShell, HammerShellError
+
+FAKE_HAMMER = """
+exit 0 if ARGV == ['--version']
+puts ARGV.join('|')
+warn "LANG=#{ENV['LANG']}"
+exit(ARGV.include?('fail') ? 2 : 0)
+"""
+
+pytestmark = pytest.mark.skipif(not shutil.which('ruby'), reason='ruby is not installed')
+
+
+class LocalShell:
+    """Emulate a broker interactive shell with a local bash process"""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ['bash'], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+
+    def send(self, cmd):
+        self.proc.stdin.write(f'{cmd}\n'.encode())
+        self.proc.stdin.flush()
+
+    def stdout(self):
+        return os.read(self.proc.stdout.fileno(), 65535).decode() or None
+
+
+@pytest.fixture
+def local_client():
+    client = mock.Mock()
+    client.session.shell.side_effect = LocalShell
+    with mock.patch('robottelo.cli.hammer_shell.ssh.get_client', return_value=client):
+        yield client
+
+
+@pytest.fixture
+def fake_hammer(tmp_path):
+    path = tmp_path / 'hammer'
+    path.write_text(FAKE_HAMMER)
+    return str(path)
+
+
+def test_execute_returns_framed_results(local_client, fake_hammer):
+    shell = HammerShell('sat.example.com', hammer_bin=fake_hammer).start()
+    result = shell.execute('-v --name="foo bar" list', env={'LANG': 'en_US.UTF-8'})
+    assert result.status == 0
+    assert result.stdout == '-v|--name=foo bar|list\n'
+    assert result.stderr == 'LANG=en_US.UTF-8\n'
+    failed = shell.execute('fail', timed=True)
+    assert failed.status == 2
+    assert failed.stderr.splitlines()[-1].startswith('real ')
+    shell._shell.proc.kill()
+
+
+def test_dead_server_raises(local_client, fake_hammer):
+    shell = HammerShell('sat.example.com', hammer_bin=fake_hammer).start()
+    shell._shell.proc.kill()
+    shell._shell.proc.wait()
+    with pytest.raises(HammerShellError):
+        shell.execute('list')
+
+
+def test_command_falls_back_when_server_does_not_start(local_client):
+    with mock.patch.object(hammer_shell, '_unavailable', set()):
+        assert hammer_shell.command('list', hostname='sat.example.com') is None
+        assert 'sat.example.com' in hammer_shell._unavailable
+        # the failed host is not retried
+        local_client.session.shell.reset_mock()
+        assert hammer_shell.command('list', hostname='sat.example.com') is None
+        assert not local_client.session.shell.called
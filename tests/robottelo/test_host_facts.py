@@ -0,0 +1,142 @@
+import time
+from unittest import mock
+
+from dynaconf.vendor.box.exceptions import BoxKeyError
+from packaging.version import Version
+import pytest
+
+from robottelo.utils import host_facts
+
+
+class FakeCache(dict):
+    """The subset of the pytest cache interface used by host_facts"""
+
+    def get(self, key, default):
+        return super().get(key, default)
+
+    def set(self, key, value):
+        self[key] = value
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    with mock.patch('robottelo.utils.host_facts.settings') as settings:
+        server = {'hostname': 'sat.example.com'}
+        settings.server.get.side_effect = lambda key, default=None: server.get(key, default)
+        settings.server.values = server
+        settings.server.version.get.return_value = '6.17'
+        settings.server.version.rhel_version = '9'
+        settings.performance.host_facts.ttl = 3600
+        settings.performance.host_facts.offline = False
+        yield settings
+    host_facts._configured = False
+    host_facts._collecting = False
+    host_facts._snapshot = None
+
+
+@pytest.fixture
+def fetch():
+    facts = host_facts._facts('ssh', '6.17.1', '9.4')
+    with mock.patch.object(host_facts, 'fetch', return_value=facts) as fetch:
+        yield fetch
+
+
+def test_not_configured(fetch):
+    """Outside of a pytest session no snapshot is taken"""
+    assert host_facts.snapshot() is None
+    fetch.assert_not_called()
+
+
+def test_fetched_once_and_persisted(fetch):
+    cache = FakeCache()
+    host_facts.configure(cache=cache)
+    assert host_facts.snapshot()['satellite_version'] == '6.17.1'
+    assert host_facts.snapshot()['rhel_version'] == '9.4'
+    assert cache[host_facts.CACHE_KEY]['source'] == 'ssh'
+    # the next session reuses the persisted snapshot
+    host_facts.configure(cache=cache)
+    assert host_facts.snapshot()['satellite_version'] == '6.17.1'
+    assert fetch.call_count == 1
+
+
+def test_expired_or_other_host(fetch, settings):
+    cache = FakeCache()
+    cache.set(host_facts.CACHE_KEY, {**fetch.return_value, 'fetched_at': time.time() - 7200})
+    host_facts.configure(cache=cache)
+    host_facts.snapshot()
+    assert fetch.call_count == 1
+    settings.server.values['hostname'] = 'other.example.com'
+    host_facts.configure(cache=cache)
+    host_facts.snapshot()
+    assert fetch.call_count == 2
+
+
+def test_offline(fetch, settings):
+    cache = FakeCache()
+    host_facts.configure(cache=cache, offline=True)
+    facts = host_facts.snapshot()
+    assert (facts['source'], facts['satellite_version'], facts['rhel_version']) == (
+        'settings',
+        host_facts.SATELLITE_VERSION,
+        '9',
+    )
+    settings.server.version.get.return_value = 'stream'
+    settings.robottelo.get.return_value = '6.18'
+    settings.performance.host_facts.offline = True
+    host_facts.configure(cache=cache)
+    assert host_facts.snapshot()['satellite_version'] == '6.18'
+    fetch.assert_not_called()
+    # facts from settings are never persisted
+    assert not cache
+
+
+def test_worker_snapshot(fetch):
+    """A worker uses the snapshot sent by the controller"""
+    host_facts.configure()
+    host_facts.set_snapshot(
+        {'hostname': 'sat.example.com', 'satellite_version': '6.16', 'rhel_version': '8'}
+    )
+    assert host_facts.snapshot()['satellite_version'] == '6.16'
+    fetch.assert_not_called()
+
+
+def test_unset_hostname(settings):
+    """Without a configured Satellite the snapshot is built from settings"""
+    del settings.server.values['hostname']
+    # reading the hostname as an attribute raises, like the dynaconf box does
+    del settings.server.hostname
+    host_facts.configure(cache=FakeCache())
+    with mock.patch('robottelo.hosts.Satellite', side_effect=BoxKeyError('hostname')):
+        facts = host_facts.snapshot()
+    assert (facts['source'], facts['hostname'], facts['rhel_version']) == ('settings', None, '9')
+
+
+def test_snapshot_only_during_collection(fetch, settings):
+    """After the collection, or on another Satellite, the facts are read from the host"""
+    host_facts.configure(cache=FakeCache())
+    assert host_facts.snapshot()['satellite_version'] == '6.17.1'
+    settings.server.values['hostname'] = 'other.example.com'
+    assert host_facts.snapshot() is None
+    settings.server.values['hostname'] = 'sat.example.com'
+    host_facts.collection_finished()
+    assert host_facts.snapshot() is None
+    assert fetch.call_count == 1
+
+
+@mock.patch('robottelo.hosts.Satellite')
+def test_sat_rhel_version_fallback(satellite):
+    """Without a rhel_version in the snapshot, the RHEL version is read from the Satellite"""
+    from robottelo.hosts import get_sat_rhel_version
+
+    satellite.return_value.os_version = Version('9.4')
+    host_facts.configure()
+    host_facts.set_snapshot(
+        {'hostname': 'sat.example.com', 'satellite_version': '6.17', 'rhel_version': '8'}
+    )
+    assert get_sat_rhel_version() == Version('8')
+    satellite.assert_not_called()
+    host_facts.set_snapshot(
+        {'hostname': 'sat.example.com', 'satellite_version': '6.17', 'rhel_version': None}
+    )
+    assert get_sat_rhel_version() == Version('9.4')
+    satellite.assert_called_once_with()
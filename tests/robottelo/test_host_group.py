@@ -0,0 +1,69 @@
+"""Tests for module ``robottelo.utils.host_group``."""
+
+import threading
+import time
+
+import pytest
+
+from robottelo.exceptions import HostGroupError
+from robottelo.utils.host_group import HostGroup
+
+
+class FakeHost:
+    def __init__(self, hostname, delay=0.2):
+        self.hostname = hostname
+        self.delay = delay
+        self.files = []
+
+    def __str__(self):
+        return self.hostname
+
+    def execute(self, cmd):
+        time.sleep(self.delay)
+        if cmd == 'false':
+            raise RuntimeError(f'{cmd} failed on {self.hostname}')
+        return f'{self.hostname}: {cmd}'
+
+    def put(self, local_path, remote_path=None):
+        self.files.append(remote_path or local_path)
+
+    def install_katello_host_tools(self):
+        return threading.current_thread().name
+
+
+def test_calls_run_in_parallel():
+    # the slowest host answers first, the results still follow the order of the hosts
+    hosts = [FakeHost(f'host{index}', delay=0.3 - index * 0.1) for index in range(3)]
+    group = HostGroup(hosts, max_workers=4)
+    results = group.execute('hostname')
+    assert results.values == ['host0: hostname', 'host1: hostname', 'host2: hostname']
+    assert [result.host for result in results] == hosts
+    assert results.duration < results.busy_time
+    assert results.duration < 0.5
+
+    group.put('/tmp/file', '/root/file')
+    assert [host.files for host in hosts] == [['/root/file']] * 3
+    threads = group.install_katello_host_tools().values
+    assert all(name.startswith('host_group') for name in threads)
+    assert group.map(lambda host: host.hostname.upper()).values == ['HOST0', 'HOST1', 'HOST2']
+
+
+def test_bounded_workers():
+    hosts = [FakeHost(f'host{index}', delay=0.1) for index in range(4)]
+    results = HostGroup(hosts, max_workers=1).execute('hostname')
+    assert results.duration >= 0.4
+    assert len(results) == len(hosts)
+
+
+def test_errors_are_aggregated():
+    hosts = [FakeHost('host0', delay=0), FakeHost('host1', delay=0)]
+    hosts[1].execute = lambda cmd: 'skipped'
+    group = HostGroup(hosts, max_workers=2)
+    with pytest.raises(HostGroupError, match='execute failed on 1 of 2 hosts') as context:
+        group.execute('false')
+    error = context.value
+    assert list(error.errors) == [hosts[0]]
+    assert error.results.values == [None, 'skipped']
+    with pytest.raises(RuntimeError, match='false failed on host0'):
+        error.results[0].result()
+    assert error.results[1].result() == 'skipped'
@@ -0,0 +1,144 @@
+"""Tests for module ``robottelo.utils.host_pool``."""
+
+import queue
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from pytest_plugins import host_pool as host_pool_plugin
+from robottelo.utils.host_pool import HostPool
+
+RHEL9 = ({'workflow': 'deploy-rhel', 'deploy_rhel_version': '9'}, 'rhel9-ipv4')
+RHEL8 = ({'workflow': 'deploy-rhel', 'deploy_rhel_version': '8'}, 'rhel8-ipv4')
+
+
+class FakeHost:
+    def __init__(self, name):
+        self.name = name
+
+    def setup(self):
+        pass
+
+
+class FakePool(HostPool):
+    """Checks out fake hosts, blocking the checkouts until ``release_checkouts`` is set"""
+
+    def __init__(self, **kwargs):
+        super().__init__(FakeHost, **kwargs)
+        self.release_checkouts = threading.Event()
+        self.release_checkouts.set()
+        self.fail = set()
+        self.checked_out = []
+        self.checked_in = []
+
+    def _checkout(self, deploy_kwargs):
+        self.release_checkouts.wait(5)
+        version = deploy_kwargs['deploy_rhel_version']
+        if version in self.fail:
+            raise RuntimeError(f'no rhel{version} host')
+        host = FakeHost(f'rhel{version}-{len(self.checked_out)}')
+        self.checked_out.append(host)
+        return host
+
+    def _checkin(self, host):
+        self.checked_in.append(host)
+
+    def wait_checkouts(self):
+        for futures in list(self._hosts.values()):
+            for future in list(futures):
+                future.exception(5)
+
+
+def test_acquire_hit_wait_miss():
+    pool = FakePool(workers=2)
+    pool.prefetch([RHEL9])
+    pool.wait_checkouts()
+    host = pool.acquire(*RHEL9)
+    assert host is pool.checked_out[0]
+
+    pool.release_checkouts.clear()
+    pool.prefetch([RHEL9])
+    threading.Timer(0.1, pool.release_checkouts.set).start()
+    assert pool.acquire(*RHEL9) is not host
+
+    # not announced by prefetch, checked out by the test
+    assert pool.acquire(*RHEL8).name == 'rhel8-2'
+    pool.release(host)
+    pool.close()
+    assert pool.checked_in == [host]
+    stats = pool.to_dict()
+    assert {counter: stats['rhel9-ipv4'][counter] for counter in ('hits', 'waits', 'misses')} == {
+        'hits': 1,
+        'waits': 1,
+        'misses': 0,
+    }
+    assert stats['rhel9-ipv4']['max_wait'] >= 0.1
+    assert stats['rhel8-ipv4']['misses'] == 1
+
+
+def test_idle_hosts_checked_in():
+    pool = FakePool(max_idle=1)
+    pool.prefetch([RHEL9, RHEL9, RHEL8])
+    pool.wait_checkouts()
+    # the next tests need one rhel9 host, one of the two idle hosts is kept
+    pool.prefetch([RHEL9])
+    pool.close()
+    stats = pool.to_dict()
+    assert stats['rhel9-ipv4']['idle_checked_in'] + stats['rhel8-ipv4']['idle_checked_in'] == 1
+    assert sorted(host.name for host in pool.checked_in) == sorted(
+        host.name for host in pool.checked_out
+    )
+
+
+def test_failed_checkout():
+    pool = FakePool()
+    pool.fail.add('9')
+    pool.prefetch([RHEL9])
+    pool.wait_checkouts()
+    with pytest.raises(RuntimeError, match='no rhel9 host'):
+        pool.acquire(*RHEL9)
+    pool.fail.clear()
+    # the failed prefetch is submitted again
+    pool.prefetch([RHEL9])
+    pool.wait_checkouts()
+    assert pool.acquire(*RHEL9).name == 'rhel9-0'
+    pool.close()
+    stats = pool.to_dict()['rhel9-ipv4']
+    assert (stats['failures'], stats['misses'], stats['hits']) == (1, 1, 1)
+
+
+def test_merge():
+    first = {'rhel9-ipv4': {'requests': 2, 'hits': 1, 'max_wait': 3.0, 'wait_seconds': 4.0}}
+    second = {'rhel9-ipv4': {'requests': 1, 'hits': 1, 'max_wait': 1.0, 'wait_seconds': 1.0}}
+    merged = HostPool.merge(first, second)['rhel9-ipv4']
+    assert (merged['requests'], merged['hits'], merged['max_wait'], merged['wait_seconds']) == (
+        3,
+        2,
+        3.0,
+        5.0,
+    )
+
+
+def test_lookahead_of_xdist_worker():
+    """An xdist worker only looks ahead at the tests sent to it"""
+    config = SimpleNamespace(workerinput={}, _host_pool_positions={})
+    session = SimpleNamespace()
+    session.items = [SimpleNamespace(nodeid=f'test_{index}', config=config) for index in range(8)]
+    for item in session.items:
+        item.session = session
+    # the worker runs test_1 then test_3, the controller queued test_6 and test_7 for it
+    config._host_pool_worker = SimpleNamespace(torun=queue.Queue())
+    for index in (6, 7):
+        config._host_pool_worker.torun.put(index)
+    items = session.items
+    with mock.patch.object(host_pool_plugin, 'settings') as settings:
+        settings.performance.host_pool.lookahead = 3
+        assert host_pool_plugin._upcoming(items[1], items[3]) == [items[1], items[3], items[6]]
+        # the queue is read, not consumed
+        assert config._host_pool_worker.torun.qsize() == 2
+        # without xdist the next tests of the collection are the next tests of the process
+        del config.workerinput
+        config._host_pool_positions = {item.nodeid: index for index, item in enumerate(items)}
+        assert host_pool_plugin._upcoming(items[1], items[2]) == items[1:4]
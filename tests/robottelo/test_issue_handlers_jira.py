@@ -1,5 +1,8 @@
 """Tests for module ``robottelo.utils.issue_handlers.jira``."""
 
+import json
+import multiprocessing
+import time
 from unittest import mock
 
 import pytest
@@ -139,6 +142,80 @@ class TestJiraIssueHandler:
         assert result[0]['is_open'] is True
 
 
+class TestJiraStatusCache:
+    """Tests for the sqlite store of JiraStatusCache."""
+
+    def test_opened_on_first_use(self, tmp_path):
+        """Creating the cache does not touch the database, the first lookup creates it."""
+        cache = jira.JiraStatusCache(tmp_path / 'cache.sqlite', 7)
+        assert not cache.cache_file.exists()
+        assert cache.get('SAT-1') is None
+        assert cache.cache_file.exists()
+        assert cache.opened
+
+    def test_expired_entries_ignored_and_metrics(self, tmp_path):
+        """Entries older than the TTL are misses, hits report the age of the entries."""
+        cache = jira.JiraStatusCache(tmp_path / 'cache.sqlite', 1)
+        cache.update_many({'SAT-1': _flat_issue('SAT-1'), 'SAT-2': _flat_issue('SAT-2')})
+        with cache._connect() as connection:
+            connection.execute('UPDATE issues SET timestamp = 0 WHERE key = ?', ('SAT-2',))
+        assert cache.get_many(['SAT-1', 'SAT-2', 'SAT-3']) == {
+            'SAT-1': _flat_issue('SAT-1') | {'timestamp': mock.ANY},
+            'SAT-2': None,
+            'SAT-3': None,
+        }
+        metrics = cache.metrics()
+        assert (metrics['hits'], metrics['misses'], metrics['writes']) == (1, 2, 2)
+        assert metrics['hit_rate'] == pytest.approx(1 / 3)
+        assert 0 <= metrics['age_max'] < 60
+        # expired entries are removed when the database is opened again
+        cache.close()
+        reopened = jira.JiraStatusCache(tmp_path / 'cache.sqlite', 1)
+        count = reopened._connect().execute('SELECT count(*) FROM issues').fetchone()[0]
+        assert count == 1
+
+    def test_legacy_json_imported(self, tmp_path):
+        """The entries of a JSON cache file are imported in a sqlite database next to it."""
+        legacy = tmp_path / 'cache.json'
+        legacy.write_text(
+            json.dumps(
+                {
+                    'issues': {
+                        'SAT-1': _flat_issue('SAT-1') | {'timestamp': time.time()},
+                        'SAT-2': _flat_issue('SAT-2') | {'timestamp': 0},
+                    }
+                }
+            )
+        )
+        cache = jira.JiraStatusCache(legacy, 7)
+        assert cache.cache_file == tmp_path / 'cache.sqlite'
+        assert cache.get('SAT-1')['status'] == 'Open'
+        assert cache.get('SAT-2') is None
+
+    def test_concurrent_processes_upsert(self, tmp_path):
+        """Processes writing to the same cache don't lose the entries of each other."""
+        path = tmp_path / 'cache.sqlite'
+        cache = jira.JiraStatusCache(path, 7)
+        cache.update('SAT-0', _flat_issue('SAT-0', status='New'))
+
+        def write(worker):
+            # the connection of the parent is not reused by the forked process
+            for number in range(20):
+                cache.update(f'SAT-{worker}-{number}', _flat_issue(f'SAT-{worker}-{number}'))
+            cache.update('SAT-0', _flat_issue('SAT-0', status='Closed'))
+
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=write, args=(worker,)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+        ids = [f'SAT-{worker}-{number}' for worker in range(4) for number in range(20)]
+        assert all(cache.get_many(ids).values())
+        assert cache.get('SAT-0')['status'] == 'Closed'
+
+
 class TestTryFromCache:
     """Focused tests for try_from_cache lookup order and fallback."""
 
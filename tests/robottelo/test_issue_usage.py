@@ -0,0 +1,93 @@
+"""Tests for module ``robottelo.utils.issue_handlers.usage``."""
+
+import importlib.util
+from unittest import mock
+
+import pytest
+
+from robottelo.utils.issue_handlers import usage
+from robottelo.utils.issue_handlers.usage import IssueUsageIndex, scan_source
+
+TEST_MODULE = '''"""Module docstring
+
+:CaseComponent: Repositories
+"""
+import functools
+
+import pytest
+
+from robottelo.utils.issue_handlers import is_open
+
+
+def wrapped(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+@pytest.fixture
+def setup():
+    if is_open('SAT-1'):
+        pass
+
+
+class TestRepository:
+    @wrapped
+    def test_sync(self):
+        if not is_open("BZ:123"):
+            pass
+        expected = 1 if is_open('SAT-2') else 2
+
+    def test_create(self):
+        def helper():
+            return not is_open('SAT-3')
+
+        issue = 'SAT-4'
+        is_open(issue)
+'''
+
+
+@pytest.fixture
+def test_file(tmp_path):
+    path = tmp_path / 'test_module.py'
+    path.write_text(TEST_MODULE)
+    return path
+
+
+def test_scan_source():
+    result = scan_source(TEST_MODULE)
+    assert result['component'] == 'Repositories'
+    assert result['functions'] == {
+        'setup': [['is_open', 'SAT-1', 22]],
+        'TestRepository.test_sync': [['not is_open', 'BZ:123', 29], ['is_open', 'SAT-2', 31]],
+        'TestRepository.test_create': [['not is_open', 'SAT-3', 35]],
+        'TestRepository.test_create.<locals>.helper': [['not is_open', 'SAT-3', 35]],
+    }
+    # usages outside of tests, like fixtures, are only part of the module usages
+    assert [issue for _, issue, _ in result['module']] == ['SAT-1', 'BZ:123', 'SAT-2', 'SAT-3']
+    assert scan_source('"""No usage"""') == {'functions': {}, 'module': [], 'component': None}
+
+
+def test_index_reuse(tmp_path, test_file):
+    spec = importlib.util.spec_from_file_location('test_module', test_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    cold = IssueUsageIndex(tmp_path / 'index')
+    # decorated tests are looked up by the wrapped function
+    assert cold.function_usages(module.TestRepository.test_sync) == [
+        ['not is_open', 'BZ:123', 29],
+        ['is_open', 'SAT-2', 31],
+    ]
+    assert cold.function_usages(module.TestRepository.test_create) == [['not is_open', 'SAT-3', 35]]
+    assert cold.function_usages(module.wrapped) == []
+    assert cold.stats['files_parsed'] == 1
+    cold.save()
+
+    with mock.patch.object(usage, 'scan_source') as scan:
+        warm = IssueUsageIndex(tmp_path / 'index')
+        assert warm.module_usages(test_file) == cold.module_usages(test_file)
+    scan.assert_not_called()
+    assert warm.stats['files_reused'] == 1
@@ -0,0 +1,207 @@
+"""Tests for the batched Jira fetch of ``robottelo.utils.issue_handlers.jira``.
+
+They run against a local fake Jira server implementing the REST endpoints the jira client uses
+for searches.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from robottelo.utils.issue_handlers import jira
+
+ISSUES = {
+    'SAT-1': {'status': 'New', 'resolution': None},
+    'SAT-2': {'status': 'Closed', 'resolution': 'Duplicate', 'duplicates': 'SAT-3'},
+    'SAT-3': {'status': 'Closed', 'resolution': 'Duplicate', 'duplicates': 'SAT-4'},
+    'SAT-4': {'status': 'Verified', 'resolution': 'Done'},
+    # a cycle Jira should not have, it must not loop forever
+    'SAT-5': {'status': 'Closed', 'resolution': 'Duplicate', 'duplicates': 'SAT-6'},
+    'SAT-6': {'status': 'Closed', 'resolution': 'Duplicate', 'duplicates': 'SAT-5'},
+    **{f'SAT-{number}': {'status': 'New', 'resolution': None} for number in range(100, 130)},
+}
+# keys of moved issues, Jira answers with their current key
+MOVED = {'OLD-1': 'SAT-1', 'OLD-4': 'SAT-4'}
+
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/rest/api/2/serverInfo':
+            return self.reply(
+                200,
+                {'version': '9.12.0', 'versionNumbers': [9, 12, 0], 'deploymentType': 'Server'},
+            )
+        if url.path == '/rest/api/2/field':
+            return self.reply(200, [])
+        if url.path == '/rest/api/2/search':
+            return self.search(parse_qs(url.query)['jql'][0])
+        return self.reply(404, {'errorMessages': [f'{url.path} not found']})
+
+    def search(self, jql):
+        server = self.server
+        with server.lock:
+            server.queries.append(jql)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            rate_limited = server.rate_limited > 0
+            server.rate_limited -= 1
+        try:
+            time.sleep(0.1)
+            if rate_limited:
+                return self.reply(429, {'errorMessages': ['Rate limited']}, {'Retry-After': '0'})
+            keys = re.fullmatch(r'key in \((.*)\)', jql).group(1).split(', ')
+            if unknown := [key for key in keys if key not in ISSUES and key not in MOVED]:
+                message = f"An issue with key '{unknown[0]}' does not exist for field 'key'."
+                return self.reply(400, {'errorMessages': [message]})
+            issues = [self.issue(MOVED.get(key, key)) for key in keys]
+            return self.reply(
+                200, {'startAt': 0, 'maxResults': len(keys), 'total': len(keys), 'issues': issues}
+            )
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def issue(self, key):
+        data = ISSUES[key]
+        links = []
+        if 'duplicates' in data:
+            links.append(
+                {
+                    'id': '1',
+                    'type': {'name': 'Duplicate', 'inward': 'is duplicated by'},
+                    'outwardIssue': {'id': '2', 'key': data['duplicates']},
+                }
+            )
+        return {
+            'id': key.split('-')[1],
+            'key': key,
+            'self': f'http://{self.headers["Host"]}/rest/api/2/issue/{key}',
+            'fields': {
+                'status': {'name': data['status']},
+                'resolution': {'name': data['resolution']} if data['resolution'] else None,
+                'labels': [],
+                'issuelinks': links,
+            },
+        }
+
+
+@pytest.fixture
+def fake_jira():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeJiraHandler)
+    server.lock = threading.Lock()
+    server.queries = []
+    server.in_flight = server.max_in_flight = server.rate_limited = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings = mock.MagicMock()
+    host, port = server.server_address
+    settings.jira.url = f'http://{host}:{port}'
+    settings.jira.api_key = 'token'
+    settings.jira.batch_size = 10
+    settings.jira.max_jql_length = 4000
+    settings.jira.fetch_workers = 4
+    settings.jira.fetch_retries = 2
+    settings.jira.fetch_backoff = 0
+    with mock.patch.object(jira, 'settings', settings):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_jql_batches():
+    ids = [f'SAT-{number}' for number in range(1, 8)]
+    batches = jira.jql_batches([*ids, 'SAT-1'], batch_size=3, max_length=1000)
+    assert [batch for batch, _ in batches] == [ids[:3], ids[3:6], ids[6:]]
+    assert batches[0][1] == 'key in (SAT-1, SAT-2, SAT-3)'
+    # the query length is bounded too
+    batches = jira.jql_batches(ids, batch_size=10, max_length=len('key in (SAT-1, SAT-2)'))
+    assert [len(batch) for batch, _ in batches] == [2, 2, 2, 1]
+
+
+def test_fetch_concurrent_batches(fake_jira):
+    ids = [f'SAT-{number}' for number in range(100, 130)]
+    issues = jira.fetch_jira_issues(ids)
+    assert sorted(issues) == sorted(ids)
+    assert issues['SAT-100'] == {'key': 'SAT-100', 'status': 'New', 'labels': [], 'resolution': ''}
+    assert len(fake_jira.queries) == 3
+    assert fake_jira.max_in_flight > 1
+
+
+def test_fetch_follows_duplicates_in_rounds(fake_jira):
+    issues = jira.fetch_jira_issues(['SAT-1', 'SAT-2', 'SAT-5'])
+    # SAT-2 duplicates SAT-3 which duplicates SAT-4, each link is resolved by one more round
+    assert fake_jira.queries == [
+        'key in (SAT-1, SAT-2, SAT-5)',
+        'key in (SAT-3, SAT-6)',
+        'key in (SAT-4)',
+    ]
+    assert issues['SAT-2']['dupe_data']['key'] == 'SAT-3'
+    assert issues['SAT-2']['dupe_data']['dupe_data']['status'] == 'Verified'
+    assert jira.follow_duplicates(issues['SAT-2'])['key'] == 'SAT-4'
+    assert 'dupe_data' not in issues['SAT-5']['dupe_data']
+    assert 'dupe_data' not in issues['SAT-1']
+
+
+def test_fetch_retries_and_skips_unknown(fake_jira):
+    fake_jira.rate_limited = 2
+    issues = jira.fetch_jira_issues(['SAT-1', 'SAT-404', 'SAT-4'], workers=1)
+    assert sorted(issues) == ['SAT-1', 'SAT-4']
+    assert fake_jira.queries[:3] == ['key in (SAT-1, SAT-404, SAT-4)'] * 3
+
+    fake_jira.rate_limited = 5
+    with pytest.raises(jira.JIRAError):
+        jira.fetch_jira_issues(['SAT-1'])
+
+
+def test_fetch_moved_issues(fake_jira):
+    issues = jira.fetch_jira_issues(['OLD-1', 'SAT-100'])
+    assert issues['OLD-1']['key'] == 'SAT-1'
+    assert issues['OLD-1'] == issues['SAT-1']
+    assert len(fake_jira.queries) == 1
+    # several moved issues in a batch are matched to the requested ids one by one
+    fake_jira.queries.clear()
+    issues = jira.fetch_jira_issues(['OLD-1', 'OLD-4', 'SAT-100'])
+    assert (issues['OLD-1']['key'], issues['OLD-4']['key']) == ('SAT-1', 'SAT-4')
+    assert fake_jira.queries == [
+        'key in (OLD-1, OLD-4, SAT-100)',
+        'key in (OLD-1)',
+        'key in (OLD-4)',
+    ]
+
+
+def test_get_data_jira_uses_fetcher(fake_jira):
+    cache = mock.MagicMock()
+    cache.get_many.return_value = {'SAT-1': {'key': 'SAT-1', 'status': 'New'}}
+    with mock.patch.object(jira, 'jira_cache', cache):
+        data = jira.get_data_jira(['SAT-1', 'SAT-4', 'SAT-404'])
+    assert [issue['key'] for issue in data] == ['SAT-1', 'SAT-4']
+    assert fake_jira.queries == ['key in (SAT-4, SAT-404)', 'key in (SAT-4)', 'key in (SAT-404)']
+    cache.update_many.assert_called_once_with({'SAT-4': data[1]})
+
+
+def test_get_data_jira_caches_moved_issues_by_requested_id(fake_jira):
+    cache = mock.MagicMock()
+    cache.get_many.return_value = {}
+    with mock.patch.object(jira, 'jira_cache', cache):
+        data = jira.get_data_jira(['OLD-4'])
+    assert [issue['key'] for issue in data] == ['SAT-4']
+    cache.update_many.assert_called_once_with({'OLD-4': data[0]})
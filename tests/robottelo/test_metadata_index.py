@@ -0,0 +1,114 @@
+import importlib.util
+import os
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import metadata_index
+from robottelo.utils.metadata_index import MetadataIndex, parse_tokens
+
+TEST_MODULE = '''"""Module docstring
+
+:CaseComponent: Repositories
+
+:Team: Phoenix-content
+"""
+
+
+class TestRepository:
+    """Class docstring
+
+    :CaseImportance: High
+    """
+
+    def test_sync(self):
+        """Test docstring
+
+        :Verifies: SAT-1, SAT-2
+
+        :BlockedBy: SAT-3
+
+        :CaseImportance: Critical
+        """
+
+
+def test_create():
+    """No tokens"""
+'''
+
+
+def load_items(path):
+    spec = importlib.util.spec_from_file_location(f'test_module_{path.stat().st_mtime_ns}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return [
+        SimpleNamespace(function=module.TestRepository.test_sync, cls=module.TestRepository),
+        SimpleNamespace(function=module.test_create, cls=None),
+    ], module
+
+
+@pytest.fixture
+def test_file(tmp_path):
+    path = tmp_path / 'test_module.py'
+    path.write_text(TEST_MODULE)
+    return path
+
+
+def collect(index, path):
+    items, module = load_items(path)
+    for item in items:
+        item.module = module
+    tokens = [index.tokens(item) for item in items]
+    index.save()
+    return tokens
+
+
+def test_parse_tokens():
+    assert parse_tokens(':CaseComponent: Hosts\n:Verifies: SAT-1,  SAT-2\n:BlockedBy: SAT-3') == {
+        'component': 'hosts',
+        'verifies': ['SAT-1', 'SAT-2'],
+        'blocked_by': ['SAT-3'],
+    }
+
+
+def test_index_reuse(tmp_path, test_file):
+    cold = MetadataIndex(tmp_path / 'index')
+    tokens = collect(cold, test_file)
+    assert tokens == [
+        [
+            {'importance': 'critical', 'verifies': ['SAT-1', 'SAT-2'], 'blocked_by': ['SAT-3']},
+            {'importance': 'high'},
+            {'component': 'repositories', 'team': 'phoenix-content'},
+        ],
+        [{}, {'component': 'repositories', 'team': 'phoenix-content'}],
+    ]
+    assert cold.stats['files_parsed'] == 1
+
+    # a new process reuses the tokens of the unchanged file without parsing a docstring
+    with mock.patch.object(metadata_index, 'parse_tokens') as parse:
+        warm = MetadataIndex(tmp_path / 'index')
+        assert collect(warm, test_file) == tokens
+        # a touched but identical file is still reused
+        os.utime(test_file, ns=(0, 0))
+        assert collect(MetadataIndex(tmp_path / 'index'), test_file) == tokens
+    parse.assert_not_called()
+    assert warm.stats['files_reused'] == 1
+
+    test_file.write_text(TEST_MODULE.replace('Phoenix-content', 'Rocket'))
+    changed = MetadataIndex(tmp_path / 'index')
+    assert collect(changed, test_file)[1][1] == {'component': 'repositories', 'team': 'rocket'}
+    assert changed.stats['files_parsed'] == 1
+
+
+def test_inherited_docstrings_not_indexed(tmp_path, test_file):
+    """Tests inheriting a class from another file are parsed on every run"""
+    items, module = load_items(test_file)
+
+    class TestInherited(module.TestRepository):
+        pass
+
+    index = MetadataIndex(tmp_path / 'index')
+    item = SimpleNamespace(function=items[0].function, cls=TestInherited, module=module)
+    assert index.tokens(item)[1] == {'importance': 'high'}
+    assert index.stats['items_not_indexed'] == 1
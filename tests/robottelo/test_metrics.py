@@ -0,0 +1,51 @@
+"""Tests for module ``robottelo.utils.metrics``."""
+
+import json
+
+import pytest
+
+from robottelo.utils.metrics import SIZE_BUCKETS, Histogram, MetricsRegistry
+
+
+def test_histogram_observe():
+    hist = Histogram(buckets=(1, 10))
+    for value in (0.5, 2, 3, 50):
+        hist.observe(value)
+    data = hist.to_dict()
+    assert data['buckets'] == [1, 2, 1]
+    assert data['count'] == 4
+    assert data['sum'] == 55.5
+    assert (data['min'], data['max']) == (0.5, 50)
+    assert data['p50'] == 10
+    assert data['p95'] == 50
+
+
+def test_histogram_round_trip():
+    hist = Histogram()
+    hist.observe(0.3)
+    assert Histogram.from_dict(hist.to_dict()).to_dict() == hist.to_dict()
+    assert Histogram().to_dict()['mean'] is None
+
+
+def test_histogram_update_requires_same_buckets():
+    with pytest.raises(ValueError, match='different buckets'):
+        Histogram(buckets=(1,)).update(Histogram(buckets=(2,)))
+
+
+def test_registry_merge_across_workers(tmp_path):
+    workers = []
+    for values in ((1, 2), (3,)):
+        registry = MetricsRegistry(buckets={'output_size': SIZE_BUCKETS})
+        for value in values:
+            registry.observe('org list', 'total', value)
+            registry.observe('org list', 'output_size', value * 1000)
+        workers.append(registry.to_dict())
+    workers[1]['host info'] = {'total': Histogram().to_dict()}
+    merged = MetricsRegistry.merge(*json.loads(json.dumps(workers)))
+    data = merged.to_dict()
+    assert data['org list']['total']['count'] == 3
+    assert data['org list']['total']['sum'] == 6
+    assert data['org list']['output_size']['bounds'] == list(SIZE_BUCKETS)
+    assert merged.top('total') == [('org list', 6, 3), ('host info', 0.0, 0)]
+    merged.dump(tmp_path / 'metrics.json')
+    assert json.loads((tmp_path / 'metrics.json').read_text()) == data
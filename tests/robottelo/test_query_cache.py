@@ -0,0 +1,106 @@
+import time
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import query_cache
+from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.utils.query_cache import QueryCache
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    with mock.patch('robottelo.utils.query_cache.settings') as settings:
+        settings.performance.query_cache.enabled = True
+        yield settings
+
+
+def test_read_through():
+    cache = QueryCache('sat.example.com')
+    func = mock.Mock(side_effect=lambda name: f'id of {name}')
+    assert cache.get('org', func, 'Default') == 'id of Default'
+    assert cache.get('org', func, 'Default') == 'id of Default'
+    assert cache.get('org', func, 'Other') == 'id of Other'
+    assert func.call_count == 2
+    assert cache.stats == {'hits': 1, 'misses': 2}
+
+
+def test_ttl():
+    cache = QueryCache('sat.example.com', ttl=0.2)
+    func = mock.Mock(return_value='6.17')
+    cache.get('version', func)
+    cache.get('version', func)
+    cache.get('rhel', func, ttl=60)
+    time.sleep(0.3)
+    cache.get('version', func)
+    cache.get('rhel', func)
+    # the ttl is the one given when the result is stored
+    assert func.call_count == 3
+
+
+def test_invalidate():
+    cache = QueryCache('sat.example.com')
+    org, version = mock.Mock(return_value=1), mock.Mock(return_value='6.17')
+    lookup = {
+        'org': lambda: cache.get('org', org, tags=('organization',)),
+        'version': lambda: cache.get('version', version),
+    }
+    for func in lookup.values():
+        func()
+    cache.invalidate('location')
+    cache.invalidate('organization')
+    for func in lookup.values():
+        func()
+    assert (org.call_count, version.call_count) == (2, 1)
+    # writes of unknown scope invalidate every tagged result, untagged facts are kept
+    cache.invalidate()
+    for func in lookup.values():
+        func()
+    assert (org.call_count, version.call_count) == (3, 1)
+
+
+def test_disabled(settings):
+    settings.performance.query_cache.enabled = False
+    cache = QueryCache('sat.example.com')
+    func = mock.Mock(return_value='6.17')
+    cache.get('version', func)
+    cache.get('version', func)
+    assert func.call_count == 2
+    assert cache.stats == {'bypassed': 2}
+
+
+def test_shared_between_processes(tmp_path):
+    """Caches of different workers share results and invalidations through the storage"""
+    worker_1 = QueryCache('sat.example.com', storage=FileStorageHandler(root_dir=str(tmp_path)))
+    worker_2 = QueryCache('sat.example.com', storage=FileStorageHandler(root_dir=str(tmp_path)))
+    other_sat = QueryCache('other.example.com', storage=FileStorageHandler(root_dir=str(tmp_path)))
+    func = mock.Mock(return_value={'id': 1})
+    for cache in (worker_1, worker_2, other_sat):
+        assert cache.get('org', func, tags=('organization',)) == {'id': 1}
+    assert func.call_count == 2
+    assert worker_2.stats == {'shared_hits': 1}
+    worker_1.invalidate('organization')
+    worker_2.get('org', func, tags=('organization',))
+    assert func.call_count == 3
+    # results not meant to be shared stay in the process
+    worker_1.get('entities', func, shared=False)
+    worker_2.get('entities', func, shared=False)
+    assert func.call_count == 5
+
+
+def test_invalidates_decorator():
+    class Factory:
+        _satellite = mock.Mock(hostname='sat.decorator.example.com')
+
+        @query_cache.invalidates('organization')
+        def make_org(self):
+            raise RuntimeError('partially created')
+
+    cache = query_cache.get_cache('sat.decorator.example.com')
+    func = mock.Mock(return_value=1)
+    cache.get('org', func, tags=('organization',))
+    with pytest.raises(RuntimeError):
+        Factory().make_org()
+    cache.get('org', func, tags=('organization',))
+    assert func.call_count == 2
+    assert query_cache.stats()['invalidations'] >= 1
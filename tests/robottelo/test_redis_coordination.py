@@ -0,0 +1,288 @@
+"""Tests for the redis backends of SharedResource and func_locker.
+
+They run against a small in-process stand-in speaking the redis protocol, which implements
+only the commands these backends use, so the real redis client is exercised.
+"""
+
+from collections import defaultdict
+import multiprocessing
+import socketserver
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+pytest.importorskip('redis')
+
+from robottelo.utils import redis_coordination  # noqa: E402
+from robottelo.utils.decorators import func_locker  # noqa: E402
+from robottelo.utils.shared_resource import SharedResource  # noqa: E402
+
+
+class Status(str):
+    """A simple string reply"""
+
+
+NULL_ARRAY = object()
+NO_REPLY = object()
+
+
+def encode(value):
+    if value is NO_REPLY:
+        return b''
+    if value is None:
+        return b'$-1\r\n'
+    if value is NULL_ARRAY:
+        return b'*-1\r\n'
+    if isinstance(value, Status):
+        return f'+{value}\r\n'.encode()
+    if isinstance(value, Exception):
+        return f'-ERR {value}\r\n'.encode()
+    if isinstance(value, int):
+        return f':{value}\r\n'.encode()
+    if isinstance(value, list):
+        return f'*{len(value)}\r\n'.encode() + b''.join(encode(item) for item in value)
+    return b'$%d\r\n%b\r\n' % (len(value), value)
+
+
+class RedisStandInHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.write_lock = threading.Lock()
+        self.channels = set()
+        self.watched = None
+        self.queued = None
+
+    def send(self, value):
+        with self.write_lock:
+            self.wfile.write(encode(value))
+            self.wfile.flush()
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def handle(self):
+        while (args := self.read_command()) is not None:
+            name = args[0].decode().upper()
+            if self.queued is not None and name not in ('EXEC', 'DISCARD', 'MULTI', 'WATCH'):
+                self.queued.append((name, args[1:]))
+                self.send(Status('QUEUED'))
+                continue
+            with self.server.lock:
+                self.send(self.execute(name, args[1:]))
+
+    def finish(self):
+        with self.server.lock:
+            for channel in self.channels:
+                self.server.subscribers[channel].discard(self)
+        super().finish()
+
+    def execute(self, name, args):
+        server = self.server
+        if name in ('CLIENT', 'SELECT', 'AUTH'):
+            return Status('OK')
+        if name == 'PING':
+            return Status('PONG')
+        if name == 'GET':
+            return server.get(args[0])
+        if name == 'EXISTS':
+            return sum(server.get(key) is not None for key in args)
+        if name == 'SET':
+            key, value, *options = args
+            options = [option.decode().upper() for option in options]
+            if 'NX' in options and server.get(key) is not None:
+                return None
+            expires = None
+            if 'EX' in options:
+                expires = time.monotonic() + int(options[options.index('EX') + 1])
+            server.data[key] = (value, expires)
+            server.versions[key] += 1
+            return Status('OK')
+        if name == 'DEL':
+            deleted = 0
+            for key in args:
+                if server.get(key) is not None:
+                    del server.data[key]
+                    server.versions[key] += 1
+                    deleted += 1
+            return deleted
+        if name == 'PUBLISH':
+            receivers = list(server.subscribers[args[0]])
+            for handler in receivers:
+                handler.send([b'message', args[0], args[1]])
+            return len(receivers)
+        if name == 'SUBSCRIBE':
+            for channel in args:
+                self.channels.add(channel)
+                server.subscribers[channel].add(self)
+                self.send([b'subscribe', channel, len(self.channels)])
+            return NO_REPLY
+        if name == 'UNSUBSCRIBE':
+            for channel in args or list(self.channels):
+                self.channels.discard(channel)
+                server.subscribers[channel].discard(self)
+                self.send([b'unsubscribe', channel, len(self.channels)])
+            return NO_REPLY
+        if name == 'WATCH':
+            self.watched = {key: server.versions[key] for key in args}
+            return Status('OK')
+        if name == 'UNWATCH':
+            self.watched = None
+            return Status('OK')
+        if name == 'MULTI':
+            self.queued = []
+            return Status('OK')
+        if name == 'DISCARD':
+            self.queued = self.watched = None
+            return Status('OK')
+        if name == 'EXEC':
+            queued, watched = self.queued, self.watched or {}
+            self.queued = self.watched = None
+            if any(server.versions[key] != version for key, version in watched.items()):
+                return NULL_ARRAY
+            return [self.execute(*command) for command in queued]
+        return Exception(f'unknown command {name}')
+
+
+class RedisStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), RedisStandInHandler)
+        self.lock = threading.RLock()
+        self.data = {}
+        self.versions = defaultdict(int)
+        self.subscribers = defaultdict(set)
+
+    def get(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires < time.monotonic():
+            del self.data[key]
+            self.versions[key] += 1
+            return None
+        return value
+
+
+@pytest.fixture
+def redis_settings():
+    """Start the redis stand-in and point the redis backends to it"""
+    server = RedisStandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings = mock.MagicMock()
+    host, port = server.server_address
+    settings.shared_function.redis_host = host
+    settings.shared_function.redis_port = port
+    settings.shared_function.redis_db = 0
+    settings.shared_function.redis_password = None
+    settings.shared_function.lock_timeout = 60
+    settings.robottelo.func_locker_backend = 'redis'
+    settings.robottelo.shared_resource_backend = 'redis'
+    settings.robottelo.shared_resource_wait = 300
+    with (
+        mock.patch('robottelo.utils.redis_coordination.settings', settings),
+        mock.patch('robottelo.utils.decorators.func_locker.settings', settings),
+        mock.patch('robottelo.utils.shared_resource.settings', settings),
+    ):
+        yield settings
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(redis_settings):
+    return redis_coordination.get_client()
+
+
+def test_redis_lock_wakes_up_waiter(client):
+    """A waiter takes the lock as soon as it is released, not after the recheck interval"""
+    holder = redis_coordination.RedisLock(client, 'test:lock')
+    assert holder.acquire()
+    acquired = []
+
+    def wait_for_lock():
+        lock = redis_coordination.RedisLock(client, 'test:lock', timeout=30)
+        acquired.append((lock.acquire(), time.monotonic()))
+        lock.release()
+
+    waiter = threading.Thread(target=wait_for_lock)
+    waiter.start()
+    time.sleep(0.5)
+    assert not acquired
+    released = time.monotonic()
+    holder.release()
+    waiter.join()
+    assert acquired[0][0] is True
+    assert acquired[0][1] - released < redis_coordination.RedisLock.RECHECK_INTERVAL
+    assert client.get('test:lock') is None
+
+
+def test_redis_lock_timeout_and_ownership(client):
+    """Only the owner of the lock can release it"""
+    holder = redis_coordination.RedisLock(client, 'test:lock')
+    other = redis_coordination.RedisLock(client, 'test:lock', timeout=0.2)
+    assert holder.acquire()
+    assert holder.owner() == redis_coordination.process_id()
+    assert other.acquire() is False
+    with pytest.raises(TimeoutError):
+        other.__enter__()
+    # the key expired and was taken over, the previous owner must not delete it
+    client.set('test:lock', 'someone-else')
+    holder.release()
+    assert client.get('test:lock') == b'someone-else'
+
+
+def test_shared_resource_redis_backend(redis_settings, client):
+    """Test the SharedResource class coordinating through redis."""
+    ran = []
+
+    def run():
+        with SharedResource('test_resource_redis', lambda: ran.append(True)) as resource:
+            assert client.exists('robottelo:shared_resource:test_resource_redis')
+            time.sleep(1)  # simulate setup actions
+            resource.ready()
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # shared_resource_wait is 300s, transitions are published instead of polled
+    assert time.monotonic() - started < 60
+    assert ran == [True]
+    assert not client.exists('robottelo:shared_resource:test_resource_redis')
+
+
+# the default scope is the process id, share the lock between the pool processes
+@func_locker.lock_function(scope='test_redis')
+def locked_increment(path):
+    value = int(path.read_text())
+    time.sleep(0.2)
+    path.write_text(str(value + 1))
+
+
+def test_func_locker_redis_backend(redis_settings, tmp_path):
+    """Processes running a function locked in redis don't overlap"""
+    counter = tmp_path / 'counter'
+    counter.write_text('0')
+    with multiprocessing.get_context('fork').Pool(4) as pool:
+        pool.map(locked_increment, [counter] * 8)
+    assert counter.read_text() == '8'
+
+
+def test_func_locker_redis_recursion(redis_settings):
+    """Locking again a function already locked by the same process is an error"""
+    with (
+        func_locker.locking_function(locked_increment),
+        pytest.raises(func_locker.FunctionLockerError, match='recursion detected'),
+        func_locker.locking_function(locked_increment),
+    ):
+        pass
@@ -0,0 +1,148 @@
+"""Tests for module ``robottelo.utils.report_portal.portal``."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from robottelo.utils.report_portal import portal
+from robottelo.utils.report_portal.portal import ReportPortal
+
+PROJECT = 'Satellite6'
+TESTS = [f'tests/foreman/api/test_{index:03d}.py::test_{index:03d}' for index in range(120)]
+
+
+class FakeReportPortal(ThreadingHTTPServer):
+    """Report Portal API answering every request after ``delay`` seconds"""
+
+    def __init__(self, delay):
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f'http://{self.server_address[0]}:{self.server_address[1]}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            url = urlparse(self.path)
+            query = {key: value[0] for key, value in parse_qs(url.query).items()}
+            server.requests.append((url.path, query))
+            if url.path == f'/api/v1/{PROJECT}/settings':
+                body = {}
+            elif url.path == f'/api/v1/{PROJECT}/item':
+                size, page = int(query['page.size']), int(query['page.page'])
+                body = {
+                    'content': [
+                        {'name': name, 'launchId': int(query['filter.eq.launchId'])}
+                        for name in TESTS[(page - 1) * size : page * size]
+                    ],
+                    'page': {'totalPages': -(-len(TESTS) // size), 'number': page},
+                }
+            else:
+                self.send_error(404)
+                return
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def fake_rp():
+    server = FakeReportPortal(delay=0.05)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def rp_settings():
+    with mock.patch.object(portal, 'settings') as settings:
+        settings.report_portal.page_size = 10
+        settings.report_portal.fetch_workers = 6
+        settings.report_portal.launch_cache = False
+        yield settings
+
+
+def item_requests(server):
+    return [query['page.page'] for path, query in server.requests if path.endswith('/item')]
+
+
+def test_get_tests_concurrent_pages(fake_rp, rp_settings):
+    rp = ReportPortal(rp_url=fake_rp.url, rp_api_key='key', rp_project=PROJECT)
+    launch = {'id': 42, 'status': 'FAILED'}
+
+    started = time.perf_counter()
+    serial = rp.get_tests(launch=launch, workers=1)
+    serial_seconds = time.perf_counter() - started
+    assert fake_rp.max_in_flight == 1
+
+    fake_rp.requests.clear()
+    started = time.perf_counter()
+    tests = rp.get_tests(launch=launch)
+    concurrent_seconds = time.perf_counter() - started
+    # the pages are fetched at the same time and returned in order
+    assert [test['name'] for test in tests] == [test['name'] for test in serial] == TESTS
+    assert sorted(item_requests(fake_rp), key=int) == [str(page) for page in range(1, 13)]
+    assert fake_rp.max_in_flight > 1
+    assert concurrent_seconds < serial_seconds / 2
+
+    # bigger pages, fewer requests
+    fake_rp.requests.clear()
+    assert len(rp.get_tests(launch=launch, page_size=100)) == len(TESTS)
+    assert item_requests(fake_rp) == ['1', '2']
+
+    paths = ['test_001.py', 'test_119.py']
+    assert [test['name'] for test in rp.get_tests(launch=launch, paths=paths)] == [
+        TESTS[1],
+        TESTS[119],
+    ]
+
+
+def test_get_tests_launch_cache(fake_rp, rp_settings, tmp_path):
+    rp = ReportPortal(rp_url=fake_rp.url, rp_api_key='key', rp_project=PROJECT, cache_dir=tmp_path)
+    launch = {'id': 42, 'status': 'FAILED', 'lastModified': 1000}
+    tests = rp.get_tests(launch=launch, status=['failed'])
+    assert len(tests) == len(TESTS)
+    assert len(list(tmp_path.joinpath('42').glob('*.json'))) == 1
+
+    fake_rp.requests.clear()
+    assert rp.get_tests(launch=launch, status=['failed']) == tests
+    assert fake_rp.requests == []
+    # other filters, a modified launch or an unfinished launch are fetched again
+    for args in (
+        {'launch': launch, 'status': ['skipped']},
+        {'launch': {**launch, 'lastModified': 2000}, 'status': ['failed']},
+        {'launch': {**launch, 'status': 'IN_PROGRESS'}, 'status': ['failed']},
+    ):
+        fake_rp.requests.clear()
+        assert rp.get_tests(**args) == tests
+        assert len(item_requests(fake_rp)) == 12
+    assert len(list(tmp_path.joinpath('42').glob('*.json'))) == 3
@@ -0,0 +1,108 @@
+"""Tests for module ``robottelo.utils.satellite_load``."""
+
+from types import SimpleNamespace
+
+from robottelo.utils.satellite_load import (
+    FileLoadStore,
+    SatelliteLoad,
+    pinned_modules,
+    utilization_summary,
+    utilization_timeline,
+)
+
+HOSTNAMES = ['sat1.example.com', 'sat2.example.com']
+
+
+def test_pick_least_loaded(tmp_path):
+    store = FileLoadStore(tmp_path)
+    gw0, gw1, gw2 = (SatelliteLoad(HOSTNAMES, f'gw{index}', store=store) for index in range(3))
+    # idle workers spread across the Satellites
+    assert gw0.pick() == 'sat1.example.com'
+    assert gw1.pick() == 'sat2.example.com'
+    assert set(store.read()) == {gw0.worker, gw1.worker}
+
+    # sat2 answers slower, the third worker joins sat1
+    for _ in range(3):
+        gw0.observe_latency('sat1.example.com', 1)
+        gw1.observe_latency('sat2.example.com', 4)
+        gw1.observe_latency('other.example.com', 4)
+    gw0.test_started()
+    gw1.test_started()
+    assert gw1.latency == {'sat2.example.com': 4}
+    load = gw2.load()
+    assert load['sat1.example.com'] == {'workers': 1, 'active': 1, 'latency': 1}
+    assert gw2.pick() == 'sat1.example.com'
+
+    # at a module boundary a worker stays on its Satellite unless another one is less loaded
+    gw0.test_finished()
+    assert gw0.pick() == 'sat1.example.com'
+    gw1.close()
+    assert gw0.pick() == 'sat2.example.com'
+    assert [event[1:3] for event in gw0.events if event[1] == 'pick'] == [
+        ['pick', 'sat1.example.com'],
+        ['pick', 'sat2.example.com'],
+    ]
+
+
+def test_utilization_timeline():
+    events = [
+        [100, 'start', 'sat1', 1],
+        [101, 'start', 'sat1', 1],
+        [102, 'pick', 'sat2', 1.0],
+        [103, 'end', 'sat1', 0],
+        [103, 'latency', 'sat1', 0.5],
+        [104, 'end', 'sat1', 0],
+        [104, 'start', 'sat2', 1],
+        [110, 'end', 'sat2', 0],
+    ]
+    timeline = utilization_timeline(events)
+    assert timeline['sat1'] == [[0, 1, None], [1, 2, None], [3, 1, None], [3, 1, 0.5], [4, 0, 0.5]]
+    assert timeline['sat2'] == [[4, 1, None], [10, 0, None]]
+    assert utilization_summary(timeline) == {
+        'sat1': {'test_seconds': 6, 'peak_active': 2, 'latency': 0.5},
+        'sat2': {'test_seconds': 6, 'peak_active': 1, 'latency': None},
+    }
+
+
+def fixturedef(argnames, scope='function'):
+    return [SimpleNamespace(argnames=argnames, scope=scope)]
+
+
+def test_pinned_modules():
+    fixturedefs = {
+        '_default_sat': fixturedef(['align_to_satellite'], 'session'),
+        'align_to_satellite': fixturedef([], 'session'),
+        'module_target_sat': fixturedef(['_default_sat'], 'module'),
+        'session_target_sat': fixturedef(['_default_sat'], 'session'),
+        'session_org': fixturedef(['session_target_sat'], 'session'),
+        'session_tmp': fixturedef([], 'session'),
+    }
+
+    def item(nodeid, names):
+        return SimpleNamespace(
+            nodeid=nodeid,
+            _fixtureinfo=SimpleNamespace(
+                name2fixturedefs={name: fixturedefs[name] for name in names}
+            ),
+        )
+
+    items = [
+        item('tests/test_a.py::test_a', ['_default_sat', 'module_target_sat', 'session_tmp']),
+        item('tests/test_b.py::TestB::test_b', ['session_org', 'session_target_sat']),
+    ]
+    assert pinned_modules(items) == {'tests/test_b.py'}
+
+
+def test_pick_probes_latency(tmp_path):
+    """Only the probes feed the latency, and a worker can go back to its session Satellite"""
+    probes = {'sat1.example.com': 2, 'sat2.example.com': 0.5}
+    store = FileLoadStore(tmp_path)
+    gw0 = SatelliteLoad(HOSTNAMES, 'gw0', store=store, probe=probes.get)
+    assert gw0.pick() == 'sat2.example.com'
+    assert gw0.latency == probes
+    gw0.session_hostname = gw0.hostname
+
+    probes.update({'sat1.example.com': 0.5, 'sat2.example.com': 8})
+    assert gw0.pick() == 'sat1.example.com'
+    assert gw0.stay(gw0.session_hostname) == 'sat2.example.com'
+    assert store.read()[gw0.worker]['hostname'] == 'sat2.example.com'
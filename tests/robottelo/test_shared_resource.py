@@ -3,8 +3,9 @@ from pathlib import Path
 import random
 from threading import Thread
 import time
+from unittest import mock
 
-from robottelo.utils.shared_resource import SharedResource
+from robottelo.utils.shared_resource import InotifyWatcher, SharedResource
 
 
 def upgrade_action(*args, **kwargs):
@@ -67,3 +68,38 @@ def test_shared_resource_multithreading():
     t2.join()
 
     assert not Path("/tmp/test_resource_th.shared").exists()
+
+
+def test_inotify_watcher(tmp_path):
+    """The inotify watcher only wakes up for writes of the resource file"""
+    resource_file = tmp_path / "test_resource.shared"
+    watcher = InotifyWatcher(resource_file)
+    try:
+        (tmp_path / "unrelated").write_text("{}")
+        started = time.monotonic()
+        watcher.wait(0.5)
+        assert time.monotonic() - started >= 0.5
+        writer = Thread(target=lambda: (time.sleep(0.2), resource_file.write_text("{}")))
+        writer.start()
+        started = time.monotonic()
+        watcher.wait(30)
+        assert time.monotonic() - started < 10
+        writer.join()
+    finally:
+        watcher.close()
+
+
+@mock.patch("robottelo.utils.shared_resource.settings")
+def test_shared_resource_inotify_backend(settings):
+    """Test the SharedResource class waking up through inotify."""
+    settings.robottelo.shared_resource_backend = "inotify"
+    # a transition must not wait for the poll interval anymore
+    settings.robottelo.shared_resource_wait = 300
+    threads = [Thread(target=run_resource, args=("test_resource_in",)) for _ in range(2)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started < 60
+    assert not Path("/tmp/test_resource_in.shared").exists()
@@ -2,6 +2,8 @@
 
 from unittest import mock
 
+import pytest
+
 from robottelo import ssh
 
 
@@ -102,3 +104,163 @@ class TestSSH:
 
         ret = ssh.command('ls -la')
         assert ret[1].cmd == 'ls -la'
+
+
+class PooledMockClient(MockSSHClient):
+    """A mock client exposing the ``_session`` attribute checked by the pool"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.hostname = kwargs.get('hostname')
+        self._session = object()
+
+    def close(self):
+        super().close()
+        self._session = None
+
+    def execute(self, cmd, *args, **kwargs):
+        return mock.Mock(status=self.ret_code, stdout=cmd, stderr='')
+
+
+class TestSSHConnectionPool:
+    """Tests for ``robottelo.ssh.SSHConnectionPool``."""
+
+    conn_kwargs = {
+        'hostname': 'example.com',
+        'username': 'root',
+        'password': 'pass',
+        'port': 22,
+        'net_type': 'ipv4',
+    }
+
+    def test_reuse_counts_hits_and_misses(self):
+        pool = ssh.SSHConnectionPool(factory=PooledMockClient)
+        with pool.connection(**self.conn_kwargs) as first:
+            pass
+        with pool.connection(**self.conn_kwargs) as second:
+            pass
+        assert first is second
+        assert pool.stats == {'hits': 1, 'misses': 1, 'evictions': 0}
+        assert pool.report()['hit_rate'] == 0.5
+
+    def test_different_keys_are_not_shared(self):
+        pool = ssh.SSHConnectionPool(factory=PooledMockClient)
+        with pool.connection(**self.conn_kwargs) as first:
+            pass
+        with pool.connection(**(self.conn_kwargs | {'port': 2222})) as second:
+            pass
+        assert first is not second
+        assert pool.stats['misses'] == 2
+
+    def test_concurrent_borrowers_get_distinct_clients(self):
+        pool = ssh.SSHConnectionPool(factory=PooledMockClient)
+        with (
+            pool.connection(**self.conn_kwargs) as first,
+            pool.connection(**self.conn_kwargs) as second,
+        ):
+            assert first is not second
+
+    def test_dead_session_is_evicted(self):
+        pool = ssh.SSHConnectionPool(factory=PooledMockClient)
+        with pool.connection(**self.conn_kwargs) as first:
+            pass
+        first._session = None
+        with pool.connection(**self.conn_kwargs) as second:
+            pass
+        assert first is not second
+        assert pool.stats == {'hits': 0, 'misses': 2, 'evictions': 1}
+
+    def test_failed_health_check_is_evicted(self):
+        pool = ssh.SSHConnectionPool(health_check_interval=0, factory=PooledMockClient)
+        with pool.connection(**self.conn_kwargs) as first:
+            pass
+        first.ret_code = 255
+        with pool.connection(**self.conn_kwargs) as second:
+            pass
+        assert first is not second
+        assert pool.stats['evictions'] == 1
+
+    def test_idle_client_is_closed(self):
+        pool = ssh.SSHConnectionPool(max_idle_time=0, factory=PooledMockClient)
+        with pool.connection(**self.conn_kwargs) as first:
+            pass
+        with (
+            mock.patch('robottelo.ssh.time.monotonic', return_value=10**9),
+            pool.connection(**self.conn_kwargs) as second,
+        ):
+            pass
+        assert first is not second
+        assert first.close_ == 1
+
+    def test_client_discarded_on_error(self):
+        pool = ssh.SSHConnectionPool(factory=PooledMockClient)
+        with (
+            pytest.raises(RuntimeError, match='connection dropped'),
+            pool.connection(**self.conn_kwargs) as first,
+        ):
+            raise RuntimeError('connection dropped')
+        with pool.connection(**self.conn_kwargs) as second:
+            pass
+        assert first is not second
+        assert first.close_ == 1
+
+
+class FakeExecChannel:
+    """A ssh2 like channel delivering its output in small chunks"""
+
+    def __init__(self, stdout, stderr=b'', status=0):
+        self.stdout = [stdout[i : i + 3] for i in range(0, len(stdout), 3)]
+        self.stderr = [stderr] if stderr else []
+        self.status = status
+        self.command = None
+
+    def execute(self, cmd):
+        self.command = cmd
+
+    def read(self):
+        return (len(self.stdout[0]), self.stdout.pop(0)) if self.stdout else (0, b'')
+
+    def read_stderr(self):
+        return (len(self.stderr[0]), self.stderr.pop(0)) if self.stderr else (0, b'')
+
+    def wait_eof(self):
+        pass
+
+    def close(self):
+        pass
+
+    def wait_closed(self):
+        pass
+
+    def get_exit_status(self):
+        return self.status
+
+
+class TestCommandStream:
+    """Tests for ``robottelo.ssh.stream_command``."""
+
+    @mock.patch('robottelo.config.settings')
+    def test_stream_reads_channel_chunks(self, settings):
+        settings.performance.ssh_pool.enabled = False
+        channel = FakeExecChannel('Id,Name\n1,chårs\n'.encode(), stderr=b'warning', status=3)
+        client = mock.Mock()
+        client.session.session.open_session.return_value = channel
+        with mock.patch('robottelo.ssh.get_client', return_value=client):
+            stream = ssh.stream_command('hammer host list', hostname='example.com')
+            assert stream.status is None
+            chunks = list(stream)
+        assert len(chunks) > 1
+        assert ''.join(chunks) == 'Id,Name\n1,chårs\n'
+        assert channel.command == 'hammer host list'
+        assert (stream.status, stream.stderr) == (3, 'warning')
+
+    @mock.patch('robottelo.config.settings')
+    def test_stream_falls_back_to_execute(self, settings):
+        settings.performance.ssh_pool.enabled = False
+        client = mock.Mock(spec=['session', 'execute'])
+        client.session = mock.Mock(spec=[])
+        client.execute.return_value = mock.Mock(status=0, stdout='out', stderr='')
+        with mock.patch('robottelo.ssh.get_client', return_value=client):
+            stream = ssh.stream_command('ls')
+            assert list(stream) == ['out']
+        assert stream.status == 0
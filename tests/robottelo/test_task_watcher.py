@@ -0,0 +1,77 @@
+"""Tests for module ``robottelo.utils.task_watcher``."""
+
+import re
+import threading
+import time
+
+from nailgun.entity_mixins import TaskFailedError, TaskTimedOutError
+import pytest
+
+from robottelo.utils import task_watcher
+from robottelo.utils.task_watcher import TaskWatcher
+
+
+class FakeTasks:
+    """Foreman tasks finishing after ``ticks`` searches, searched by ``id ^ (...)``"""
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.searches = []
+        self.lock = threading.Lock()
+
+    def search(self, query):
+        task_ids = re.fullmatch(r'id \^ \((.*)\)', query).group(1).split(',')
+        with self.lock:
+            self.searches.append(task_ids)
+            tasks = []
+            for task_id in task_ids:
+                remaining, result = self.ticks[task_id]
+                self.ticks[task_id] = (remaining - 1, result)
+                done = remaining <= 1
+                tasks.append(
+                    {
+                        'id': task_id,
+                        'state': 'stopped' if done else 'running',
+                        'result': result if done else 'pending',
+                        'progress': 1 if done else 0.5,
+                    }
+                )
+            return tasks
+
+
+def test_one_search_per_tick():
+    tasks = FakeTasks({str(index): (index % 3 + 1, 'success') for index in range(20)})
+    watcher = TaskWatcher(tasks.search, min_interval=0.01, max_interval=0.05, chunk_size=8)
+    results = watcher.wait_for([{'id': str(index)} for index in range(20)])
+    assert [task['id'] for task in results] == [str(index) for index in range(20)]
+    assert all(task['result'] == 'success' for task in results)
+    # 3 ticks of 3 chunks at most, instead of a poll per task and per tick
+    assert len(tasks.searches) <= 9
+    assert max(len(chunk) for chunk in tasks.searches) == 8
+    assert watcher.stats['succeeded'] == 20
+    assert watcher.stats['wait_seconds'] > 0
+    assert task_watcher.wait_times()[task_watcher.current_test()] > 0
+
+
+def test_failed_and_timed_out_tasks():
+    tasks = FakeTasks({'ok': (1, 'success'), 'ko': (1, 'error'), 'slow': (1000, 'success')})
+    watcher = TaskWatcher(tasks.search, min_interval=0.01, max_interval=0.02)
+    with pytest.raises(TaskFailedError, match='Task ko did not succeed'):
+        watcher.wait_for(['ok', 'ko'])
+    assert watcher.wait_for(['ko'], must_succeed=False)[0]['result'] == 'error'
+    future = watcher.watch('slow', timeout=0.1)
+    with pytest.raises(TaskTimedOutError, match='Timed out polling task slow'):
+        future.result(timeout=5)
+    assert (watcher.stats['failed'], watcher.stats['timed_out']) == (1, 1)
+
+
+def test_backoff_without_changes():
+    tasks = FakeTasks({'slow': (1000, 'success')})
+    watcher = TaskWatcher(tasks.search, min_interval=0.01, max_interval=0.08, backoff=2)
+    future = watcher.watch('slow', timeout=0.5)
+    with pytest.raises(TaskTimedOutError):
+        future.result(timeout=5)
+    # the first tick sees a change, the next ones back off: 0.02, 0.04, 0.08, 0.08...
+    assert len(tasks.searches) < 12
+    time.sleep(0.1)
+    assert watcher._thread is None
@@ -0,0 +1,82 @@
+"""Tests for module ``robottelo.utils.topology``."""
+
+import threading
+import time
+
+import pytest
+
+from robottelo.utils import topology
+from robottelo.utils.topology import Member, Topology
+
+
+class FakeHost:
+    def __init__(self, hostname):
+        self.hostname = hostname
+        self.torn_down = False
+
+    def teardown(self):
+        self.torn_down = True
+
+
+class FakeTopology(Topology):
+    """Checks out fake hosts in 0.2s, failing the attempts listed in ``failures``"""
+
+    def __init__(self, *args, failures=None, **kwargs):
+        super().__init__(*args, delay=0, max_workers=8, **kwargs)
+        self.failures = failures or {}
+        self.attempts = {}
+        self.checked_in = []
+        self._lock = threading.Lock()
+
+    def _checkout(self, member):
+        time.sleep(0.2)
+        with self._lock:
+            attempt = self.attempts[member.name] = self.attempts.get(member.name, 0) + 1
+            if attempt in self.failures.get(member.name, ()):
+                raise RuntimeError(f'{member.name} attempt {attempt} failed')
+            return FakeHost(f'{member.name}-{attempt}.example.com')
+
+    def _checkin(self, hosts):
+        self.checked_in.extend(hosts)
+
+
+def test_deploy_concurrently():
+    wired = []
+    members = [
+        Member('satellite', FakeHost, {'workflow': 'deploy-satellite'}),
+        Member('capsule', FakeHost, {'workflow': 'deploy-capsule'}),
+        Member('rhel9', FakeHost, {'deploy_rhel_version': '9'}, count=2),
+    ]
+    # the capsule fails once and is retried alone
+    topo = FakeTopology('sat_with_capsule', members, wire=wired.append, failures={'capsule': [1]})
+    with topo.deploy() as hosts:
+        assert [host.hostname for host in hosts['satellite']] == ['satellite-1.example.com']
+        assert [host.hostname for host in hosts['capsule']] == ['capsule-2.example.com']
+        assert len(hosts['rhel9']) == 2
+        assert wired == [hosts]
+    assert all(host.torn_down for member_hosts in hosts.values() for host in member_hosts)
+    assert len(topo.checked_in) == 4
+
+    report = topo.report
+    assert report in topology.reports()
+    # 4 hosts of 0.2s, the capsule twice, in about the time of the capsule
+    assert report['ready_seconds'] < 0.7
+    assert report['slowest_host_seconds'] >= 0.4
+    assert {record['member']: record['attempts'] for record in report['hosts']} == {
+        'satellite': 1,
+        'capsule': 2,
+        'rhel9': 1,
+    }
+
+
+def test_failed_member_checks_in_the_others():
+    members = [
+        Member('satellite', FakeHost, {}),
+        Member('capsule', FakeHost, {}),
+    ]
+    topo = FakeTopology('broken', members, retry_limit=2, failures={'capsule': [1, 2]})
+    with pytest.raises(RuntimeError, match='capsule attempt 2 failed'):
+        topo.checkout()
+    assert [host.hostname for host in topo.checked_in] == ['satellite-1.example.com']
+    assert 'capsule attempt 2 failed' in topo.report['error']
+    assert topo.report['hosts'][1]['attempts'] == 2